@@ -1,13 +1,40 @@
 import os
+import re
+import sys
+import argparse
+import csv
+import io
+import html
+import json
+import math
+import time
+import zlib
+import tempfile
+import queue
+import heapq
+import mmap
 import struct
 import hashlib
+import gzip
 import pyperclip
 import threading
 import tkinter as tk
+import xml.etree.ElementTree as ET
 from tkinter import ttk
 from tkinter import filedialog, messagebox
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from pathlib import Path
+from array import array
+from bisect import bisect_left
+from collections import deque
+from contextlib import closing
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from dataclasses import dataclass, field
+from enum import Enum
+from functools import lru_cache
+from itertools import groupby
+from urllib.error import HTTPError
+from urllib.parse import parse_qs, urlencode, urlparse
+from urllib.request import Request, urlopen
 
 # -------------------------#
 # 1. YFT Cleaner Logic
@@ -16,37 +43,124 @@ class YftCleaner:
     """
     A class dedicated to handling YFT ( *_hi.yft ) file scanning, size and status checking, deletion, etc.
     """
-    def __init__(self, size_margin_kb: float = 0.0):
+    def __init__(self, size_margin_kb: float = 0.0, similarity_threshold: float = 0.0, compare_resources: bool = True,
+                 io_budget=None, lod_aware: bool = False):
         self.deletable_files = []
+        # Set by iter_duplicates when its time budget ran out before every file was compared.
+        self.budget_exhausted = False
+        # Pacing and cache hints for hashing and header reads (see IoBudget).
+        self.io_budget = io_budget or IoBudget()
         self.size_margin_kb = size_margin_kb
+        # Minimum content similarity (percent) for a non-identical _hi file to count as a duplicate.
+        # When set it replaces the size margin rule.
+        self.similarity_threshold = similarity_threshold
+        # Treat RSC7 files whose decompressed segments match as identical.
+        self.compare_resources = compare_resources
+        self.resource_cache = FileCache("resource_segments")
+        self.resource_decoder = ResourceDecoder(self.resource_cache, self.io_budget)
+        # Also treat a non-identical _hi file as a duplicate when its High LOD has no more geometry than the original's.
+        self.lod_aware = lod_aware
+        self.lod_cache = FileCache("drawable_lods")
+
+    def save_caches(self):
+        try:
+            self.resource_cache.save()
+            self.lod_cache.save()
+        except OSError as e:
+            print(f"Error: {e}")
 
-    def find_hi_yft_files(self, root_dir: str):
+    def find_hi_yft_files(self, root_dir: str, progress=None):
         """
         Recursively find all `*_hi.yft` files in any 'stream' folder under root_dir.
         """
-        hi_yft_files = []
-        root = Path(root_dir)
-        for stream_dir in root.rglob('stream'):
-            if stream_dir.is_dir():
-                for yft_file in stream_dir.glob('**/*_hi.yft'):
-                    hi_yft_files.append(str(yft_file))
-        return hi_yft_files
+        return DirectoryWalker().walk(
+            root_dir, lambda name: os.path.normcase(name).endswith('_hi.yft'), stream_only=True, progress=progress
+        )
 
-    def scan_files(self, root_directory: str):
+    def scan_files(self, root_directory: str, progress=None, time_budget: float = None):
         """
         Main entry point for performing the scanning procedure.
         """
-        hi_yft_files = self.find_hi_yft_files(root_directory)
-        unique_hi_yft_files = list(set(hi_yft_files))
-        results = []
-
-        for f in unique_hi_yft_files:
-            item = self.process_file(f)
-            if item:
-                results.append(item)
+        hi_yft_files = self.find_hi_yft_files(root_directory, progress)
+        results = list(self.iter_duplicates(hi_yft_files, time_budget=time_budget, progress=progress))
         self.deletable_files = results
+        self.save_caches()
         return results
 
+    def schedule(self, hi_files, progress=None):
+        """
+        The _hi files ordered by what comparing them is likely to reclaim: pairs whose file sizes match (within
+        the size margin) or whose RSC page sizes match first, then largest first. Files without an original go
+        last. Costs a stat and a 16 byte header read per file, against a full hash for the comparison.
+        """
+        margin = self.size_margin_kb * 1024
+        ranked = []
+        for hi_file in set(hi_files):
+            original = self.get_original_file(hi_file)
+            try:
+                hi_size, org_size = os.path.getsize(hi_file), os.path.getsize(original) if original else -1
+            except OSError:
+                hi_size, org_size = 0, -1
+            if org_size < 0:
+                ranked.append((False, -1, hi_file))
+            else:
+                hi_header = self.read_yft_header(hi_file)
+                matched = abs(hi_size - org_size) <= margin or (
+                    hi_header[0] and self.compare_resources and hi_header == self.read_yft_header(original))
+                ranked.append((bool(matched), hi_size, hi_file))
+            if progress:
+                progress.advance()
+        ranked.sort(reverse=True)
+        return [hi_file for _, _, hi_file in ranked]
+
+    def iter_duplicates(self, hi_files, max_workers: int = None, time_budget: float = None, progress=None):
+        """
+        Yield each duplicate as soon as it is confirmed, working through schedule(hi_files) with at most twice
+        max_workers files in flight. With time_budget (seconds) no file is started once the budget is spent,
+        so a large tree still returns its most valuable duplicates in time; budget_exhausted records whether
+        files were left out.
+        """
+        max_workers = max_workers or os.cpu_count() or 4
+        deadline = time.monotonic() + time_budget if time_budget else None
+        self.budget_exhausted = False
+        if progress:
+            progress.start_phase("Ranking")
+        pending = deque(self.schedule(hi_files, progress))
+        if progress:
+            progress.start_phase("Comparing", by_bytes=True)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            in_flight = {}
+            while pending or in_flight:
+                if deadline and not self.budget_exhausted and time.monotonic() >= deadline:
+                    self.budget_exhausted = True
+                    pending.clear()
+                    # Files queued behind the running ones are dropped too.
+                    for future in in_flight:
+                        future.cancel()
+                while pending and len(in_flight) < max_workers * 2:
+                    hi_file = pending.popleft()
+                    in_flight[executor.submit(self.process_file, hi_file)] = hi_file
+                if not in_flight:
+                    break
+                # Wake up at the deadline too, so queued files are dropped on time.
+                timeout = max(deadline - time.monotonic(), 0) if deadline and not self.budget_exhausted else None
+                done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    hi_file = in_flight.pop(future)
+                    if future.cancelled():
+                        continue
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        # One unreadable file must not end the scan; report it and carry on with the rest.
+                        print(f"Error: {hi_file}: {e}")
+                        result = None
+                    if progress:
+                        progress.advance_file(hi_file)
+                    if result:
+                        yield result
+
     def process_file(self, hi_file: str):
         """
         Performs logic for a given hi_file
@@ -55,13 +169,21 @@ class YftCleaner:
         if not original_file or not os.path.isfile(original_file):
             return None
 
+        if self.similarity_threshold > 0.0:
+            return self._process_by_similarity(hi_file, original_file)
+
         hi_hash = self.compute_file_hash(hi_file)
         org_hash = self.compute_file_hash(original_file)
 
         diff_bytes = 0
 
         if hi_hash and org_hash and hi_hash == org_hash:
-            return self._process_identical_files(hi_file, diff_bytes=0)
+            return self._process_identical_files(hi_file, diff_bytes=0, file_hash=hi_hash)
+
+        if self._resources_match(hi_file, original_file):
+            return self._process_identical_files(
+                hi_file, diff_bytes=self._size_diff(hi_file, original_file), file_hash=hi_hash or "", semantic_match=True
+            )
 
         if self.size_margin_kb > 0.0:
             size_hi_bytes = os.path.getsize(hi_file)
@@ -70,46 +192,191 @@ class YftCleaner:
             diff_kb = diff_bytes / 1024.0
 
             if diff_kb <= self.size_margin_kb:
-                return self._process_identical_files(hi_file, diff_bytes=diff_bytes)
+                return self._process_identical_files(hi_file, diff_bytes=diff_bytes, file_hash=hi_hash or "")
 
-        return None
+        return self._process_by_lods(hi_file, original_file, hi_hash or "")
+
+    def _process_by_similarity(self, hi_file: str, original_file: str):
+        """
+        Compare hi_file with its original by shared content chunks; the hash comes from the same pass.
+        """
+        hi_fp = ChunkSimilarity.fingerprint(hi_file, self.io_budget)
+        org_fp = ChunkSimilarity.fingerprint(original_file, self.io_budget)
+        if not hi_fp or not org_fp:
+            return None
+
+        if hi_fp.sha256 == org_fp.sha256:
+            return self._process_identical_files(hi_file, diff_bytes=0, file_hash=hi_fp.sha256, similarity=1.0)
+
+        if self._resources_match(hi_file, original_file):
+            return self._process_identical_files(
+                hi_file, diff_bytes=abs(hi_fp.size - org_fp.size), file_hash=hi_fp.sha256, semantic_match=True
+            )
+
+        similarity = ChunkSimilarity.similarity(hi_fp, org_fp)
+        if similarity * 100.0 >= self.similarity_threshold:
+            return self._process_identical_files(
+                hi_file, diff_bytes=abs(hi_fp.size - org_fp.size), file_hash=hi_fp.sha256, similarity=similarity
+            )
+        return self._process_by_lods(hi_file, original_file, hi_fp.sha256)
+
+    def _process_by_lods(self, hi_file: str, original_file: str, file_hash: str):
+        """
+        With lod_aware, keep hi_file as a duplicate when it adds no higher-detail geometry to its original.
+        """
+        if not self.lod_aware:
+            return None
+        hi_lods, org_lods = self.read_lods(hi_file), self.read_lods(original_file)
+        if not self.lods_redundant(hi_lods, org_lods):
+            return None
+        result = self._process_identical_files(hi_file, diff_bytes=self._size_diff(hi_file, original_file),
+                                               file_hash=file_hash)
+        result.hi_triangles, result.original_triangles = hi_lods.high_triangles, org_lods.high_triangles
+        return result
+
+    def read_lods(self, file_path: str):
+        """
+        DrawableLods of a .yft/.ydr file from its virtual segment alone, cached per file; None if unreadable.
+        """
+        cached = self.lod_cache.get(file_path)
+        if cached is not None:
+            return DrawableLods([tuple(level) for level in cached]) if cached else None
+        try:
+            stamp = FileCache.stamp(file_path)
+            segments = self.resource_decoder.read_virtual(file_path)
+        except (OSError, zlib.error, struct.error) as e:
+            print(f"Error: {e}")
+            return None
+        lods = DrawableLodParser(segments[1]).lods(os.path.splitext(file_path)[1].lower()) if segments else None
+        # An empty list records "no readable LOD table" so it is not retried.
+        self.lod_cache.put(file_path, lods.to_cache() if lods else [], stamp)
+        return lods
+
+    @staticmethod
+    def lods_redundant(hi_lods, org_lods) -> bool:
+        """
+        True when the _hi drawable's High LOD has no more triangles or vertices than the original's.
+        Unreadable or empty tables are never called redundant.
+        """
+        if not hi_lods or not org_lods or not hi_lods.high_triangles or not org_lods.high_triangles:
+            return False
+        return (hi_lods.high_triangles <= org_lods.high_triangles
+                and hi_lods.high_vertices <= org_lods.high_vertices)
+
+    def compare_lods(self, root_directory: str, progress=None):
+        """
+        HiLodComparison for every _hi.yft with an original, whether or not it is a byte duplicate.
+        """
+        hi_files = sorted(set(self.find_hi_yft_files(root_directory, progress)))
+        if progress:
+            progress.start_phase("Reading LODs")
+        comparisons = []
+        for hi_file in hi_files:
+            original = self.get_original_file(hi_file)
+            if original and os.path.isfile(original):
+                hi_lods, org_lods = self.read_lods(hi_file), self.read_lods(original)
+                comparisons.append(HiLodComparison(hi_file, original, hi_lods, org_lods,
+                                                   self.lods_redundant(hi_lods, org_lods)))
+            if progress:
+                progress.advance()
+        self.save_caches()
+        return comparisons
+
+    def _resources_match(self, hi_file: str, original_file: str) -> bool:
+        """
+        True if both files are RSC7 resources with identical decompressed segments.
+        """
+        if not self.compare_resources:
+            return False
+        hi_digests = self.resource_decoder.segment_digests(hi_file)
+        if not hi_digests:
+            return False
+        return hi_digests == self.resource_decoder.segment_digests(original_file)
+
+    @staticmethod
+    def _size_diff(file_a: str, file_b: str) -> int:
+        try:
+            return abs(os.path.getsize(file_a) - os.path.getsize(file_b))
+        except OSError:
+            return 0
 
-    def _process_identical_files(self, hi_file: str, diff_bytes: int):
+    def _process_identical_files(self, hi_file: str, diff_bytes: int, file_hash: str = "", similarity: float = None,
+                                 semantic_match: bool = False):
         """
         Helper method to handle the rest of the logic if hi_file is considered identical to its original.
         """
         is_resource, physPages, virtPages = self.read_yft_header(hi_file)
+        file_size = os.path.getsize(hi_file)
 
         if is_resource:
             phys_size = self.convert_rsc7_size(physPages)
             virt_size = self.convert_rsc7_size(virtPages)
-            phys_mb = phys_size / (1024.0 * 1024.0)
-            virt_mb = virt_size / (1024.0 * 1024.0)
-            size_str = f"PH:{phys_mb:.2f}/VR:{virt_mb:.2f} MB"
-            max_mb = max(phys_mb, virt_mb)
-            status = self.determine_status(max_mb)
-            if status == "Critical Oversized":
-                pass
-            elif status in ["Warning", "Critical"]:
-                status += " - Oversized assets can and WILL lead to streaming issues (such as models not loading/rendering)."
-            else:
-                status += " - good"
         else:
-            actual_size = os.path.getsize(hi_file)
-            actual_mb = actual_size / (1024.0 * 1024.0)
-            size_str = f"{actual_mb:.2f} MB"
-            status = self.determine_status(actual_mb)
-            if status == "Critical Oversized":
-                pass
-            elif status in ["Warning", "Critical"]:
-                status += " - Oversized assets can and WILL lead to streaming issues (such as models not loading/rendering)."
-            else:
-                status += " - Unknown format"
+            phys_size = virt_size = 0
+
+        result = YftResult(
+            path=hi_file,
+            is_resource=is_resource,
+            phys_size=phys_size,
+            virt_size=virt_size,
+            file_size=file_size,
+            diff_bytes=diff_bytes,
+            file_hash=file_hash,
+            similarity=similarity,
+            semantic_match=semantic_match,
+        )
+        result.status = self.determine_status(result.size_mb)
+        return result
 
-        if diff_bytes > 0:
-            status += f" [Margin used: diff={diff_bytes} bytes]"
+    def scan_oversized(self, root_directory: str, min_status=None, include_archives: bool = True,
+                       progress=None):
+        """
+        Every resource in a 'stream' folder, loose or inside .rpf archives, whose status is at least min_status
+        (Warning by default), largest first. Archive entries are sized from their TOC without extraction.
+        """
+        min_severity = (min_status or SizeStatus.WARNING).severity
+        results = [result for result in self.read_resources(root_directory, include_archives, progress)
+                   if result.is_resource and result.status.severity >= min_severity]
+        results.sort(key=lambda r: r.size_bytes, reverse=True)
+        return results
 
-        return (hi_file, size_str, status)
+    def read_resources(self, root_directory: str, include_archives: bool = True, progress=None):
+        """
+        Yields a YftResult for every file in a 'stream' folder, from one pass over the resource headers.
+        """
+        files = StreamDuplicateChecker().find_stream_files(root_directory, progress, include_archives)
+        archives = RpfArchive()
+        if progress:
+            progress.start_phase("Reading headers")
+        for path in files:
+            result = self.read_resource(path, archives)
+            if result:
+                yield result
+            if progress:
+                progress.advance()
+
+    def read_resource(self, path: str, archives):
+        """
+        YftResult with the page sizes and status of a loose file or of an archive entry (virtual path).
+        """
+        virtual = RpfArchive.split_virtual(path)
+        if virtual:
+            entry = archives.entry(*virtual)
+            if not entry:
+                return None
+            result = YftResult(path, entry.is_resource, entry.phys_size, entry.virt_size, entry.size)
+        else:
+            is_resource, physPages, virtPages = self.read_yft_header(path)
+            try:
+                file_size = os.path.getsize(path)
+            except OSError:
+                return None
+            if is_resource:
+                result = YftResult(path, True, self.convert_rsc7_size(physPages), self.convert_rsc7_size(virtPages), file_size)
+            else:
+                result = YftResult(path, False, 0, 0, file_size)
+        result.status = self.determine_status(result.size_mb)
+        return result
 
     def get_original_file(self, hi_file: str):
         """
@@ -129,9 +396,8 @@ class YftCleaner:
         """
         try:
             hash_func = hashlib.sha256()
-            with open(file_path, 'rb') as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hash_func.update(chunk)
+            for chunk in self.io_budget.read_chunks(file_path):
+                hash_func.update(chunk)
             return hash_func.hexdigest()
         except Exception as e:
             print(f"Error: {e}")
@@ -142,22 +408,28 @@ class YftCleaner:
         Read the YFT file header.
         """
         try:
-            with open(file_path, 'rb') as f:
-                header = f.read(16)
-                if len(header) < 16:
-                    return (False, 0, 0)
-                magic, version, virtPages, physPages = struct.unpack('<IIII', header)
-                if magic in [0x37435352, 0x38435352]:
-                    return (True, physPages, virtPages)
-                elif magic == 0x05435352:
-                    return (True, version, virtPages)
-                else:
-                    return (False, 0, 0)
+            return self.parse_header(self.io_budget.read(file_path, 16))
         except Exception as e:
             print(f"Error: {e}")
             return (False, 0, 0)
 
-    def convert_rsc7_size(self, flags: int):
+    @staticmethod
+    def parse_header(header: bytes):
+        """
+        (is_resource, physPages, virtPages) from the first 16 bytes of a file.
+        """
+        if len(header) < 16:
+            return (False, 0, 0)
+        magic, version, virtPages, physPages = struct.unpack('<IIII', header)
+        if magic in [0x37435352, 0x38435352]:
+            return (True, physPages, virtPages)
+        elif magic == 0x05435352:
+            return (True, version, virtPages)
+        else:
+            return (False, 0, 0)
+
+    @staticmethod
+    def convert_rsc7_size(flags: int):
         """
         Convert flags to size in bytes.
         """
@@ -180,481 +452,6117 @@ class YftCleaner:
         Determine the status based on size in MB.
         """
         if size_mb > 64:
-            return "Critical Oversized"
+            return SizeStatus.CRITICAL_OVERSIZED
         elif size_mb > 32:
-            return "Critical"
+            return SizeStatus.CRITICAL
         elif size_mb > 16:
-            return "Warning"
+            return SizeStatus.WARNING
         else:
-            return "OK"
+            return SizeStatus.OK
 
 
-# ------------------------------------------#
-# 2. Stream Duplicate Checker Logic
-# ------------------------------------------#
-class StreamDuplicateChecker:
+@dataclass
+class ChunkFingerprint:
     """
-    A class dedicated to scanning and removing duplicate files in 'Stream' folders
+    Result of one streaming pass over a file: its SHA256, size and content-defined chunk digests.
+    `chunks` maps a chunk digest to (occurrences, chunk size).
     """
-    def __init__(self):
-        self.duplicate_files = {}
-        self.critical_conflicts = {}
+    sha256: str
+    size: int
+    chunks: dict
 
-    def scan_stream_duplicates(self, stream_root_directory: str):
-        """
-        Scan 'stream_root_directory' for all 'stream' folders and gather all files.
-        Only scan files within 'stream' directories for regular duplicates.
-        """
-        stream_files = self.find_stream_files(stream_root_directory)
-        file_dict = {}
-        
-        for file in stream_files:
-            filename = os.path.basename(file).lower()
-            
-            if filename not in file_dict:
-                file_dict[filename] = [os.path.dirname(file)]
-            else:
-                file_dict[filename].append(os.path.dirname(file))
 
-        duplicates = {k: v for k, v in file_dict.items() if len(v) > 1}
-        self.duplicate_files = duplicates
-                
-        return duplicates
+class ChunkSimilarity:
+    """
+    Content-defined chunking (FastCDC-style gear rolling hash) used to measure how many bytes two files share.
 
-    def scan_critical_files(self, root_directory: str):
+    Chunk boundaries depend only on the surrounding bytes, so an insertion or a re-export that shifts data
+    only changes the chunks around the edit instead of every block after it.
+
+    The 32-bit gear hash only depends on the last 32 bytes, so the boundaries in a whole read block are found
+    at once with big-integer arithmetic (see _piece_boundaries) rather than a per-byte Python loop.
+    Measured on 8 MB of random data: 13-20 MB/s against 6-7 MB/s for the old per-byte loop, with identical
+    chunks.
+    """
+    MIN_CHUNK = 2 * 1024
+    MAX_CHUNK = 64 * 1024
+    # Boundary when the top 13 bits of the rolling hash are zero: ~8 KB average chunks after MIN_CHUNK.
+    BOUNDARY_MASK = ((1 << 13) - 1) << 19
+    READ_SIZE = 1024 * 1024
+    WINDOW = 32
+    GEAR = tuple(int.from_bytes(hashlib.sha256(bytes([i])).digest()[:4], 'little') for i in range(256))
+    # GEAR split into byte planes, for bytes.translate
+    GEAR_PLANES = tuple(bytes(plane) for plane in zip(*(value.to_bytes(4, 'little') for value in GEAR)))
+    # (hash byte, table mapping that byte to 0 when it has no BOUNDARY_MASK bit set, else 1)
+    MISS_TABLES = tuple((plane, bytes(int(bool(value & bits)) for value in range(256)))
+                        for plane, bits in enumerate(BOUNDARY_MASK.to_bytes(4, 'little')) if bits)
+    # Bytes hashed per big-integer pass; small enough for the intermediate integers to stay in cache.
+    PIECE_SIZE = 16 * 1024
+
+    @classmethod
+    def boundary_candidates(cls, window: bytes, start: int = 0) -> list:
         """
-        Scan for critical config files (.ymt, .meta, .xml) throughout the entire resource structure.
-        This scans ALL directories, not just 'stream' folders.
+        Indexes i >= start where the gear hash of window[i - 31:i + 1] has no BOUNDARY_MASK bit set.
         """
-        critical_files = self.find_critical_files(root_directory)
-        file_dict = {}
-        
-        for file in critical_files:
-            filename = os.path.basename(file).lower()
-            
-            if filename not in file_dict:
-                file_dict[filename] = [os.path.dirname(file)]
-            else:
-                file_dict[filename].append(os.path.dirname(file))
-        
-        # All critical files are stored, not just duplicates
-        # This allows us to show which critical files exist and where
-        self.critical_conflicts = file_dict
-        
-        return file_dict
-
-    def find_critical_files(self, root_dir: str):
+        candidates = []
+        for piece in range(start, len(window), cls.PIECE_SIZE):
+            first = max(piece - cls.WINDOW + 1, 0)
+            candidates.extend(first + i for i in cls._piece_boundaries(window[first:piece + cls.PIECE_SIZE],
+                                                                       piece - first))
+        return candidates
+
+    @classmethod
+    def _piece_boundaries(cls, window: bytes, start: int) -> list:
         """
-        Recursively find all critical config files (.ymt, .meta, .xml) in ANY folder under root_dir.
-        This does NOT restrict to 'stream' folders since config files often exist at resource root.
+        The gear values are laid out in 64-bit slots of one integer, and five shift-and-add steps sum each
+        slot with its 31 predecessors, each shifted by its distance: no slot can overflow into the next.
+        Each hash byte is then mapped to 0 (no mask bit set) or 1, and the maps are OR-ed together, so the
+        boundaries are the zero bytes of the result.
         """
-        critical_files = []
-        critical_extensions = {'.ymt', '.meta', '.xml'}
-        
-        root = Path(root_dir)
-        
-        # Scan ALL directories, not just stream folders
-        for ext in critical_extensions:
-            for file in root.rglob(f'*{ext}'):
-                if file.is_file():
-                    critical_files.append(str(file))
-        
-        return critical_files
-
-    def is_critical_file(self, filename: str) -> bool:
+        n = len(window)
+        slots = bytearray(8 * n)
+        for plane, table in enumerate(cls.GEAR_PLANES):
+            slots[plane::8] = window.translate(table)
+        rolled = int.from_bytes(slots, 'little')
+        step = 1
+        while step < cls.WINDOW:
+            rolled += rolled << (65 * step)
+            step *= 2
+        hashes = rolled.to_bytes(8 * (n + cls.WINDOW), 'little')
+
+        misses = 0
+        for plane, table in cls.MISS_TABLES:
+            misses |= int.from_bytes(hashes[plane:8 * n:8].translate(table), 'little')
+        misses = misses.to_bytes(n, 'little')
+
+        candidates = []
+        i = misses.find(0, start)
+        while i >= 0:
+            candidates.append(i)
+            i = misses.find(0, i + 1)
+        return candidates
+
+    @classmethod
+    def _chunk_end(cls, data, start: int, base: int, candidates: deque, final: bool):
         """
-        Check if a file is a critical config file based on extension
+        End offset in data of the chunk starting at data[start], or None until more data is read.
+        candidates holds the boundary positions (stream offsets) found so far; base is data[0]'s offset.
         """
-        filename_lower = filename.lower()
-        critical_extensions = {'.ymt', '.meta', '.xml'}
-        
-        for ext in critical_extensions:
-            if filename_lower.endswith(ext):
-                return True
-                
-        return False
-    
-    def get_critical_file_type(self, filename: str) -> str:
+        n = len(data)
+        hash_start = start + cls.MIN_CHUNK
+        limit = start + cls.MAX_CHUNK
+        if hash_start >= n:
+            return n if final and start < n else None
+
+        # The hash restarts after the minimum chunk size, so its first 31 values cover fewer than 32 bytes.
+        gear, mask, h = cls.GEAR, cls.BOUNDARY_MASK, 0
+        head_end = min(hash_start + cls.WINDOW - 1, limit)
+        for i in range(hash_start, min(head_end, n)):
+            h = ((h << 1) + gear[data[i]]) & 0xFFFFFFFF
+            if not h & mask:
+                return i + 1
+        if head_end > n:
+            return n if final else None
+
+        while candidates and candidates[0] < base + head_end:
+            candidates.popleft()
+        if candidates and candidates[0] - base < limit:
+            return candidates[0] - base + 1
+        if limit <= n:
+            return limit
+        return n if final else None
+
+    @classmethod
+    def fingerprint(cls, file_path: str, io_budget=None):
         """
-        Get the type/category of a critical file based on extension
+        Hash and chunk file_path in a single read within io_budget. Returns a ChunkFingerprint, or None on error.
         """
-        filename_lower = filename.lower()
-        
-        if filename_lower.endswith('.ymt'):
-            # Special cases for specific YMT files
-            if 'scenario' in filename_lower:
-                return "Scenario File"
-            elif 'manifest' in filename_lower:
-                return "Manifest File"
-            elif 'doortuning' in filename_lower:
-                return "Door Tuning"
-            elif 'vfxfogvolume' in filename_lower:
-                return "VFX Fog Volume"
-            else:
-                return "YMT Config"
-        elif filename_lower.endswith('.meta'):
-            # Special cases for specific META files
-            if 'gta5' in filename_lower:
-                return "Game Metadata"
-            elif 'gtxd' in filename_lower:
-                return "Texture Dictionary"
-            else:
-                return "META Config"
-        elif filename_lower.endswith('.xml'):
-            # Special cases for specific XML files
-            if 'water' in filename_lower:
-                return "Water Config"
-            else:
-                return "XML Config"
-        elif filename_lower.endswith('.ynv'):
-            return "Navigation Mesh"
-        elif filename_lower.endswith('.ynd'):
-            return "Path Node"
-        
-        return "Config File"
+        try:
+            sha = hashlib.sha256()
+            chunks = {}
+            data = bytearray()
+            base = 0
+            total = 0
+            candidates = deque()
+            tail = b""
+
+            def cut(final):
+                start = 0
+                with memoryview(data) as view:
+                    while True:
+                        end = cls._chunk_end(data, start, base, candidates, final)
+                        if end is None:
+                            break
+                        digest = hashlib.blake2b(view[start:end], digest_size=16).digest()
+                        count, size = chunks.get(digest, (0, end - start))
+                        chunks[digest] = (count + 1, size)
+                        start = end
+                del data[:start]
+                return start
+
+            for block in (io_budget or IoBudget()).read_chunks(file_path, cls.READ_SIZE):
+                sha.update(block)
+                window = tail + block
+                offset = total - len(tail)
+                candidates.extend(offset + i for i in cls.boundary_candidates(window, len(tail)))
+                tail = window[1 - cls.WINDOW:]
+                total += len(block)
+                data += block
+                base += cut(False)
+            cut(True)
+            return ChunkFingerprint(sha.hexdigest(), total, chunks)
+        except Exception as e:
+            print(f"Error: {e}")
+            return None
 
-    def find_stream_files(self, root_dir: str):
+    @staticmethod
+    def shared_bytes(a: ChunkFingerprint, b: ChunkFingerprint) -> int:
+        if len(a.chunks) > len(b.chunks):
+            a, b = b, a
+        shared = 0
+        for digest, (count, size) in a.chunks.items():
+            other = b.chunks.get(digest)
+            if other:
+                shared += min(count, other[0]) * size
+        return shared
+
+    @classmethod
+    def similarity(cls, a: ChunkFingerprint, b: ChunkFingerprint) -> float:
         """
-        Recursively find all files in any 'stream' folders under root_dir.
-        This is for regular duplicate checking, restricted to stream folders.
+        Fraction (0.0-1.0) of the larger file's bytes that also appear in the other file.
         """
-        stream_files = []
-        root = Path(root_dir)
-        for stream_dir in root.rglob('stream'):
-            if stream_dir.is_dir():
-                for file in stream_dir.glob('**/*'):
-                    if file.is_file():
-                        stream_files.append(str(file))
-        return stream_files
+        largest = max(a.size, b.size)
+        if largest == 0:
+            return 1.0
+        return cls.shared_bytes(a, b) / largest
 
-# ----------------------------------------#
-# 3. GUI and Main Controller
-# ----------------------------------------#
-class GUI_MAIN:
+
+APP_DIR = os.path.join(os.path.expanduser("~"), ".stream_file_assistant")
+
+
+class FileCache:
     """
-    A class responsible for managing the entire Tkinter GUI
+    Persistent cache of values derived from file contents (digests, parse results).
+    Entries are invalidated when a file's size or modification time changes.
+    Stored as JSON in APP_DIR/cache/<name>.json and safe to use from worker threads.
     """
-    def __init__(self, root):
-        self.root = root
-        self.root.title("Stream Files Assistant Extended")
-        self.root.geometry("1280x800")
-        self.root.resizable(True, True)
+    def __init__(self, name: str, path: str = None):
+        self.path = path or os.path.join(APP_DIR, "cache", f"{name}.json")
+        self._lock = threading.Lock()
+        self._entries = None
+        self._dirty = False
 
-        # Margin-related variables
-        self.enable_margin_var = tk.BooleanVar(value=False)
-        self.size_margin_kb_var = tk.StringVar(value="0.0")
+    @staticmethod
+    def stamp(file_path: str):
+        st = os.stat(file_path)
+        return [st.st_size, st.st_mtime_ns]
 
-        # Will be created after user hits 'Start Scan'
-        self.yft_cleaner = None
-        self.stream_checker = None
+    @staticmethod
+    def _key(file_path: str) -> str:
+        return os.path.normcase(os.path.abspath(file_path))
 
-        self.root_directory = tk.StringVar()
-        self.stream_root_directory = tk.StringVar()
-        self.total_files = 0
-        self.processed_files = 0
-        self.total_stream_files = 0
-        self.processed_stream_files = 0
-        self.sort_column = None
-        self.sort_reverse = False
-        self.right_clicked_row = None
-        
-        # Critical files filter
-        self.critical_filter_var = tk.StringVar(value="All Files")
+    def _load(self):
+        if self._entries is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
 
-        # Build UI
-        self.setup_ui()
+    def get(self, file_path: str):
+        """
+        Cached value for file_path, or None if missing or stale.
+        """
+        try:
+            stamp = self.stamp(file_path)
+        except OSError:
+            return None
+        with self._lock:
+            entry = self._load().get(self._key(file_path))
+        if entry and entry[0] == stamp:
+            return entry[1]
+        return None
 
-    def setup_ui(self):
-        style = ttk.Style(self.root)
-        style.theme_use("clam")
-        style.configure("Treeview", rowheight=25)
-        style.configure("Treeview.Heading", font=('Calibri', 12, 'bold'))
-        style.configure("TButton", padding=6, font=('Calibri', 10))
-        style.configure("TLabel", font=('Calibri', 10))
-        style.configure("TCombobox", font=('Calibri', 10))
+    def values(self) -> list:
+        """
+        All cached values, stale or not.
+        """
+        with self._lock:
+            return [entry[1] for entry in self._load().values()]
 
-        # Notebook
-        self.notebook = ttk.Notebook(self.root)
-        self.notebook.pack(fill=tk.BOTH, expand=True)
+    def put(self, file_path: str, value, stamp=None):
+        """
+        Store value for file_path. Pass the stamp taken before reading the file to avoid caching a racing write.
+        """
+        try:
+            stamp = stamp or self.stamp(file_path)
+        except OSError:
+            return
+        with self._lock:
+            self._load()[self._key(file_path)] = [stamp, value]
+            self._dirty = True
 
-        # Tab 1: YFT Cleaner
-        self.tab_yft = ttk.Frame(self.notebook)
-        self.notebook.add(self.tab_yft, text="Duplicate YFT Cleaner")
-        self.setup_yft_tab()
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f, separators=(',', ':'))
+            os.replace(tmp_path, self.path)
+            self._dirty = False
 
-        # Tab 2: Stream Duplicate Checker
-        self.tab_stream = ttk.Frame(self.notebook)
-        self.notebook.add(self.tab_stream, text="Stream Duplicate Checker")
-        self.setup_stream_tab()
-        
-        # Tab 3: Critical Config Files
-        self.tab_critical = ttk.Frame(self.notebook)
-        self.notebook.add(self.tab_critical, text="Critical Config Files (.ymt/.meta/.xml)")
-        self.setup_critical_tab()
 
-        # Status bar
-        self.status = tk.StringVar()
-        self.status.set("Ready")
-        lbl_status = ttk.Label(self.root, textvariable=self.status, relief=tk.SUNKEN, anchor="w")
-        lbl_status.pack(fill=tk.X, side=tk.BOTTOM)
+class _SegmentHasher:
+    """
+    SHA256 of a segment with trailing zero padding ignored, fed incrementally.
+    """
+    def __init__(self):
+        self.hash = hashlib.sha256()
+        self.pending_zeros = 0
 
-        # Right-click menus
-        self.yft_context_menu = tk.Menu(self.root, tearoff=0)
-        self.yft_context_menu.add_command(label="View Folder", command=self.view_folder)
+    def update(self, data: bytes):
+        stripped = data.rstrip(b'\0')
+        if not stripped:
+            self.pending_zeros += len(data)
+            return
+        while self.pending_zeros:
+            step = min(self.pending_zeros, 1024 * 1024)
+            self.hash.update(bytes(step))
+            self.pending_zeros -= step
+        self.hash.update(stripped)
+        self.pending_zeros = len(data) - len(stripped)
 
-        self.stream_context_menu = tk.Menu(self.root, tearoff=0)
-        
-        self.critical_context_menu = tk.Menu(self.root, tearoff=0)
+    def hexdigest(self) -> str:
+        return self.hash.hexdigest()
 
-    def setup_yft_tab(self):
-        frame_top = ttk.Frame(self.tab_yft, padding=10)
-        frame_top.pack(fill=tk.X)
 
-        lbl_dir = ttk.Label(frame_top, text="Root Directory:")
-        lbl_dir.grid(row=0, column=0, sticky="w", padx=(0, 5))
+class _HashingReader:
+    """
+    A binary file wrapper that hashes everything read through it, so a file can be parsed and hashed in one pass.
+    """
+    def __init__(self, f):
+        self.f = f
+        self.hash = hashlib.sha256()
+
+    def peek(self, size: int) -> bytes:
+        return self.f.peek(size)[:size]
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.f.read(size)
+        self.hash.update(data)
+        return data
+
+    def chunks(self, size: int):
+        while True:
+            data = self.read(size)
+            if not data:
+                return
+            yield data
 
-        entry_dir = ttk.Entry(frame_top, textvariable=self.root_directory, width=60)
-        entry_dir.grid(row=0, column=1, sticky="w", padx=(0, 5))
+    def hexdigest(self) -> str:
+        """
+        SHA256 of the whole file; whatever the parser left unread is read first.
+        """
+        for _ in self.chunks(ResourceDecoder.READ_SIZE):
+            pass
+        return self.hash.hexdigest()
 
-        btn_browse = ttk.Button(frame_top, text="Browse...", command=self.browse_directory)
-        btn_browse.grid(row=0, column=2, sticky="w")
 
-        # Margin UI
-        frame_margin = ttk.Frame(self.tab_yft, padding=(10, 5))
-        frame_margin.pack(fill=tk.X)
+class ResourceDecoder:
+    """
+    Inflates the payload of an RSC7 resource and digests its virtual (system) and physical (graphics)
+    segments, so two exports that only differ in deflate level or padding compare equal.
+    Decompression is streamed with bounded output per step; digests are cached per file.
+    Files are read through an IoBudget, so decoding is paced like the rest of a scan.
+    """
+    RSC7_MAGIC = 0x37435352
+    READ_SIZE = 256 * 1024
+    OUTPUT_LIMIT = 1024 * 1024
 
-        check_margin = ttk.Checkbutton(
-            frame_margin,
-            text="Enable size margin (KB)",
-            variable=self.enable_margin_var
-        )
-        check_margin.grid(row=0, column=0, sticky="w")
+    def __init__(self, cache: FileCache = None, io_budget=None):
+        self.cache = cache
+        self.io_budget = io_budget or IoBudget()
 
-        entry_margin_kb = ttk.Entry(frame_margin, textvariable=self.size_margin_kb_var, width=10)
-        entry_margin_kb.grid(row=0, column=1, padx=(5, 0), sticky="w")
+    def segment_digests(self, file_path: str):
+        """
+        [version, virtual digest, physical digest] for an RSC7 file, or None if it cannot be decoded.
+        """
+        if self.cache:
+            cached = self.cache.get(file_path)
+            if cached is not None:
+                return cached or None
 
-        frame_scan = ttk.Frame(self.tab_yft, padding=10)
+        try:
+            stamp = FileCache.stamp(file_path)
+            digests = self._decode(file_path)
+        except (OSError, zlib.error, struct.error) as e:
+            print(f"Error: {e}")
+            return None
+
+        if self.cache:
+            # An empty list records "not a decodable resource" so it is not retried.
+            self.cache.put(file_path, digests or [], stamp)
+        return digests
+
+    def _decode(self, file_path: str):
+        opened = self._open(file_path)
+        if not opened:
+            return None
+        version, virt_size, phys_size, chunks = opened
+        hashers = (_SegmentHasher(), _SegmentHasher())
+        with closing(chunks):
+            for segment, data in self._inflate(chunks, virt_size, phys_size):
+                hashers[segment].update(data)
+        return [version, hashers[0].hexdigest(), hashers[1].hexdigest()]
+
+    def read_segments(self, file_path: str, chunks=None):
+        """
+        (version, virtual bytes, physical bytes) of an RSC7 file, or None if it is not one.
+        Holds both decompressed segments in memory, so only use it where the pages must be parsed.
+        chunks, a generator over the file's bytes, is decoded instead of reading file_path when given.
+        """
+        opened = self._open(file_path, chunks)
+        if not opened:
+            return None
+        version, virt_size, phys_size, chunks = opened
+        segments = (bytearray(), bytearray())
+        with closing(chunks):
+            for segment, data in self._inflate(chunks, virt_size, phys_size):
+                segments[segment].extend(data)
+        return version, bytes(segments[0]), bytes(segments[1])
+
+    def read_virtual(self, file_path: str):
+        """
+        (version, virtual bytes) of an RSC7 file, or None if it is not one. The payload is only inflated
+        until the virtual segment is complete; the physical (graphics) pages that follow are never read.
+        """
+        opened = self._open(file_path)
+        if not opened:
+            return None
+        version, virt_size, _, chunks = opened
+        virtual = bytearray()
+        with closing(chunks):
+            for segment, data in self._inflate(chunks, virt_size, 0):
+                virtual.extend(data)
+        return version, bytes(virtual)
+
+    def _open(self, file_path: str, chunks=None):
+        """
+        (version, virtual size, physical size, compressed blocks) of an RSC7 file, or None if it is not one.
+        The blocks are a generator over the file (header stripped) that the caller must close.
+        """
+        if chunks is None:
+            chunks = self.io_budget.read_chunks(file_path, self.READ_SIZE)
+        first = next(chunks, b"")
+        if len(first) < 16:
+            chunks.close()
+            return None
+        magic, version, virt_flags, phys_flags = struct.unpack_from('<IIII', first)
+        if magic != self.RSC7_MAGIC:
+            chunks.close()
+            return None
+        return (version, YftCleaner.convert_rsc7_size(virt_flags), YftCleaner.convert_rsc7_size(phys_flags),
+                self._prepend(first[16:], chunks))
+
+    @staticmethod
+    def _prepend(head: bytes, chunks):
+        try:
+            yield head
+            yield from chunks
+        finally:
+            chunks.close()
+
+    def _inflate(self, chunks, virt_size: int, phys_size: int):
+        """
+        Yield (segment, data) pieces of the decompressed payload: segment 0 is virtual, 1 is physical.
+        """
+        remaining = [virt_size, phys_size]
+        inflater = zlib.decompressobj(-15)
+
+        def split(data):
+            for segment in (0, 1):
+                if data and remaining[segment]:
+                    take = min(remaining[segment], len(data))
+                    yield segment, data[:take]
+                    remaining[segment] -= take
+                    data = data[take:]
+
+        for compressed in chunks:
+            yield from split(inflater.decompress(compressed, self.OUTPUT_LIMIT))
+            while inflater.unconsumed_tail:
+                yield from split(inflater.decompress(inflater.unconsumed_tail, self.OUTPUT_LIMIT))
+            if inflater.eof or not any(remaining):
+                break
+        yield from split(inflater.flush())
+
+
+LOD_LEVELS = ("High", "Medium", "Low", "Very Low")
+
+
+@dataclass
+class DrawableLods:
+    """
+    Geometry per LOD level of a drawable: (models, triangles, vertices) for each of LOD_LEVELS.
+    """
+    levels: list
+
+    @property
+    def high_triangles(self) -> int:
+        return self.levels[0][1]
+
+    @property
+    def high_vertices(self) -> int:
+        return self.levels[0][2]
+
+    def describe(self) -> str:
+        return " / ".join(f"{name} {triangles:,}" if models else f"{name} -"
+                          for name, (models, triangles, _) in zip(LOD_LEVELS, self.levels))
+
+    def to_cache(self) -> list:
+        return [list(level) for level in self.levels]
+
+
+class DrawableLodParser:
+    """
+    Reads the LOD table of a drawable from the decompressed virtual segment (layout as documented by CodeWalker):
+    the High/Medium/Low/Very Low model lists, each model's geometries and their triangle and vertex counts.
+
+    Vertex and index data live in the physical pages and are never needed. Everything is bounds-checked,
+    and unknown layouts yield None.
+    """
+    MODEL_LISTS = 0x50       # four pointers to (entries pointer, u16 count) lists
+    MAX_MODELS = 256
+    MAX_GEOMETRIES = 1024
+
+    def __init__(self, virtual: bytes):
+        self.virtual = virtual
+
+    def _virtual_offset(self, pointer: int, length: int = 8):
+        if pointer and (pointer >> 28) == 0x5:
+            offset = pointer & 0x0FFFFFFF
+            if offset + length <= len(self.virtual):
+                return offset
+        return None
+
+    def _pointer(self, offset: int) -> int:
+        return struct.unpack_from('<Q', self.virtual, offset)[0]
+
+    def drawable_offset(self, extension: str):
+        """
+        Virtual offset of the main drawable: the root of a .ydr, the drawable pointed to at 0x30 in a .yft.
+        """
+        if extension == '.ydr':
+            return 0
+        if extension == '.yft' and len(self.virtual) >= 0x38:
+            return self._virtual_offset(self._pointer(0x30), self.MODEL_LISTS + 32)
+        return None
+
+    def lods(self, extension: str):
+        """
+        DrawableLods of the main drawable, or None if the layout is not recognised.
+        """
+        drawable = self.drawable_offset(extension)
+        if drawable is None or drawable + self.MODEL_LISTS + 32 > len(self.virtual):
+            return None
+        levels = []
+        for level in range(len(LOD_LEVELS)):
+            pointer = self._pointer(drawable + self.MODEL_LISTS + level * 8)
+            if not pointer:
+                levels.append((0, 0, 0))
+                continue
+            models = self._model_list(pointer)
+            if models is None:
+                return None
+            levels.append(models)
+        return DrawableLods(levels)
+
+    def _model_list(self, pointer: int):
+        """
+        (models, triangles, vertices) of one LOD level's model list.
+        """
+        model_list = self._virtual_offset(pointer, 16)
+        if model_list is None:
+            return None
+        entries = self._pointer(model_list)
+        count = struct.unpack_from('<H', self.virtual, model_list + 8)[0]
+        entries = self._virtual_offset(entries, count * 8) if count else None
+        if count > self.MAX_MODELS or (count and entries is None):
+            return None
+
+        triangles = vertices = 0
+        for i in range(count):
+            # DrawableModel: geometries pointer at 0x08, geometry count at 0x10
+            model = self._virtual_offset(self._pointer(entries + i * 8), 0x30)
+            if model is None:
+                return None
+            geometry_count = struct.unpack_from('<H', self.virtual, model + 0x10)[0]
+            geometries = self._virtual_offset(self._pointer(model + 0x08), geometry_count * 8)
+            if geometry_count > self.MAX_GEOMETRIES or (geometry_count and geometries is None):
+                return None
+            for j in range(geometry_count):
+                # DrawableGeometry: triangle count at 0x5C, vertex count at 0x60
+                geometry = self._virtual_offset(self._pointer(geometries + j * 8), 0x98)
+                if geometry is None:
+                    return None
+                triangles += struct.unpack_from('<I', self.virtual, geometry + 0x5C)[0]
+                vertices += struct.unpack_from('<H', self.virtual, geometry + 0x60)[0]
+        return count, triangles, vertices
+
+
+@dataclass
+class RpfEntry:
+    """
+    A file inside an RPF archive, as listed in its table of contents (nothing is extracted).
+    path is relative to the archive with '/' separators; nested archives are prefixed by their own path.
+    """
+    path: str
+    size: int
+    is_resource: bool = False
+    virt_size: int = 0
+    phys_size: int = 0
+    version: int = 0
+
+    @property
+    def name(self) -> str:
+        return self.path.rsplit('/', 1)[-1]
+
+    def to_cache(self) -> list:
+        return [self.path, self.size, self.is_resource, self.virt_size, self.phys_size, self.version]
+
+
+class RpfArchive:
+    """
+    Reads the table of contents of unencrypted RPF7 archives (layout as documented by CodeWalker).
+
+    Only the 16 byte header, the entry table and the name block are read, plus 16 bytes for the rare
+    resources whose size does not fit the entry, so cost follows the TOC size rather than the archive size.
+    Nested archives stored uncompressed are listed too. Encrypted (AES/NG) archives yield no entries.
+    """
+    MAGIC = 0x52504637
+    ENCRYPTION_OPEN = 0x4E45504F
+    DIRECTORY_IDENT = 0x7FFFFF00
+    BLOCK_SIZE = 512
+    MAX_ENTRIES = 1000000
+    MAX_NAMES_LENGTH = 64 * 1024 * 1024
+    MAX_DEPTH = 4
+    EXTENSION = '.rpf'
+
+    def __init__(self, cache: FileCache = None):
+        self.cache = cache or FileCache("rpf_toc")
+        self._entry_maps = {}
+
+    @classmethod
+    def is_archive(cls, name: str) -> bool:
+        return os.path.normcase(name).endswith(cls.EXTENSION)
+
+    @classmethod
+    def split_virtual(cls, path: str):
+        """
+        (archive path on disk, path inside the archive) for a virtual path made by virtual_path(), else None.
+        """
+        marker = os.path.normcase(cls.EXTENSION + os.sep)
+        start = 0
+        while True:
+            index = os.path.normcase(path).find(marker, start)
+            if index < 0:
+                return None
+            archive = path[:index + len(cls.EXTENSION)]
+            if os.path.isfile(archive):
+                return archive, path[index + len(marker):].replace(os.sep, '/')
+            start = index + 1
+
+    @staticmethod
+    def virtual_path(archive_path: str, entry: RpfEntry) -> str:
+        return os.path.join(archive_path, *entry.path.split('/'))
+
+    def entries(self, archive_path: str):
+        """
+        All file entries of an archive, from the cache when the archive is unchanged.
+        """
+        cached = self.cache.get(archive_path)
+        if cached is not None:
+            return [RpfEntry(*values) for values in cached]
+        try:
+            stamp = FileCache.stamp(archive_path)
+            entries = []
+            with open(archive_path, 'rb') as f:
+                self._read_toc(f, 0, "", 0, entries)
+        except (OSError, struct.error) as e:
+            print(f"Error: {e}")
+            return []
+        self.cache.put(archive_path, [entry.to_cache() for entry in entries], stamp)
+        return entries
+
+    def entry(self, archive_path: str, inner_path: str):
+        """
+        The entry at inner_path (case-insensitive) in an archive, or None. Lookups are indexed per archive.
+        """
+        key = os.path.normcase(archive_path)
+        entry_map = self._entry_maps.get(key)
+        if entry_map is None:
+            entry_map = self._entry_maps[key] = {e.path.lower(): e for e in self.entries(archive_path)}
+        return entry_map.get(inner_path.lower())
+
+    def save_cache(self):
+        try:
+            self.cache.save()
+        except OSError as e:
+            print(f"Error: {e}")
+
+    def _read_toc(self, f, base: int, prefix: str, depth: int, entries: list):
+        f.seek(base)
+        header = f.read(16)
+        if len(header) < 16:
+            return
+        magic, count, names_length, encryption = struct.unpack('<IIII', header)
+        if magic != self.MAGIC or not count or count > self.MAX_ENTRIES or names_length > self.MAX_NAMES_LENGTH:
+            return
+        if encryption not in (0, self.ENCRYPTION_OPEN):
+            return
+        table = f.read(count * 16)
+        names = f.read(names_length)
+        if len(table) < count * 16 or len(names) < names_length:
+            return
+
+        def name_at(offset):
+            end = names.find(b'\0', offset)
+            return names[offset:end if end >= 0 else len(names)].decode('utf-8', 'replace')
+
+        # Directories list a contiguous range of child entries; entry 0 is the root.
+        pending = [(0, prefix)]
+        seen = {0}
+        while pending:
+            index, dir_path = pending.pop()
+            _, _, first, child_count = struct.unpack_from('<IIII', table, index * 16)
+            for child in range(first, min(first + child_count, count)):
+                if child in seen:
+                    continue
+                seen.add(child)
+                offset = child * 16
+                packed = struct.unpack_from('<Q', table, offset)[0]
+                ident = packed >> 32
+                if ident == self.DIRECTORY_IDENT:
+                    pending.append((child, dir_path + name_at(struct.unpack_from('<I', table, offset)[0]) + '/'))
+                    continue
+                path = dir_path + name_at(packed & 0xFFFF)
+                size = (packed >> 16) & 0xFFFFFF
+                if ident & 0x80000000:
+                    entries.append(self._resource_entry(f, base, path, packed, size, table, offset))
+                    continue
+                uncompressed_size, _ = struct.unpack_from('<II', table, offset + 8)
+                entries.append(RpfEntry(path, size or uncompressed_size))
+                if not size and depth < self.MAX_DEPTH and self.is_archive(path):
+                    # Nested archives are stored uncompressed, so their TOC can be read in place.
+                    file_offset = ((packed >> 40) & 0xFFFFFF) * self.BLOCK_SIZE
+                    position = f.tell()
+                    self._read_toc(f, base + file_offset, path + '/', depth + 1, entries)
+                    f.seek(position)
+
+    def _resource_entry(self, f, base, path, packed, size, table, offset):
+        system_flags, graphics_flags = struct.unpack_from('<II', table, offset + 8)
+        if size == 0xFFFFFF:
+            # The real size is scattered through the resource's own header.
+            f.seek(base + ((packed >> 40) & 0x7FFFFF) * self.BLOCK_SIZE)
+            data = f.read(16)
+            if len(data) == 16:
+                size = data[7] | (data[14] << 8) | (data[5] << 16) | (data[2] << 24)
+        version = (((system_flags >> 28) & 0xF) << 4) | ((graphics_flags >> 28) & 0xF)
+        return RpfEntry(
+            path, size, True,
+            YftCleaner.convert_rsc7_size(system_flags), YftCleaner.convert_rsc7_size(graphics_flags), version,
+        )
+
+
+class DirectoryWalker:
+    """
+    Parallel directory traversal: worker threads pull directories from a shared queue, list them with
+    os.scandir and push the subdirectories they find back, so deep trees keep several listings in flight.
+
+    Symlinked/junctioned directories are followed, but every directory is listed only once even when it
+    is reachable through several paths, which also breaks symlink loops. Results are sorted unless ordered=False.
+    """
+    def __init__(self, max_workers: int = None, follow_symlinks: bool = True, ordered: bool = True):
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        self.follow_symlinks = follow_symlinks
+        self.ordered = ordered
+
+    STREAM_MARKER = '/stream/'
+
+    @staticmethod
+    def is_stream_dir(name: str) -> bool:
+        return os.path.normcase(name) == 'stream'
+
+    @classmethod
+    def in_stream_dir(cls, path: str, root_dir: str) -> bool:
+        """
+        True when a folder between root_dir and path is a 'stream' folder: is_stream_dir on every folder
+        below the root, as stream_only applies it.
+        """
+        return cls.STREAM_MARKER in os.path.normcase('/' + relative_location(path, root_dir)).replace('\\', '/')
+
+    def walk(self, root_dir: str, file_filter=None, stream_only: bool = False, progress=None, sink=None,
+             archives: bool = False):
+        """
+        Return the paths of all files under root_dir accepted by file_filter(name).
+        With stream_only, only files somewhere below a 'stream' folder are returned.
+        With archives, the entries of .rpf archives are returned too, as virtual paths below the archive path.
+        Accepted files and their sizes are reported to progress (a ScanProgress) as they are found.
+        With sink, each folder's files are passed to sink(paths) from the worker threads instead of being
+        collected, and an empty list is returned. The first error raised by the sink (or while listing) stops
+        the walk and is raised again here.
+        """
+        work = queue.Queue()
+        visited = set()
+        visited_lock = threading.Lock()
+        results = [[] for _ in range(self.max_workers)]
+        errors = []
+        archive_index = RpfArchive() if archives else None
+
+        def first_visit(path):
+            try:
+                st = os.stat(path)
+            except OSError:
+                return False
+            key = (st.st_dev, st.st_ino)
+            with visited_lock:
+                if key in visited:
+                    return False
+                visited.add(key)
+            return True
+
+        def list_dir(dir_path, in_stream, found):
+            found_before = len(found)
+            found_bytes = 0
+            try:
+                with os.scandir(dir_path) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=self.follow_symlinks):
+                                if self.follow_symlinks and not first_visit(entry.path):
+                                    continue
+                                work.put((entry.path, in_stream or self.is_stream_dir(entry.name)))
+                            elif entry.is_file():
+                                if (in_stream or not stream_only) and (file_filter is None or file_filter(entry.name)):
+                                    found.append(entry.path)
+                                    if progress:
+                                        found_bytes += entry.stat().st_size
+                                if archive_index and RpfArchive.is_archive(entry.name):
+                                    found_bytes += list_archive(entry.path, in_stream, found)
+                        except OSError:
+                            continue
+            except OSError:
+                pass
+            if progress and len(found) > found_before:
+                progress.discover(len(found) - found_before, found_bytes)
+
+        def list_archive(archive_path, in_stream, found):
+            found_bytes = 0
+            for item in archive_index.entries(archive_path):
+                parts = item.path.split('/')
+                if stream_only and not in_stream and not any(self.is_stream_dir(part) for part in parts[:-1]):
+                    continue
+                if file_filter is None or file_filter(parts[-1]):
+                    found.append(RpfArchive.virtual_path(archive_path, item))
+                    found_bytes += item.size
+            return found_bytes
+
+        def worker(found):
+            while True:
+                item = work.get()
+                try:
+                    if item is None:
+                        return
+                    # After a failure the queue is only drained, so work.join() still returns.
+                    if not errors:
+                        list_dir(item[0], item[1], found)
+                        if sink and found:
+                            sink(found)
+                            found.clear()
+                except Exception as e:
+                    errors.append(e)
+                finally:
+                    work.task_done()
+
+        if not os.path.isdir(root_dir):
+            return []
+        first_visit(root_dir)
+        work.put((root_dir, False))
+        threads = [threading.Thread(target=worker, args=(found,), daemon=True) for found in results]
+        for thread in threads:
+            thread.start()
+        work.join()
+        for _ in threads:
+            work.put(None)
+        for thread in threads:
+            thread.join()
+        if errors:
+            raise errors[0]
+
+        if archive_index:
+            archive_index.save_cache()
+        if sink:
+            return []
+        files = [path for found in results for path in found]
+        if self.ordered:
+            files.sort()
+        return files
+
+
+class FileListing:
+    """
+    A file list produced elsewhere, read line by line in place of a DirectoryWalker when only a listing of the
+    tree is available. walk() takes the same arguments and never touches the listed files.
+
+    Accepted lines: a plain path (find -print), 'size<TAB>path' (find -printf '%s\\t%p\\n'), NDJSON objects
+    with "path" (or "full_path"/"key") and optional "size", or a whole asset manifest. Relative paths are
+    taken relative to the scanned root (or the manifest's root). Files ending in .gz are decompressed.
+    A manifest only lists the stream folders, so it cannot stand in for a walk of the whole tree.
+    """
+    BATCH_SIZE = 4096
+
+    def __init__(self, listing_path: str):
+        self.listing_path = listing_path
+
+    def _open(self):
+        if self.listing_path.lower().endswith('.gz'):
+            return gzip.open(self.listing_path, 'rt', encoding='utf-8', errors='replace')
+        return open(self.listing_path, 'r', encoding='utf-8', errors='replace', buffering=ReportExporter.BUFFER_SIZE)
+
+    def is_manifest(self) -> bool:
+        return AssetManifest.is_manifest(self.listing_path)
+
+    def records(self, root_dir: str = ""):
+        """
+        Yield (path, size) for every listed file; size is 0 when the listing has none.
+        """
+        with self._open() as f:
+            manifest = False
+            base = root_dir
+            for number, line in enumerate(f):
+                line = line.rstrip('\r\n')
+                if not line:
+                    continue
+                size = 0
+                if manifest:
+                    fields = line.split('\t')
+                    # Manifests from version 2 on keep the path as written after the case-folded key.
+                    path, size = fields[7] if len(fields) > 7 else fields[0], int(fields[1])
+                elif line.startswith('{'):
+                    record = json.loads(line)
+                    if number == 0 and record.get("kind") == AssetManifest.KIND:
+                        manifest = True
+                        base = root_dir or record.get("root", "")
+                        continue
+                    path = record.get("path") or record.get("full_path") or record.get("key")
+                    if not path:
+                        continue
+                    size = int(record.get("size", record.get("size_bytes", 0)) or 0)
+                else:
+                    head, tab, tail = line.partition('\t')
+                    if tab and head.isdigit():
+                        path, size = tail, int(head)
+                    else:
+                        path = line
+                if os.sep == '/':
+                    path = path.replace('\\', '/')
+                if base and not path.startswith(('/', '\\')) and not os.path.isabs(path):
+                    path = os.path.join(base, os.path.normpath(path))
+                yield path, size
+
+    def walk(self, root_dir: str, file_filter=None, stream_only: bool = False, progress=None, sink=None,
+             archives: bool = False):
+        """
+        DirectoryWalker.walk over the listing. Archive contents are not listed, so archives is ignored.
+        """
+        found = []
+        pending_files = pending_bytes = 0
+        for path, size in self.records(root_dir):
+            if file_filter is not None and not file_filter(os.path.basename(path)):
+                continue
+            if stream_only and not DirectoryWalker.in_stream_dir(path, root_dir):
+                continue
+            found.append(path)
+            pending_files += 1
+            pending_bytes += size
+            if pending_files >= self.BATCH_SIZE:
+                if progress:
+                    progress.discover(pending_files, pending_bytes)
+                pending_files = pending_bytes = 0
+                if sink:
+                    sink(found)
+                    found = []
+        if progress and pending_files:
+            progress.discover(pending_files, pending_bytes)
+        if sink:
+            if found:
+                sink(found)
+            return []
+        found.sort()
+        return found
+
+
+@dataclass
+class ProgressSnapshot:
+    """
+    Point-in-time view of a ScanProgress, safe to hand to the UI thread.
+    """
+    phase: str
+    by_bytes: bool
+    discovered_files: int
+    discovered_bytes: int
+    processed_files: int
+    processed_bytes: int
+    files_per_sec: float
+    bytes_per_sec: float
+    elapsed: float
+    eta: float = None
+    finished: bool = False
+    discovering: bool = False
+
+    @property
+    def percent(self) -> float:
+        if self.finished:
+            return 100.0
+        if self.by_bytes and self.discovered_bytes:
+            return min(100.0, self.processed_bytes / self.discovered_bytes * 100.0)
+        if self.discovered_files:
+            return min(100.0, self.processed_files / self.discovered_files * 100.0)
+        return 0.0
+
+    @staticmethod
+    def format_duration(seconds: float) -> str:
+        seconds = int(seconds)
+        hours, rest = divmod(seconds, 3600)
+        return f"{hours}:{rest // 60:02d}:{rest % 60:02d}" if hours else f"{rest // 60:02d}:{rest % 60:02d}"
+
+    def describe(self) -> str:
+        if self.finished:
+            files = self.discovered_files if self.discovering else self.processed_files
+            return f"{self.phase}: {files} files in {self.format_duration(self.elapsed)}"
+        if self.discovering:
+            # Discovery: nothing to compare against yet, so only report what has been found.
+            text = f"{self.phase}: {self.discovered_files} files"
+            if self.discovered_bytes:
+                text += f", {self.discovered_bytes / MB:.1f} MB"
+            return text + f" ({self.files_per_sec:.0f} files/s)"
+        text = f"{self.phase}: {self.processed_files}/{self.discovered_files} files"
+        rates = f"{self.files_per_sec:.0f} files/s"
+        if self.by_bytes:
+            text += f", {self.processed_bytes / MB:.1f}/{self.discovered_bytes / MB:.1f} MB"
+            rates = f"{self.bytes_per_sec / MB:.1f} MB/s, {rates}"
+        text += f" - {rates}"
+        if self.eta is not None:
+            text += f" - ETA {self.format_duration(self.eta)}"
+        return text
+
+
+class ScanProgress:
+    """
+    Thread-safe progress counters for one scan. The engine reports discovered and processed files/bytes
+    per phase; the UI or CLI polls snapshot() at its own fixed rate, which derives rolling files/s and MB/s
+    over the last WINDOW seconds and an ETA from them.
+    """
+    WINDOW = 5.0
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.monotonic()
+        self.phase = "Discovering"
+        self.by_bytes = False
+        self.discovered_files = 0
+        self.discovered_bytes = 0
+        self.processed_files = 0
+        self.processed_bytes = 0
+        self.finished = False
+        self.ended = None
+        self.discovering = True
+        self._samples = deque()
+
+    def start_phase(self, phase: str, by_bytes: bool = False):
+        """
+        Begin a processing phase over everything discovered so far; ETA follows bytes when by_bytes is set.
+        """
+        with self._lock:
+            self.phase = phase
+            self.discovering = False
+            self.by_bytes = by_bytes and self.discovered_bytes > 0
+            self.processed_files = 0
+            self.processed_bytes = 0
+            self._samples.clear()
+
+    def discover(self, files: int = 1, nbytes: int = 0):
+        with self._lock:
+            self.discovered_files += files
+            self.discovered_bytes += nbytes
+
+    def advance(self, files: int = 1, nbytes: int = 0):
+        with self._lock:
+            self.processed_files += files
+            self.processed_bytes += nbytes
+
+    def advance_file(self, file_path: str):
+        """
+        Count one processed file together with its size on disk.
+        """
+        try:
+            nbytes = os.path.getsize(file_path)
+        except OSError:
+            nbytes = 0
+        self.advance(1, nbytes)
+
+    def finish(self, phase: str = "Done"):
+        with self._lock:
+            if not self.finished:
+                self.ended = time.monotonic()
+            self.phase = phase
+            self.finished = True
+
+    def snapshot(self) -> ProgressSnapshot:
+        now = time.monotonic()
+        with self._lock:
+            discovering = self.discovering
+            files = self.discovered_files if discovering else self.processed_files
+            nbytes = self.discovered_bytes if discovering else self.processed_bytes
+            self._samples.append((now, files, nbytes))
+            while len(self._samples) > 2 and now - self._samples[0][0] > self.WINDOW:
+                self._samples.popleft()
+            first_time, first_files, first_bytes = self._samples[0]
+            span = now - first_time
+            files_per_sec = (files - first_files) / span if span > 0 else 0.0
+            bytes_per_sec = (nbytes - first_bytes) / span if span > 0 else 0.0
+
+            eta = None
+            if not discovering and not self.finished:
+                if self.by_bytes and bytes_per_sec > 0:
+                    eta = max(0, self.discovered_bytes - self.processed_bytes) / bytes_per_sec
+                elif not self.by_bytes and files_per_sec > 0:
+                    eta = max(0, self.discovered_files - self.processed_files) / files_per_sec
+
+            return ProgressSnapshot(
+                self.phase, self.by_bytes, self.discovered_files, self.discovered_bytes,
+                self.processed_files, self.processed_bytes, files_per_sec, bytes_per_sec,
+                (self.ended or now) - self.started, eta, self.finished, discovering,
+            )
+
+
+class ProgressReporter:
+    """
+    Publishes snapshots of a ScanProgress to callback(snapshot) every interval seconds from a background
+    thread, plus a final one when stopped. Use as a context manager around the scan.
+    """
+    def __init__(self, progress: ScanProgress, callback, interval: float = 1.0):
+        self.progress = progress
+        self.callback = callback
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.callback(self.progress.snapshot())
+
+    def __enter__(self):
+        self._thread.start()
+        return self.progress
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop.set()
+        self._thread.join()
+        self.callback(self.progress.snapshot())
+        return False
+
+
+class IoBudget:
+    """
+    Low-impact file reading for scans on a live server. Reads are paced to a MB/s and IOPS budget shared by
+    all threads. In background mode, files are opened with sequential/no-reuse hints, and the pages a read
+    brought into the page cache are dropped again afterwards (posix_fadvise), so a scan does not push the
+    server's own hot assets out. Pages that were already cached before the read are left alone; where their
+    residency cannot be checked (no mincore), nothing is dropped.
+    The default IoBudget has no limits and reads at full speed.
+    """
+    READ_SIZE = 256 * 1024
+    PROCESS_MODE_BACKGROUND_BEGIN = 0x00100000
+    IOPRIO_CLASS_IDLE = 3 << 13
+    # ioprio_set syscall numbers by machine
+    IOPRIO_SET = {'x86_64': 251, 'amd64': 251, 'i386': 289, 'i686': 289, 'aarch64': 30, 'arm64': 30}
+    _priority_lowered = False
+    _libc = None
+
+    def __init__(self, mb_per_sec: float = 0.0, iops: float = 0.0, background: bool = False):
+        self.bytes_per_sec = max(0.0, mb_per_sec) * MB
+        self.iops = max(0.0, iops)
+        self.background = background
+        self._lock = threading.Lock()
+        self._ready = time.monotonic()
+
+    def _wait(self, nbytes: int):
+        """
+        Reserve the next slot for one read of nbytes and sleep until it starts.
+        """
+        cost = 0.0
+        if self.iops > 0:
+            cost = 1.0 / self.iops
+        if self.bytes_per_sec > 0:
+            cost = max(cost, nbytes / self.bytes_per_sec)
+        if cost <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._ready)
+            self._ready = start + cost
+        if start > now:
+            time.sleep(start - now)
+
+    def _advise(self, fd: int, advice: str):
+        if self.background and hasattr(os, 'posix_fadvise'):
+            try:
+                os.posix_fadvise(fd, 0, 0, getattr(os, advice))
+            except (OSError, AttributeError):
+                pass
+
+    @classmethod
+    def _mincore(cls):
+        """
+        libc with mmap/mincore/munmap prototypes set, or None where they are unavailable.
+        """
+        if cls._libc is None:
+            cls._libc = False
+            try:
+                import ctypes
+                libc = ctypes.CDLL(None, use_errno=True)
+                libc.mmap.restype = ctypes.c_void_p
+                libc.mmap.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_int, ctypes.c_int, ctypes.c_int,
+                                      ctypes.c_long]
+                libc.mincore.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_char_p]
+                libc.munmap.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
+                cls._libc = libc
+            except (OSError, AttributeError, ImportError):
+                pass
+        return cls._libc or None
+
+    def _resident_pages(self, fd: int, limit: int = None):
+        """
+        One byte per page of the first limit bytes of fd (low bit set when the page is cached), taken before
+        reading so only the pages this scan brings in are dropped afterwards. None when it cannot be checked.
+        """
+        if not self.background or not hasattr(os, 'posix_fadvise'):
+            return None
+        libc = self._mincore()
+        if not libc:
+            return None
+        import ctypes
+        try:
+            length = os.fstat(fd).st_size
+        except OSError:
+            return None
+        if limit is not None:
+            length = min(length, limit)
+        if length <= 0:
+            return b""
+        address = libc.mmap(None, length, mmap.PROT_READ, mmap.MAP_SHARED, fd, 0)
+        if address in (None, ctypes.c_void_p(-1).value):
+            return None
+        try:
+            pages = ctypes.create_string_buffer((length + mmap.PAGESIZE - 1) // mmap.PAGESIZE)
+            if libc.mincore(address, length, pages) != 0:
+                return None
+            return pages.raw
+        finally:
+            libc.munmap(address, length)
+
+    @staticmethod
+    def _drop_pages(fd: int, resident):
+        """
+        Drop the runs of pages that were not cached before the read from the page cache.
+        """
+        if not resident:
+            return
+        start = None
+        for page, flags in enumerate(resident + b"\1"):
+            if not flags & 1:
+                if start is None:
+                    start = page
+            elif start is not None:
+                try:
+                    os.posix_fadvise(fd, start * mmap.PAGESIZE, (page - start) * mmap.PAGESIZE,
+                                     os.POSIX_FADV_DONTNEED)
+                except OSError:
+                    return
+                start = None
+
+    def read_chunks(self, file_path: str, chunk_size: int = None, limit: int = None):
+        """
+        Yield the blocks of file_path, or only of its first limit bytes, within the budget.
+        """
+        chunk_size = chunk_size or self.READ_SIZE
+        with open(file_path, 'rb') as f:
+            fd = f.fileno()
+            resident = self._resident_pages(fd, limit)
+            self._advise(fd, 'POSIX_FADV_SEQUENTIAL')
+            self._advise(fd, 'POSIX_FADV_NOREUSE')
+            remaining = limit
+            try:
+                while remaining is None or remaining > 0:
+                    size = chunk_size if remaining is None else min(chunk_size, remaining)
+                    self._wait(size)
+                    block = f.read(size)
+                    if not block:
+                        break
+                    yield block
+                    if remaining is not None:
+                        remaining -= len(block)
+            finally:
+                self._drop_pages(fd, resident)
+
+    def read(self, file_path: str, limit: int) -> bytes:
+        return b"".join(self.read_chunks(file_path, limit, limit))
+
+    @classmethod
+    def lower_priority(cls):
+        """
+        Lower the CPU and I/O priority of this process for the rest of its life: background processing mode
+        on Windows, nice +10 and the idle I/O class elsewhere. Threads started afterwards inherit it on Linux,
+        so call it before starting a scan.
+        """
+        if cls._priority_lowered:
+            return
+        cls._priority_lowered = True
+        try:
+            import ctypes
+            if sys.platform == 'win32':
+                kernel32 = ctypes.windll.kernel32
+                kernel32.SetPriorityClass(kernel32.GetCurrentProcess(), cls.PROCESS_MODE_BACKGROUND_BEGIN)
+                return
+            os.nice(10)
+            syscall_nr = cls.IOPRIO_SET.get(os.uname().machine.lower())
+            if sys.platform.startswith('linux') and syscall_nr:
+                # IOPRIO_WHO_PROCESS, this process
+                ctypes.CDLL(None, use_errno=True).syscall(syscall_nr, 1, 0, cls.IOPRIO_CLASS_IDLE)
+        except (OSError, AttributeError, ImportError) as e:
+            print(f"Error: {e}")
+
+
+# ------------------------------------------#
+# 2. Stream Duplicate Checker Logic
+# ------------------------------------------#
+def joaat(text: str) -> int:
+    """
+    Jenkins one-at-a-time hash of a lower-cased name, as the game uses to resolve asset and archetype names.
+    """
+    h = 0
+    for c in text.lower().encode('utf-8'):
+        h = (h + c) & 0xFFFFFFFF
+        h = (h + (h << 10)) & 0xFFFFFFFF
+        h ^= h >> 6
+    h = (h + (h << 3)) & 0xFFFFFFFF
+    h ^= h >> 11
+    return (h + (h << 15)) & 0xFFFFFFFF
+
+
+def joaat_many(names) -> list:
+    """
+    joaat of many names at once, in input order.
+
+    Names of equal length are hashed together with each name in its own 64-bit lane of one big integer,
+    so every step of the hash is a handful of big-integer operations per batch instead of per name.
+    Lanes never overflow (values stay below 2**48 before masking), so they cannot disturb each other.
+    """
+    encoded = [name.lower().encode('utf-8') for name in names]
+    hashes = [0] * len(encoded)
+    by_length = {}
+    for index, data in enumerate(encoded):
+        by_length.setdefault(len(data), []).append(index)
+
+    for length, indices in by_length.items():
+        count = len(indices)
+        lane_mask = int.from_bytes(b'\xff\xff\xff\xff\0\0\0\0' * count, 'little')
+        joined = b''.join(encoded[i] for i in indices)
+        lanes = bytearray(count * 8)
+        h = 0
+        for position in range(length):
+            lanes[0::8] = joined[position::length]
+            h = (h + int.from_bytes(lanes, 'little')) & lane_mask
+            h = (h + (h << 10)) & lane_mask
+            h ^= (h >> 6) & lane_mask
+        h = (h + (h << 3)) & lane_mask
+        h ^= (h >> 11) & lane_mask
+        h = (h + (h << 15)) & lane_mask
+        values = struct.unpack(f'<{count * 2}I', h.to_bytes(count * 8, 'little'))
+        for lane, index in enumerate(indices):
+            hashes[index] = values[lane * 2]
+    return hashes
+
+
+@dataclass(frozen=True)
+class CriticalRule:
+    """
+    One row of the critical file table. A rule matches a lower-case file name when every given criterion
+    matches: an exact name, an extension, or any of the regex patterns (searched anywhere in the name).
+    critical rules take part in the critical scan; severity is shown when their files conflict.
+    """
+    category: str
+    extensions: tuple = ()
+    patterns: tuple = ()
+    names: tuple = ()
+    severity: str = "Critical"
+    critical: bool = True
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(
+            category=data["category"],
+            extensions=tuple(ext.lower() for ext in data.get("extensions", ())),
+            patterns=tuple(data.get("patterns", ())),
+            names=tuple(name.lower() for name in data.get("names", ())),
+            severity=data.get("severity", "Critical"),
+            critical=data.get("critical", True),
+        )
+
+
+# First matching rule wins, so specific rules come before the catch-all for their extension.
+DEFAULT_CRITICAL_RULES = (
+    CriticalRule("Scenario File", ('.ymt',), ('scenario',)),
+    CriticalRule("Manifest File", ('.ymt',), ('manifest',)),
+    CriticalRule("Door Tuning", ('.ymt',), ('doortuning',)),
+    CriticalRule("VFX Fog Volume", ('.ymt',), ('vfxfogvolume',)),
+    CriticalRule("YMT Config", ('.ymt',)),
+    CriticalRule("Game Metadata", ('.meta',), ('gta5',)),
+    CriticalRule("Texture Dictionary", ('.meta',), ('gtxd',)),
+    CriticalRule("META Config", ('.meta',)),
+    CriticalRule("Water Config", ('.xml',), ('water',)),
+    CriticalRule("XML Config", ('.xml',)),
+    CriticalRule("Navigation Mesh", ('.ynv',), critical=False),
+    CriticalRule("Path Node", ('.ynd',), critical=False),
+)
+
+CRITICAL_RULES_PATH = os.path.join(APP_DIR, "critical_rules.json")
+
+
+class CriticalClassifier:
+    """
+    Classifies file names against a CriticalRule table compiled once: exact-name rules become a dict lookup
+    and all other rules a single regex whose alternatives keep the table order. When both match, the rule
+    that comes first in the table wins. Results are memoised per name.
+
+    Extra rules can be added in APP_DIR/critical_rules.json as {"rules": [{"category": ..., "extensions": [...],
+    "patterns": [...], "names": [...], "severity": ..., "critical": ...}], "replace_defaults": false};
+    they are tried before the built-in rules unless replace_defaults is set.
+    """
+    FALLBACK_CATEGORY = "Config File"
+    _default = None
+
+    def __init__(self, rules):
+        self.rules = tuple(rules)
+        # name -> (table index, rule)
+        self.exact = {}
+        self._group_rules = {}
+        self._group_indexes = {}
+        alternatives = []
+        for index, rule in enumerate(self.rules):
+            if rule.names and not rule.extensions and not rule.patterns:
+                for name in rule.names:
+                    self.exact.setdefault(name, (index, rule))
+                continue
+            group = f"rule{index}"
+            self._group_rules[group] = rule
+            self._group_indexes[group] = index
+            alternatives.append(f"(?P<{group}>{self._rule_regex(rule)})")
+        self._first_group_index = min(self._group_indexes.values(), default=len(self.rules))
+        self.regex = re.compile('|'.join(alternatives), re.DOTALL) if alternatives else None
+        self.extensions = tuple(sorted({ext for rule in self.rules if rule.critical for ext in rule.extensions}))
+        self._cache = {}
+
+    @staticmethod
+    def _rule_regex(rule: CriticalRule) -> str:
+        regex = ""
+        if rule.names:
+            regex += "(?=(?:" + '|'.join(re.escape(name) for name in rule.names) + r")\Z)"
+        if rule.patterns:
+            regex += "(?=.*?(?:" + '|'.join(f"(?:{pattern})" for pattern in rule.patterns) + "))"
+        regex += ".*"
+        if rule.extensions:
+            regex += "(?:" + '|'.join(re.escape(ext) for ext in rule.extensions) + ")"
+        return regex
+
+    @classmethod
+    def load(cls, path: str = CRITICAL_RULES_PATH):
+        """
+        Classifier for the built-in rules plus any configured in path. A broken config is reported and ignored.
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+            custom = [CriticalRule.from_dict(rule) for rule in config.get("rules", [])]
+            return cls(custom if config.get("replace_defaults") else custom + list(DEFAULT_CRITICAL_RULES))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, TypeError, AttributeError, re.error) as e:
+            print(f"Error: {e}")
+        return cls(DEFAULT_CRITICAL_RULES)
+
+    @classmethod
+    def default(cls):
+        if cls._default is None:
+            cls._default = cls.load()
+        return cls._default
+
+    def classify(self, filename: str):
+        """
+        The first CriticalRule matching filename, or None.
+        """
+        name = filename.lower()
+        try:
+            return self._cache[name]
+        except KeyError:
+            pass
+        exact = self.exact.get(name)
+        rule = None
+        # Only run the regex when one of its rules comes before the exact-name hit in the table.
+        if self.regex and (exact is None or exact[0] > self._first_group_index):
+            match = self.regex.fullmatch(name)
+            if match:
+                group = match.lastgroup
+                if group not in self._group_rules:
+                    # A custom pattern with its own named group; fall back to the first rule group that matched.
+                    group = next(g for g, v in match.groupdict().items() if v is not None and g in self._group_rules)
+                if exact is None or self._group_indexes[group] < exact[0]:
+                    rule = self._group_rules[group]
+        if rule is None and exact is not None:
+            rule = exact[1]
+        self._cache[name] = rule
+        return rule
+
+    def is_critical(self, filename: str) -> bool:
+        rule = self.classify(filename)
+        return rule is not None and rule.critical
+
+    def category(self, filename: str) -> str:
+        rule = self.classify(filename)
+        return rule.category if rule else self.FALLBACK_CATEGORY
+
+
+BASE_GAME_INDEX_PATH = os.path.join(APP_DIR, "basegame.idx")
+
+
+class BaseGameIndex:
+    """
+    The file names of the base game, for flagging stream files that override vanilla assets.
+
+    Built once from a plain list (one file name or path per line) into a compact index file: a header, the
+    sorted joaat hashes of all lower-case names, each name's offset, then the names themselves. The file is
+    memory-mapped, so hundreds of thousands of names load instantly, and a lookup is a binary search over the
+    hashes followed by an exact comparison with the few names that share the hash.
+    """
+    MAGIC = b'SFAB'
+    VERSION = 1
+    HEADER = struct.Struct('<4sIII')   # magic, version, count, names offset
+
+    def __init__(self, index_path: str = BASE_GAME_INDEX_PATH):
+        if sys.byteorder != 'little':
+            raise ValueError("The base-game index is only supported on little-endian machines.")
+        self.index_path = index_path
+        with open(index_path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count, names_offset = self.HEADER.unpack_from(self._map, 0)
+        if magic != self.MAGIC or version != self.VERSION:
+            self._map.close()
+            raise ValueError(f"Not a base-game index: {index_path}")
+        view = memoryview(self._map)
+        start = self.HEADER.size
+        self.count = count
+        self.hashes = view[start:start + 4 * count].cast('I')
+        self.offsets = view[start + 4 * count:start + 8 * count].cast('I')
+        self.names_offset = names_offset
+        view.release()
+
+    @classmethod
+    def build(cls, list_path: str, index_path: str = BASE_GAME_INDEX_PATH) -> int:
+        """
+        Build the index file from a name list and return the number of distinct names.
+        """
+        names = set()
+        with open(list_path, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    names.add(line.replace('\\', '/').rsplit('/', 1)[-1].lower())
+        names = sorted(names)
+        hashes = joaat_many(names)
+        order = sorted(range(len(names)), key=lambda i: hashes[i])
+        hash_array, offset_array, blob = array('I'), array('I'), bytearray()
+        for i in order:
+            hash_array.append(hashes[i])
+            offset_array.append(len(blob))
+            blob += names[i].encode('utf-8') + b'\n'
+
+        os.makedirs(os.path.dirname(os.path.abspath(index_path)), exist_ok=True)
+        tmp_path = index_path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(cls.HEADER.pack(cls.MAGIC, cls.VERSION, len(names), cls.HEADER.size + 8 * len(names)))
+            f.write(hash_array.tobytes())
+            f.write(offset_array.tobytes())
+            f.write(blob)
+        os.replace(tmp_path, index_path)
+        return len(names)
+
+    @classmethod
+    def load_default(cls):
+        """
+        The index in APP_DIR, or None when no base-game list was loaded yet.
+        """
+        if not os.path.isfile(BASE_GAME_INDEX_PATH):
+            return None
+        try:
+            return cls(BASE_GAME_INDEX_PATH)
+        except (OSError, ValueError, struct.error) as e:
+            print(f"Error: {e}")
+            return None
+
+    def _contains_hash(self, name: bytes, hash_value: int) -> bool:
+        i = bisect_left(self.hashes, hash_value)
+        while i < self.count and self.hashes[i] == hash_value:
+            start = self.names_offset + self.offsets[i]
+            if self._map[start:start + len(name) + 1] == name + b'\n':
+                return True
+            i += 1
+        return False
+
+    def __contains__(self, name: str) -> bool:
+        name = name.lower()
+        return self._contains_hash(name.encode('utf-8'), joaat(name))
+
+    def find(self, names) -> set:
+        """
+        The lower-case file names among names that are base-game assets, hashed in one batch.
+        """
+        names = [name.lower() for name in names]
+        return {
+            name for name, hash_value in zip(names, joaat_many(names))
+            if self._contains_hash(name.encode('utf-8'), hash_value)
+        }
+
+    def close(self):
+        self.hashes.release()
+        self.offsets.release()
+        self._map.close()
+
+
+class StreamDuplicateChecker:
+    """
+    A class dedicated to scanning and removing duplicate files in 'Stream' folders
+    """
+    def __init__(self, walker=None):
+        # A DirectoryWalker, or a FileListing to scan a listing instead of the live tree.
+        self.walker = walker or DirectoryWalker()
+        self.duplicate_files = {}
+        self.critical_conflicts = {}
+        self.critical_types = {}
+        self.name_locations = {}
+        self.hash_collisions = {}
+        # Optional BaseGameIndex; stream files with a base-game name are reported in base_game_overrides.
+        self.base_game = None
+        self.base_game_overrides = {}
+        self.stream_files = []
+        self.classifier = CriticalClassifier.default()
+
+    def scan_stream_duplicates(self, stream_root_directory: str, progress: ScanProgress = None,
+                               include_archives: bool = False):
+        """
+        Scan 'stream_root_directory' for all 'stream' folders and gather all files.
+        Only scan files within 'stream' directories for regular duplicates.
+        """
+        return self.group_stream_files(self.find_stream_files(stream_root_directory, progress, include_archives),
+                                       progress)
+
+    def group_stream_files(self, stream_files, progress: ScanProgress = None):
+        """
+        Group a list of stream file paths by file name, as scan_stream_duplicates does after its walk.
+        Also used with the file list of a running index service.
+        """
+        self.stream_files = stream_files
+        file_dict = {}
+
+        if progress:
+            progress.start_phase("Grouping")
+        for file in stream_files:
+            filename = os.path.basename(file).lower()
+            
+            if filename not in file_dict:
+                file_dict[filename] = [os.path.dirname(file)]
+            else:
+                file_dict[filename].append(os.path.dirname(file))
+        self.name_locations = file_dict
+        self.hash_collisions = self.find_hash_collisions(file_dict)
+        self.base_game_overrides = self.find_base_game_overrides(file_dict)
+        if progress:
+            progress.advance(len(stream_files))
+
+        duplicates = {k: v for k, v in file_dict.items() if len(v) > 1}
+        self.duplicate_files = duplicates
+                
+        return duplicates
+
+    def find_base_game_overrides(self, name_locations: dict) -> dict:
+        """
+        {name: locations} of the stream files whose name is also a base-game asset, which they replace.
+        """
+        if not self.base_game:
+            return {}
+        return {name: name_locations[name] for name in self.base_game.find(name_locations)}
+
+    @staticmethod
+    def find_hash_collisions(names):
+        """
+        Distinct lower-case file names whose stems share a joaat hash within the same extension.
+        The game resolves streamed assets by that hash, so these clash although the names differ.
+        Returns {name: [the other names with the same hash]}.
+        """
+        names = list(names)
+        splits = [os.path.splitext(name) for name in names]
+        hashes = joaat_many([stem for stem, _ in splits])
+        groups = {}
+        for name, (_, extension), hash_value in zip(names, splits, hashes):
+            groups.setdefault((extension, hash_value), []).append(name)
+        collisions = {}
+        for group in groups.values():
+            if len(group) > 1:
+                for name in group:
+                    collisions[name] = [other for other in group if other != name]
+        return collisions
+
+    def scan_critical_files(self, root_directory: str, progress: ScanProgress = None, include_archives: bool = False):
+        """
+        Scan for critical config files (see CriticalClassifier) throughout the entire resource structure.
+        This scans ALL directories, not just 'stream' folders.
+        """
+        critical_files = self.find_critical_files(root_directory, progress, include_archives)
+        file_dict = {}
+        
+        if progress:
+            progress.start_phase("Grouping")
+        for file in critical_files:
+            filename = os.path.basename(file).lower()
+            
+            if filename not in file_dict:
+                file_dict[filename] = [os.path.dirname(file)]
+            else:
+                file_dict[filename].append(os.path.dirname(file))
+        if progress:
+            progress.advance(len(critical_files))
+        
+        # All critical files are stored, not just duplicates
+        # This allows us to show which critical files exist and where
+        self.critical_conflicts = file_dict
+        self.critical_types = {filename: self.classifier.classify(filename) for filename in file_dict}
+        
+        return file_dict
+
+    def find_critical_files(self, root_dir: str, progress: ScanProgress = None, include_archives: bool = False):
+        """
+        Recursively find all critical config files (.ymt, .meta, .xml and configured rules) in ANY folder under root_dir.
+        This does NOT restrict to 'stream' folders since config files often exist at resource root.
+        """
+        if isinstance(self.walker, FileListing) and self.walker.is_manifest():
+            raise ValueError("An asset manifest only lists stream folders and cannot be used to find critical files")
+        # Scan ALL directories, not just stream folders
+        return self.walker.walk(
+            root_dir, self.classifier.is_critical, progress=progress, archives=include_archives,
+        )
+
+    def is_critical_file(self, filename: str) -> bool:
+        """
+        Check if a file is a critical config file according to the critical rule table
+        """
+        return self.classifier.is_critical(filename)
+    
+    def get_critical_file_type(self, filename: str) -> str:
+        """
+        Get the type/category of a critical file from the critical rule table
+        """
+        return self.classifier.category(filename)
+
+    def find_stream_files(self, root_dir: str, progress: ScanProgress = None, include_archives: bool = False):
+        """
+        Recursively find all files in any 'stream' folders under root_dir.
+        This is for regular duplicate checking, restricted to stream folders.
+        """
+        return self.walker.walk(root_dir, stream_only=True, progress=progress, archives=include_archives)
+
+    def check_file_list(self, root_dir: str, names, progress: ScanProgress = None) -> dict:
+        """
+        Manual list check: the full paths of every listed file name in the stream folders ([] when not found).
+        Names match case-insensitively, like the index service.
+        """
+        wanted = {name.lower() for name in names}
+        found = {}
+        for path in self.walker.walk(root_dir, lambda name: name.lower() in wanted, stream_only=True, progress=progress):
+            found.setdefault(os.path.basename(path).lower(), []).append(path)
+        return {name: found.get(name.lower(), []) for name in names}
+
+    def iter_stream_duplicates(self, stream_root_directory: str, memory_limit_mb: float,
+                               progress: ScanProgress = None, temp_dir: str = None, include_archives: bool = False):
+        """
+        Out-of-core variant of scan_stream_duplicates: yields (name, [locations]) in name order while holding
+        at most about memory_limit_mb of file records, spilling sorted runs to temp_dir beyond that.
+        """
+        grouper = ExternalGrouper(memory_limit_mb, temp_dir)
+        try:
+            self.walker.walk(stream_root_directory, stream_only=True, progress=progress,
+                             sink=grouper.add_paths, archives=include_archives)
+        except BaseException:
+            grouper.close()
+            raise
+        if progress:
+            progress.start_phase("Grouping")
+        for name, locations in grouper.groups():
+            if progress:
+                progress.advance(len(locations))
+            yield name, locations
+        if progress:
+            progress.advance(grouper.records - progress.processed_files)
+
+
+class ExternalGrouper:
+    """
+    Groups file names to their locations with bounded memory, for trees too large to hold in a dict.
+
+    Records (normalised name, location id) are buffered until the memory limit is reached, then sorted and
+    spilled to a temporary run file; groups() merges all runs in one sequential pass. Locations are interned,
+    so only the folder table (far smaller than the file list) stays in memory.
+    """
+    RECORD_OVERHEAD = 120
+    ENCODING = 'utf-8'
+    # Runs merged at once; more runs than this are first merged in batches to stay within file handle limits.
+    MAX_MERGE_RUNS = 64
+
+    def __init__(self, memory_limit_mb: float = 256.0, temp_dir: str = None):
+        self.memory_limit = max(1, int(memory_limit_mb * 1024 * 1024))
+        self.temp_dir = temp_dir
+        self.location_ids = {}
+        self.locations = []
+        self.records = 0
+        self._buffer = []
+        self._buffer_bytes = 0
+        self._runs = []
+        self._lock = threading.Lock()
+
+    def add_paths(self, paths):
+        """
+        Add file paths, keyed by lower-case file name. Safe to call from several threads.
+        """
+        with self._lock:
+            for path in paths:
+                location, name = os.path.split(path)
+                location_id = self.location_ids.get(location)
+                if location_id is None:
+                    location_id = self.location_ids[location] = len(self.locations)
+                    self.locations.append(location)
+                name = name.lower().replace('\n', ' ')
+                self._buffer.append((name, location_id))
+                self._buffer_bytes += len(name) + self.RECORD_OVERHEAD
+                if self._buffer_bytes >= self.memory_limit:
+                    self._spill()
+            self.records += len(paths)
+
+    def _write_run(self, records):
+        with tempfile.NamedTemporaryFile('w', encoding=self.ENCODING, newline='\n', suffix='.run', prefix='sfa-',
+                                         dir=self.temp_dir, delete=False) as f:
+            f.writelines(f"{name}\t{location_id}\n" for name, location_id in records)
+            self._runs.append(f.name)
+
+    def _spill(self):
+        self._buffer.sort()
+        self._write_run(self._buffer)
+        self._buffer = []
+        self._buffer_bytes = 0
+
+    def _read_run(self, file_path: str):
+        with open(file_path, 'r', encoding=self.ENCODING, newline='\n', buffering=ReportExporter.BUFFER_SIZE) as f:
+            for line in f:
+                name, location_id = line[:-1].rsplit('\t', 1)
+                yield name, int(location_id)
+
+    def _compact_runs(self):
+        while len(self._runs) > self.MAX_MERGE_RUNS:
+            batch, self._runs = self._runs[:self.MAX_MERGE_RUNS], self._runs[self.MAX_MERGE_RUNS:]
+            self._write_run(heapq.merge(*[self._read_run(run) for run in batch]))
+            for run in batch:
+                os.remove(run)
+
+    @property
+    def spilled_runs(self) -> int:
+        return len(self._runs)
+
+    def groups(self, min_count: int = 2):
+        """
+        Yield (name, [locations]) for every name found at least min_count times, in name order.
+        Run files are removed once the merge finishes.
+        """
+        self._buffer.sort()
+        try:
+            self._compact_runs()
+            merged = heapq.merge(*[self._read_run(run) for run in self._runs], iter(self._buffer))
+            for name, records in groupby(merged, key=lambda record: record[0]):
+                location_ids = [location_id for _, location_id in records]
+                if len(location_ids) >= min_count:
+                    yield name, [self.locations[location_id] for location_id in location_ids]
+        finally:
+            self.close()
+
+    def close(self):
+        for run in self._runs:
+            try:
+                os.remove(run)
+            except OSError:
+                pass
+        self._runs = []
+        self._buffer = []
+        self._buffer_bytes = 0
+
+
+# ----------------------------------------#
+# 3. Scan Result Model
+# ----------------------------------------#
+MB = 1024.0 * 1024.0
+
+OVERSIZE_NOTE = "Oversized assets can and WILL lead to streaming issues (such as models not loading/rendering)."
+
+
+class SizeStatus(Enum):
+    """
+    Oversize classification of a streamed asset, ordered by severity.
+    """
+    OK = (0, "OK", "ok")
+    WARNING = (1, "Warning", "warning")
+    CRITICAL = (2, "Critical", "critical")
+    CRITICAL_OVERSIZED = (3, "Critical Oversized", "oversize")
+
+    def __init__(self, severity: int, label: str, tag: str):
+        self.severity = severity
+        self.label = label
+        self.tag = tag
+
+    @classmethod
+    def from_label(cls, label: str):
+        for status in cls:
+            if status.label == label:
+                return status
+        raise ValueError(f"Unknown size status: {label}")
+
+
+@dataclass
+class YftResult:
+    """
+    A `_hi.yft` file considered a duplicate of its original, with numeric sizes in bytes.
+    Oversize scans use it for any streamed resource, including entries inside .rpf archives.
+    """
+    path: str
+    is_resource: bool
+    phys_size: int
+    virt_size: int
+    file_size: int
+    diff_bytes: int = 0
+    status: SizeStatus = SizeStatus.OK
+    file_hash: str = ""
+    similarity: float = None
+    semantic_match: bool = False
+    # High LOD triangle counts when the file was kept as a duplicate for adding no LOD detail, else -1.
+    hi_triangles: int = -1
+    original_triangles: int = -1
+    selected: bool = False
+
+    @property
+    def model_name(self) -> str:
+        return os.path.basename(self.path)
+
+    @property
+    def size_bytes(self) -> int:
+        """
+        The size used for oversize checks: the larger RSC page size, or the file size for unknown formats.
+        """
+        if self.is_resource:
+            return max(self.phys_size, self.virt_size)
+        return self.file_size
+
+    @property
+    def size_mb(self) -> float:
+        return self.size_bytes / MB
+
+    @property
+    def streaming_bytes(self) -> int:
+        """
+        Memory the client streams for this file: both RSC page sizes, or the file size for unknown formats.
+        """
+        if self.is_resource:
+            return self.phys_size + self.virt_size
+        return self.file_size
+
+    @property
+    def size_str(self) -> str:
+        if self.is_resource:
+            return f"PH:{self.phys_size / MB:.2f}/VR:{self.virt_size / MB:.2f} MB"
+        return f"{self.file_size / MB:.2f} MB"
+
+    @property
+    def status_str(self) -> str:
+        status = self.status.label
+        if self.status in (SizeStatus.WARNING, SizeStatus.CRITICAL):
+            status += f" - {OVERSIZE_NOTE}"
+        elif self.status == SizeStatus.OK:
+            status += " - good" if self.is_resource else " - Unknown format"
+        if self.semantic_match:
+            status += " [Same content after decompression]"
+        elif self.hi_triangles >= 0:
+            status += (f" [No extra LOD detail: {self.hi_triangles:,} vs {self.original_triangles:,} "
+                       f"High LOD triangles]")
+        elif self.similarity is not None and self.similarity < 1.0:
+            status += f" [Similarity: {self.similarity * 100:.1f}%, diff={self.diff_bytes} bytes]"
+        elif self.diff_bytes > 0:
+            status += f" [Margin used: diff={self.diff_bytes} bytes]"
+        return status
+
+    EXPORT_FIELDS = (
+        "model_name", "path", "resource", "size_bytes", "phys_size", "virt_size",
+        "file_size", "diff_bytes", "similarity", "semantic_match", "hi_triangles", "original_triangles",
+        "status", "full_path",
+    )
+    STORE_FIELDS = (
+        ("path", "str"), ("is_resource", "bool"), ("phys_size", "int"), ("virt_size", "int"), ("file_size", "int"),
+        ("diff_bytes", "int"), ("status", "status"), ("file_hash", "str"), ("similarity", "float"),
+        ("semantic_match", "bool"), ("hi_triangles", "int"), ("original_triangles", "int"),
+    )
+
+    def to_record(self, root_dir: str) -> dict:
+        return {
+            "model_name": self.model_name,
+            "path": relative_location(os.path.dirname(self.path), root_dir),
+            "resource": resource_name(self.path),
+            "size_bytes": self.size_bytes,
+            "phys_size": self.phys_size,
+            "virt_size": self.virt_size,
+            "file_size": self.file_size,
+            "diff_bytes": self.diff_bytes,
+            "similarity": None if self.similarity is None else round(self.similarity * 100, 2),
+            "semantic_match": self.semantic_match,
+            "hi_triangles": None if self.hi_triangles < 0 else self.hi_triangles,
+            "original_triangles": None if self.original_triangles < 0 else self.original_triangles,
+            "status": self.status.label,
+            "full_path": self.path,
+        }
+
+
+@dataclass
+class HiLodComparison:
+    """
+    The LOD tables of a _hi.yft and its original, and whether the _hi file adds any higher-detail geometry.
+    """
+    path: str
+    original: str
+    hi_lods: DrawableLods = None
+    original_lods: DrawableLods = None
+    redundant: bool = False
+    selected: bool = False
+
+    @property
+    def verdict(self) -> str:
+        if not self.hi_lods or not self.original_lods:
+            return "Unknown LOD layout"
+        if self.redundant:
+            return "Redundant"
+        if not self.hi_lods.high_triangles or not self.original_lods.high_triangles:
+            return "No High LOD to compare"
+        extra = self.hi_lods.high_triangles - self.original_lods.high_triangles
+        if extra > 0:
+            return f"Adds detail (+{extra:,} triangles)"
+        return f"Adds detail (+{self.hi_lods.high_vertices - self.original_lods.high_vertices:,} vertices)"
+
+    EXPORT_FIELDS = ("model_name", "resource", "verdict", "hi_lods", "original_lods", "path", "original")
+
+    def to_record(self, root_dir: str) -> dict:
+        return {
+            "model_name": os.path.basename(self.path),
+            "resource": resource_name(self.path),
+            "verdict": self.verdict,
+            "hi_lods": self.hi_lods.describe() if self.hi_lods else "",
+            "original_lods": self.original_lods.describe() if self.original_lods else "",
+            "path": relative_location(self.path, root_dir),
+            "original": relative_location(self.original, root_dir),
+        }
+
+
+@dataclass
+class StreamDuplicateResult:
+    """
+    A file name found in more than one 'stream' folder, with the directories it lives in,
+    or a name whose joaat hash collides with other names (hash_collides_with) or that replaces a base-game asset.
+    """
+    name: str
+    locations: list
+    is_critical: bool = False
+    file_type: str = ""
+    hash_collides_with: tuple = ()
+    overrides_base_game: bool = False
+    selected: bool = False
+
+    EXPORT_FIELDS = ("name", "count", "is_critical", "file_type", "hash_collides_with", "overrides_base_game",
+                     "resources", "locations")
+    STORE_FIELDS = (("name", "str"), ("locations", "strs"), ("is_critical", "bool"), ("file_type", "str"),
+                    ("hash_collides_with", "strs"), ("overrides_base_game", "bool"))
+
+    def to_record(self, root_dir: str) -> dict:
+        return {
+            "name": self.name,
+            "count": len(self.locations),
+            "is_critical": self.is_critical,
+            "file_type": self.file_type,
+            "hash_collides_with": list(self.hash_collides_with),
+            "overrides_base_game": self.overrides_base_game,
+            "resources": [resource_name(loc) for loc in self.locations],
+            "locations": [relative_location(loc, root_dir) for loc in self.locations],
+        }
+
+
+@dataclass
+class CriticalFileResult:
+    """
+    A critical config file name and every directory it was found in.
+    """
+    name: str
+    locations: list
+    file_type: str = ""
+    severity: str = "Critical"
+
+    @property
+    def is_conflict(self) -> bool:
+        return len(self.locations) > 1
+
+    @property
+    def status_str(self) -> str:
+        if self.is_conflict:
+            if self.severity == "Critical":
+                return "CONFLICT - Multiple instances found!"
+            return f"{self.severity.upper()} - Multiple instances found"
+        return "OK - Single instance"
+
+    EXPORT_FIELDS = ("file_type", "name", "count", "conflict", "severity", "status", "locations")
+
+    def to_record(self, root_dir: str) -> dict:
+        return {
+            "file_type": self.file_type,
+            "name": self.name,
+            "severity": self.severity,
+            "count": len(self.locations),
+            "conflict": self.is_conflict,
+            "status": self.status_str,
+            "locations": [relative_location(loc, root_dir) for loc in self.locations],
+        }
+
+
+@lru_cache(maxsize=16)
+def _root_prefix(root_dir: str) -> str:
+    return os.path.join(os.path.normpath(root_dir), '')
+
+
+def relative_location(path: str, root_dir: str) -> str:
+    """
+    path relative to root_dir, or path unchanged when it lives on another drive.
+    """
+    prefix = _root_prefix(root_dir)
+    if path.startswith(prefix):
+        return path[len(prefix):]
+    try:
+        return os.path.relpath(path, root_dir)
+    except ValueError:
+        return path
+
+
+def resource_name(path: str) -> str:
+    """
+    Name of the resource a path belongs to: the folder holding its 'stream' directory, if any.
+    """
+    normalized = path.replace('\\', '/')
+    lowered = normalized.lower()
+    if lowered.endswith('/stream'):
+        idx = len(lowered) - len('/stream')
+    else:
+        idx = lowered.rfind('/stream/')
+    if idx <= 0:
+        return ""
+    return normalized[:idx].rsplit('/', 1)[-1]
+
+
+class SearchIndex:
+    """
+    Substring search over result rows.
+
+    Each row's searchable text is split into tokens, and the distinct tokens are indexed
+    by every 1-3 character n-gram, so a query only touches the postings of tokens that
+    can match instead of every row.
+    """
+    TOKEN_SPLIT = re.compile(r'[^0-9a-z]+')
+    GRAM_SIZE = 3
+
+    def __init__(self, texts: dict):
+        self.texts = {}
+        self.postings = {}
+        self.grams = {}
+        # Keys removed or re-indexed since the build; their postings may be stale.
+        self.stale = set()
+        postings = self.postings
+        split = self.TOKEN_SPLIT.split
+        for key, text in texts.items():
+            text = text.lower()
+            self.texts[key] = text
+            for token in set(split(text)):
+                if token in postings:
+                    postings[token].add(key)
+                else:
+                    postings[token] = {key}
+        postings.pop("", None)
+        for token in postings:
+            self._add_grams(token)
+        self._reset_cache()
+
+    def _add_grams(self, token: str):
+        for size in range(1, self.GRAM_SIZE + 1):
+            for i in range(len(token) - size + 1):
+                self.grams.setdefault(token[i:i + size], set()).add(token)
+
+    def _reset_cache(self):
+        self._token_cache = {}
+        self._last_query = None
+        self._last_result = None
+
+    def add(self, key, text: str):
+        """
+        Index or re-index a single row.
+        """
+        if key in self.texts:
+            self.stale.add(key)
+        text = text.lower()
+        self.texts[key] = text
+        for token in self.tokenize(text):
+            if token not in self.postings:
+                self.postings[token] = set()
+                self._add_grams(token)
+            self.postings[token].add(key)
+        self._reset_cache()
+
+    def discard(self, key):
+        if self.texts.pop(key, None) is not None:
+            self.stale.add(key)
+            self._reset_cache()
+
+    @classmethod
+    def tokenize(cls, text: str):
+        return [t for t in cls.TOKEN_SPLIT.split(text) if t]
+
+    def _rows_for_token(self, fragment: str) -> set:
+        """
+        Rows containing a token that has fragment as a substring.
+        """
+        cached = self._token_cache.get(fragment)
+        if cached is not None:
+            return cached
+
+        size = self.GRAM_SIZE
+        if len(fragment) <= size:
+            matched = self.grams.get(fragment, ())
+        else:
+            candidates = None
+            for i in range(len(fragment) - size + 1):
+                tokens = self.grams.get(fragment[i:i + size])
+                if not tokens:
+                    candidates = set()
+                    break
+                candidates = set(tokens) if candidates is None else candidates & tokens
+            matched = [t for t in candidates if fragment in t]
+
+        rows = set()
+        for token in matched:
+            rows |= self.postings[token]
+        self._token_cache[fragment] = rows
+        return rows
+
+    def search(self, query: str):
+        """
+        Keys of the rows matching every whitespace-separated term of query, or None for an empty query.
+        """
+        query = query.strip().lower()
+        if not query:
+            return None
+
+        # Typing more characters can only narrow the previous result.
+        if self._last_query and query.startswith(self._last_query):
+            result = set(self._last_result)
+        else:
+            result = None
+
+        for term in query.split():
+            for fragment in self.tokenize(term):
+                rows = self._rows_for_token(fragment)
+                result = set(rows) if result is None else result & rows
+                if not result:
+                    break
+            if result is None:
+                result = set(self.texts)
+            # Terms spanning separators (e.g. "prop_hi.yft") are confirmed on the full text.
+            if self.tokenize(term) != [term]:
+                result = {key for key in result if term in self.texts.get(key, "")}
+
+        if self.stale:
+            terms = query.split()
+            result = {
+                key for key in result
+                if key not in self.stale or all(term in self.texts.get(key, "") for term in terms)
+            }
+
+        self._last_query = query
+        self._last_result = result
+        return result
+
+
+class ResultTable:
+    """
+    Binds a Treeview to the typed results it displays.
+    Sorting, tagging, searching and lookups run on the results; the view is reordered
+    or filtered in a single call, detaching hidden rows instead of deleting them.
+    """
+    def __init__(self, tree, values_fn, tag_fn=None, sort_keys=None, tag_colors=None, search_fn=None):
+        self.tree = tree
+        self.values_fn = values_fn
+        self.tag_fn = tag_fn
+        self.sort_keys = sort_keys or {}
+        self.search_fn = search_fn
+        self.columns = tuple(tree["columns"])
+        self.sort_column = None
+        self.sort_reverse = False
+        self._rows = {}
+        self._values = {}
+        self._order = []
+        self._index = None
+        self._query = ""
+        self._predicate = None
+        for tag, color in (tag_colors or {}).items():
+            self.tree.tag_configure(tag, background=color)
+
+    def load(self, rows):
+        """
+        Replace the view contents with rows and build their search index.
+        Meant to run on the scan thread, so the index is ready before the first keystroke.
+        """
+        self.clear()
+        for row in rows:
+            self.insert(row)
+        self._index = SearchIndex({item_id: self._search_text(item_id) for item_id in self._rows})
+        if self._query or self._predicate:
+            self.apply_filter()
+
+    def extend(self, rows):
+        """
+        Append rows after the initial load, keeping the current sort order and filter.
+        """
+        for row in rows:
+            self.insert(row)
+        if self.sort_column is not None:
+            self._order = self._sorted_order()
+        if self.sort_column is not None or self._query or self._predicate:
+            self._show(self._visible_ids())
+
+    def insert(self, row):
+        values = self.values_fn(row)
+        tags = (self.tag_fn(row),) if self.tag_fn else ()
+        item_id = self.tree.insert("", tk.END, values=values, tags=tags)
+        self._rows[item_id] = row
+        self._values[item_id] = values
+        self._order.append(item_id)
+        if self._index is not None:
+            self._index.add(item_id, self._search_text(item_id))
+        return item_id
+
+    def _search_text(self, item_id) -> str:
+        row, values = self._rows[item_id], self._values[item_id]
+        if self.search_fn:
+            return self.search_fn(row, values)
+        return " ".join(str(v) for v in values)
+
+    def clear(self):
+        if self._rows:
+            self.tree.delete(*self._rows)
+        self._rows.clear()
+        self._values.clear()
+        self._order = []
+        self._index = None
+
+    def row(self, item_id):
+        return self._rows.get(item_id)
+
+    def items(self):
+        """
+        (item_id, row) pairs currently shown, in view order.
+        """
+        return [(item_id, self._rows[item_id]) for item_id in self.tree.get_children()]
+
+    def rows(self):
+        return [row for _, row in self.items()]
+
+    def all_rows(self):
+        """
+        Every row in sort order, including rows hidden by the current filter.
+        """
+        return [self._rows[item_id] for item_id in self._live_order()]
+
+    def refresh(self, item_id):
+        """
+        Redraw one row after its result changed.
+        """
+        row = self._rows[item_id]
+        values = self.values_fn(row)
+        self._values[item_id] = values
+        self.tree.item(item_id, values=values, tags=(self.tag_fn(row),) if self.tag_fn else ())
+        if self._index is not None:
+            text = self._search_text(item_id)
+            if text.lower() != self._index.texts.get(item_id):
+                self._index.add(item_id, text)
+
+    def remove(self, item_id):
+        self.tree.delete(item_id)
+        self._rows.pop(item_id, None)
+        self._values.pop(item_id, None)
+        if self._index is not None:
+            self._index.discard(item_id)
+
+    def toggle_selected(self, item_id):
+        row = self._rows[item_id]
+        row.selected = not row.selected
+        self.refresh(item_id)
+
+    def select_all(self):
+        for item_id, row in self.items():
+            if not row.selected:
+                row.selected = True
+                self.refresh(item_id)
+
+    def selected_items(self):
+        return [(item_id, row) for item_id, row in self.items() if row.selected]
+
+    def sort(self, column):
+        """
+        Sort by column, toggling direction when the same column is sorted twice.
+        Columns without a numeric key sort on their case-folded display text.
+        """
+        if self.sort_column == column:
+            self.sort_reverse = not self.sort_reverse
+        else:
+            self.sort_reverse = False
+            self.sort_column = column
+
+        self._order = self._sorted_order()
+        self._show(self._visible_ids())
+
+    def _sorted_order(self):
+        key_fn = self.sort_keys.get(self.sort_column)
+        if key_fn is not None:
+            key = lambda item_id: key_fn(self._rows[item_id])
+        else:
+            index = self.columns.index(self.sort_column)
+            key = lambda item_id: str(self._values[item_id][index]).lower()
+        return sorted(self._live_order(), key=key, reverse=self.sort_reverse)
+
+    def search(self, query: str):
+        self._query = query
+        self.apply_filter()
+
+    def set_predicate(self, predicate):
+        """
+        Restrict the view to rows for which predicate(row) is true, or show all rows for None.
+        """
+        self._predicate = predicate
+        self.apply_filter()
+
+    def apply_filter(self):
+        self._show(self._visible_ids())
+
+    def _visible_ids(self):
+        matches = None
+        if self._query.strip():
+            if self._index is None:
+                self._index = SearchIndex({item_id: self._search_text(item_id) for item_id in self._rows})
+            matches = self._index.search(self._query)
+
+        visible = self._live_order()
+        if matches is not None:
+            visible = [item_id for item_id in visible if item_id in matches]
+        if self._predicate is not None:
+            visible = [item_id for item_id in visible if self._predicate(self._rows[item_id])]
+        return visible
+
+    def _live_order(self):
+        # Removed rows are dropped from the order lazily, so bulk deletes stay linear.
+        if len(self._order) != len(self._rows):
+            self._order = [item_id for item_id in self._order if item_id in self._rows]
+        return self._order
+
+    def _show(self, item_ids):
+        self.tree.set_children("", *item_ids)
+
+    @property
+    def total(self) -> int:
+        return len(self._rows)
+
+
+# ----------------------------------------#
+# 4. Report Exporters
+# ----------------------------------------#
+EXPORT_FILETYPES = [
+    ("Text files", "*.txt"),
+    ("CSV files", "*.csv"),
+    ("NDJSON files", "*.ndjson"),
+    ("HTML report", "*.html"),
+    ("All files", "*.*"),
+]
+
+HTML_REPORT_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: Calibri, Arial, sans-serif; margin: 20px; }}
+table {{ border-collapse: collapse; width: 100%; font-size: 13px; }}
+th, td {{ border: 1px solid #ccc; padding: 4px 8px; text-align: left; vertical-align: top; }}
+th {{ background: #eee; position: sticky; top: 0; }}
+tr.ok td {{ background: #e3f6e3; }}
+tr.warning td {{ background: #fff7b3; }}
+tr.critical td, tr.conflict td, tr.duplicate td {{ background: #f6c9c9; }}
+tr.oversize td {{ background: #ffd59e; }}
+tr.critical_duplicate td {{ background: #ffffe0; }}
+#filter {{ margin-bottom: 10px; width: 400px; padding: 4px; }}
+</style>
+</head>
+<body>
+<h2>{title}</h2>
+<p>Generated {generated}</p>
+<input id="filter" placeholder="Filter rows...">
+<table id="report">
+<thead><tr>{header}</tr></thead>
+<tbody>
+"""
+
+HTML_REPORT_TAIL = """</tbody>
+</table>
+<p>{count} rows.</p>
+<script>
+document.getElementById("filter").addEventListener("input", function () {
+  var q = this.value.toLowerCase();
+  var rows = document.querySelectorAll("#report tbody tr");
+  for (var i = 0; i < rows.length; i++) {
+    rows[i].style.display = rows[i].textContent.toLowerCase().indexOf(q) === -1 ? "none" : "";
+  }
+});
+</script>
+</body>
+</html>
+"""
+
+
+class ReportExporter:
+    """
+    Streams result records (dicts keyed by `fields`) to CSV, NDJSON or a self-contained HTML report.
+    Records are pulled from an iterable and written in buffered chunks, so the full document is never
+    built in memory.
+    """
+    FORMATS = {
+        '.csv': 'csv',
+        '.ndjson': 'ndjson',
+        '.jsonl': 'ndjson',
+        '.json': 'ndjson',
+        '.html': 'html',
+        '.htm': 'html',
+    }
+    BUFFER_SIZE = 1024 * 1024
+    CHUNK_ROWS = 2000
+
+    def __init__(self, fields, title: str, row_class=None):
+        self.fields = list(fields)
+        self.title = title
+        self.row_class = row_class
+
+    @classmethod
+    def format_for(cls, file_path: str) -> str:
+        """
+        Pick an export format from the file extension; anything unknown is plain text.
+        """
+        return cls.FORMATS.get(os.path.splitext(file_path)[1].lower(), 'text')
+
+    def export(self, records, file_path: str, fmt: str = None) -> int:
+        """
+        Write records to file_path and return how many were written.
+        """
+        fmt = fmt or self.format_for(file_path)
+        writer = {
+            'csv': self.write_csv,
+            'ndjson': self.write_ndjson,
+            'html': self.write_html,
+        }.get(fmt)
+        if writer is None:
+            raise ValueError(f"Unsupported export format: {fmt}")
+        newline = '' if fmt == 'csv' else None
+        with open(file_path, 'w', encoding='utf-8', newline=newline, buffering=self.BUFFER_SIZE) as f:
+            return writer(records, f)
+
+    @staticmethod
+    def _flat(value):
+        if value.__class__ in (list, tuple):
+            return '; '.join(str(v) for v in value)
+        if value is None:
+            return ''
+        return value
+
+    def _chunks(self, records):
+        chunk = []
+        for record in records:
+            chunk.append(record)
+            if len(chunk) >= self.CHUNK_ROWS:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def write_csv(self, records, f) -> int:
+        writer = csv.writer(f)
+        writer.writerow(self.fields)
+        count = 0
+        for chunk in self._chunks(records):
+            writer.writerows([self._flat(record.get(k)) for k in self.fields] for record in chunk)
+            count += len(chunk)
+        return count
+
+    def write_ndjson(self, records, f) -> int:
+        encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+        count = 0
+        for chunk in self._chunks(records):
+            f.write(''.join(encode({k: record.get(k) for k in self.fields}) + '\n' for record in chunk))
+            count += len(chunk)
+        return count
+
+    def write_html(self, records, f) -> int:
+        escape = html.escape
+        f.write(HTML_REPORT_HEAD.format(
+            title=escape(self.title),
+            generated=escape(time.strftime('%Y-%m-%d %H:%M:%S')),
+            header=''.join(f'<th>{escape(k)}</th>' for k in self.fields),
+        ))
+        count = 0
+        for chunk in self._chunks(records):
+            lines = []
+            for record in chunk:
+                css = f' class="{escape(self.row_class(record))}"' if self.row_class else ''
+                cells = ''.join(
+                    f'<td>{escape(str(self._flat(record.get(k)))).replace("; ", "<br>")}</td>' for k in self.fields
+                )
+                lines.append(f'<tr{css}>{cells}</tr>\n')
+            f.write(''.join(lines))
+            count += len(chunk)
+        f.write(HTML_REPORT_TAIL.replace('{count}', str(count)))
+        return count
+
+
+# ----------------------------------------#
+# 5. Scan Snapshots
+# ----------------------------------------#
+SNAPSHOT_DIR = os.path.join(APP_DIR, "snapshots")
+
+
+@dataclass
+class SnapshotFile:
+    """
+    One file as recorded in a snapshot. Unknown hash/status are stored as empty strings, size as -1.
+    """
+    key: str
+    size: int = -1
+    file_hash: str = ""
+    status: str = ""
+
+
+# Row colour of each change type: regressions red, improvements green, anything else yellow.
+SNAPSHOT_CHANGE_TAGS = {
+    "Added file": "changed",
+    "Removed file": "changed",
+    "New duplicate": "regressed",
+    "Resolved duplicate": "improved",
+    "Duplicate locations changed": "changed",
+    "Changed hash": "changed",
+    "Changed size": "changed",
+    "Changed status": "regressed",
+    "Missing asset": "regressed",
+    "Extra asset": "changed",
+    "Different asset": "regressed",
+}
+
+
+@dataclass
+class SnapshotChange:
+    """
+    One difference between two snapshots.
+    """
+    change: str
+    name: str
+    old: str = ""
+    new: str = ""
+
+    EXPORT_FIELDS = ("change", "name", "old", "new")
+
+    def to_record(self, root_dir: str = "") -> dict:
+        return {"change": self.change, "name": self.name, "old": self.old, "new": self.new}
+
+
+def snapshot_key(path: str, root_dir: str) -> str:
+    """
+    Normalised, case-folded path relative to root_dir, used as the sort key of snapshot records.
+    """
+    return relative_location(path, root_dir).replace('\\', '/').lower()
+
+
+class ScanSnapshot:
+    """
+    A scan saved to disk so two scans can be compared with a single linear merge.
+
+    Layout: a JSON header line, a '#files' section of tab-separated file records sorted by path key,
+    then a '#groups' section of name records (name, count, locations) sorted by name.
+    """
+    VERSION = 1
+    FILES_MARKER = "#files\n"
+    GROUPS_MARKER = "#groups\n"
+
+    @staticmethod
+    def _clean(value) -> str:
+        return str(value).replace('\t', ' ').replace('\n', ' ')
+
+    @classmethod
+    def write(cls, file_path: str, kind: str, root_dir: str, files, groups: dict) -> str:
+        """
+        Write a snapshot. files is an iterable of SnapshotFile, groups maps a name to its list of locations.
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+        header = {
+            "version": cls.VERSION,
+            "kind": kind,
+            "root": root_dir,
+            "created": time.strftime('%Y-%m-%d %H:%M:%S'),
+        }
+        clean = cls._clean
+        with open(file_path, 'w', encoding='utf-8', newline='\n', buffering=ReportExporter.BUFFER_SIZE) as f:
+            f.write(json.dumps(header) + "\n")
+            f.write(cls.FILES_MARKER)
+            for record in sorted(files, key=lambda r: r.key):
+                f.write(f"{clean(record.key)}\t{record.size}\t{clean(record.file_hash)}\t{clean(record.status)}\n")
+            f.write(cls.GROUPS_MARKER)
+            for name in sorted(groups):
+                locations = '|'.join(snapshot_key(loc, root_dir) for loc in groups[name])
+                f.write(f"{clean(name)}\t{len(groups[name])}\t{clean(locations)}\n")
+        return file_path
+
+    @classmethod
+    def default_path(cls, kind: str) -> str:
+        return os.path.join(SNAPSHOT_DIR, f"{kind}-{time.strftime('%Y%m%d-%H%M%S')}.snap")
+
+    @classmethod
+    def latest(cls, kind: str):
+        """
+        Path of the most recent snapshot of the given kind in SNAPSHOT_DIR, or None.
+        """
+        if not os.path.isdir(SNAPSHOT_DIR):
+            return None
+        names = sorted(n for n in os.listdir(SNAPSHOT_DIR) if n.startswith(f"{kind}-") and n.endswith(".snap"))
+        return os.path.join(SNAPSHOT_DIR, names[-1]) if names else None
+
+    @classmethod
+    def read_header(cls, file_path: str) -> dict:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return json.loads(f.readline())
+
+    @classmethod
+    def _sections(cls, f):
+        """
+        Split an open snapshot into (files, groups) record iterators that must be consumed in order.
+        """
+        header = json.loads(f.readline())
+        if header.get("version") != cls.VERSION:
+            raise ValueError(f"Unsupported snapshot version: {header.get('version')}")
+        if f.readline() != cls.FILES_MARKER:
+            raise ValueError("Malformed snapshot: missing files section.")
+
+        def files():
+            for line in f:
+                if line == cls.GROUPS_MARKER:
+                    return
+                key, size, file_hash, status = line.rstrip('\n').split('\t')
+                yield SnapshotFile(key, int(size), file_hash, status)
+
+        def groups():
+            for line in f:
+                name, count, locations = line.rstrip('\n').split('\t')
+                yield name, int(count), locations
+
+        return header, files(), groups()
+
+    @staticmethod
+    def _merge(old_iter, new_iter, key):
+        """
+        Merge two sorted iterators, yielding (old, new) pairs where either side may be None.
+        """
+        missing = object()
+        old = next(old_iter, missing)
+        new = next(new_iter, missing)
+        while old is not missing or new is not missing:
+            if new is missing or (old is not missing and key(old) < key(new)):
+                yield old, None
+                old = next(old_iter, missing)
+            elif old is missing or key(new) < key(old):
+                yield None, new
+                new = next(new_iter, missing)
+            else:
+                yield old, new
+                old = next(old_iter, missing)
+                new = next(new_iter, missing)
+
+    @classmethod
+    def diff(cls, old_path: str, new_path: str):
+        """
+        Compare two snapshots in one pass over each file.
+        Returns (old_header, new_header, changes) where changes is a list of SnapshotChange.
+        """
+        changes = []
+        with open(old_path, 'r', encoding='utf-8') as old_f, open(new_path, 'r', encoding='utf-8') as new_f:
+            old_header, old_files, old_groups = cls._sections(old_f)
+            new_header, new_files, new_groups = cls._sections(new_f)
+
+            for old, new in cls._merge(old_files, new_files, key=lambda r: r.key):
+                if new is None:
+                    changes.append(SnapshotChange("Removed file", old.key, cls._describe(old), ""))
+                elif old is None:
+                    changes.append(SnapshotChange("Added file", new.key, "", cls._describe(new)))
+                else:
+                    if old.file_hash and new.file_hash and old.file_hash != new.file_hash:
+                        changes.append(SnapshotChange("Changed hash", new.key, old.file_hash, new.file_hash))
+                    elif old.size >= 0 and new.size >= 0 and old.size != new.size:
+                        changes.append(SnapshotChange("Changed size", new.key, str(old.size), str(new.size)))
+                    if old.status != new.status:
+                        changes.append(SnapshotChange("Changed status", new.key, old.status, new.status))
+
+            for old, new in cls._merge(old_groups, new_groups, key=lambda g: g[0]):
+                was_duplicate = old is not None and old[1] > 1
+                is_duplicate = new is not None and new[1] > 1
+                if is_duplicate and not was_duplicate:
+                    changes.append(SnapshotChange(
+                        "New duplicate", new[0], old[2] if old else "", new[2]))
+                elif was_duplicate and not is_duplicate:
+                    changes.append(SnapshotChange(
+                        "Resolved duplicate", old[0], old[2], new[2] if new else ""))
+                elif was_duplicate and old[2] != new[2]:
+                    changes.append(SnapshotChange("Duplicate locations changed", new[0], old[2], new[2]))
+
+        return old_header, new_header, changes
+
+    @staticmethod
+    def _describe(record: SnapshotFile) -> str:
+        parts = []
+        if record.size >= 0:
+            parts.append(f"{record.size} bytes")
+        if record.status:
+            parts.append(record.status)
+        return ", ".join(parts)
+
+    @staticmethod
+    def summarize(changes) -> dict:
+        summary = {}
+        for change in changes:
+            summary[change.change] = summary.get(change.change, 0) + 1
+        return summary
+
+
+@dataclass
+class ManifestEntry:
+    """
+    One stream asset in a manifest: path key, size, mtime (whole seconds), SHA256 and the RSC header fields
+    (resource version and page sizes, all 0 for files that are not resources). path is the relative path in its
+    original case; the key is case-folded so manifests from different machines merge.
+    """
+    key: str
+    size: int
+    mtime: int
+    digest: str
+    rsc_version: int = 0
+    phys_size: int = 0
+    virt_size: int = 0
+    path: str = ""
+
+    @property
+    def location(self) -> str:
+        return self.path or self.key
+
+    def describe(self) -> str:
+        text = f"{self.size} bytes, sha256 {self.digest[:12]}"
+        if self.rsc_version:
+            text += f", RSC v{self.rsc_version} PH:{self.phys_size / MB:.2f}/VR:{self.virt_size / MB:.2f} MB"
+        return text
+
+
+class AssetManifest:
+    """
+    A content-addressed list of every file in the stream folders of one server, small enough to copy
+    between machines. Two manifests are compared with the same linear merge as snapshots.
+
+    Layout: a JSON header line, then tab-separated ManifestEntry records sorted by path key.
+    Files ending in .gz are gzip-compressed. Version 1 records have no path column.
+    """
+    VERSION = 2
+    READ_VERSIONS = (1, 2)
+    KIND = "manifest"
+    CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, max_workers: int = None, cache: FileCache = None, io_budget: IoBudget = None):
+        self.max_workers = max_workers or os.cpu_count() or 4
+        self.cache = cache or FileCache("manifest")
+        self.io_budget = io_budget or IoBudget()
+
+    @staticmethod
+    def _open(file_path: str, mode: str):
+        if file_path.lower().endswith('.gz'):
+            return gzip.open(file_path, mode + 't', encoding='utf-8', newline='\n')
+        return open(file_path, mode, encoding='utf-8', newline='\n', buffering=ReportExporter.BUFFER_SIZE)
+
+    def _read_file(self, file_path: str):
+        """
+        [sha256, RSC version, physical size, virtual size] of one file, hashed and header-parsed in a single read.
+        """
+        cached = self.cache.get(file_path)
+        if cached is not None:
+            return cached
+        hash_func = hashlib.sha256()
+        head = b""
+        for chunk in self.io_budget.read_chunks(file_path, self.CHUNK_SIZE):
+            if not head:
+                head = chunk
+            hash_func.update(chunk)
+        is_resource, phys_pages, virt_pages = YftCleaner.parse_header(head[:16])
+        version = struct.unpack_from('<I', head, 4)[0] if is_resource and head[:4] in (b'RSC7', b'RSC8') else 0
+        value = [
+            hash_func.hexdigest(), version,
+            YftCleaner.convert_rsc7_size(phys_pages) if is_resource else 0,
+            YftCleaner.convert_rsc7_size(virt_pages) if is_resource else 0,
+        ]
+        self.cache.put(file_path, value)
+        return value
+
+    def entries(self, root_dir: str, progress: ScanProgress = None):
+        """
+        ManifestEntry records of every file in the 'stream' folders under root_dir, sorted by key.
+        """
+        files = DirectoryWalker().walk(root_dir, stream_only=True, progress=progress)
+        if progress:
+            progress.start_phase("Hashing", by_bytes=True)
+
+        def entry(path):
+            try:
+                st = os.stat(path)
+                digest, version, phys_size, virt_size = self._read_file(path)
+                return ManifestEntry(snapshot_key(path, root_dir), st.st_size, int(st.st_mtime), digest,
+                                     version, phys_size, virt_size,
+                                     relative_location(path, root_dir).replace('\\', '/'))
+            except OSError as e:
+                print(f"Error: {e}")
+                return None
+            finally:
+                if progress:
+                    progress.advance_file(path)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            records = [record for record in executor.map(entry, files) if record]
+        try:
+            self.cache.save()
+        except OSError as e:
+            print(f"Error: {e}")
+        records.sort(key=lambda r: r.key)
+        return records
+
+    def write(self, file_path: str, root_dir: str, progress: ScanProgress = None) -> int:
+        """
+        Scan root_dir and write its manifest. Returns the number of files listed.
+        """
+        records = self.entries(root_dir, progress)
+        header = {
+            "version": self.VERSION,
+            "kind": self.KIND,
+            "root": root_dir,
+            "created": time.strftime('%Y-%m-%d %H:%M:%S'),
+            "files": len(records),
+        }
+        clean = ScanSnapshot._clean
+        with self._open(file_path, 'w') as f:
+            f.write(json.dumps(header) + "\n")
+            for r in records:
+                f.write(f"{clean(r.key)}\t{r.size}\t{r.mtime}\t{r.digest}\t{r.rsc_version}\t{r.phys_size}\t{r.virt_size}\t{clean(r.path)}\n")
+        return len(records)
+
+    @classmethod
+    def is_manifest(cls, file_path: str) -> bool:
+        try:
+            with cls._open(file_path, 'r') as f:
+                return json.loads(f.readline()).get("kind") == cls.KIND
+        except (OSError, ValueError, EOFError):
+            return False
+
+    @classmethod
+    def _records(cls, f):
+        for line in f:
+            key, size, mtime, digest, version, phys_size, virt_size, *path = line.rstrip('\n').split('\t')
+            yield ManifestEntry(key, int(size), int(mtime), digest, int(version), int(phys_size), int(virt_size),
+                                path[0] if path else "")
+
+    @classmethod
+    def compare(cls, reference_path: str, other_path: str):
+        """
+        Merge-join two manifests in one pass over each. Returns (reference_header, other_header, changes):
+        assets missing from the other server, extra assets only it has, and assets whose content differs.
+        mtime is ignored, since copies made on different machines rarely keep it.
+        """
+        changes = []
+        with cls._open(reference_path, 'r') as ref_f, cls._open(other_path, 'r') as other_f:
+            headers = []
+            for f in (ref_f, other_f):
+                header = json.loads(f.readline())
+                if header.get("kind") != cls.KIND or header.get("version") not in cls.READ_VERSIONS:
+                    raise ValueError(f"Not a supported asset manifest: {f.name}")
+                headers.append(header)
+            for ref, other in ScanSnapshot._merge(cls._records(ref_f), cls._records(other_f), key=lambda r: r.key):
+                if other is None:
+                    changes.append(SnapshotChange("Missing asset", ref.location, ref.describe(), ""))
+                elif ref is None:
+                    changes.append(SnapshotChange("Extra asset", other.location, "", other.describe()))
+                elif ref.digest != other.digest:
+                    changes.append(SnapshotChange("Different asset", ref.location, ref.describe(), other.describe()))
+        return headers[0], headers[1], changes
+
+
+def compare_scan_files(old_path: str, new_path: str):
+    """
+    Diff two snapshots, or two asset manifests when the first file is one.
+    """
+    if AssetManifest.is_manifest(old_path):
+        return AssetManifest.compare(old_path, new_path)
+    return ScanSnapshot.diff(old_path, new_path)
+
+
+RESULTS_DIR = os.path.join(APP_DIR, "results")
+REFRESH_ON_OPEN_PATH = os.path.join(RESULTS_DIR, "refresh_on_open")
+STORE_KINDS = {"yft": YftResult, "stream": StreamDuplicateResult}
+
+
+class ResultStore:
+    """
+    The last results of a scan kind, saved in a compact binary file the GUI maps on startup.
+
+    Layout: a header, a JSON meta block (kind, root, creation time, field list), fixed-width records,
+    the string table offsets (in characters), a pool of string ids for list fields, then the UTF-8 string
+    blob. Every distinct string (a name, a folder) is stored once. Records are decoded from the map only
+    when a row is read, so opening a store costs nothing however many rows it holds; the string table is
+    decoded in one piece on first use.
+
+    Rows are the result dataclasses named in STORE_KINDS, described by their STORE_FIELDS: their leading
+    fields as (attribute, type) pairs, with type one of str, strs (list of str), int, bool, float (None kept
+    as NaN) or status (SizeStatus).
+    """
+    MAGIC = b'SFAR'
+    VERSION = 1
+    HEADER = struct.Struct('<4sIIIIII')   # magic, version, meta length, record size, records, strings, pool
+    FORMATS = {"str": 'I', "strs": 'II', "int": 'q', "bool": '?', "float": 'd', "status": 'B'}
+    STATUSES = {status.severity: status for status in SizeStatus}
+    BATCH_ROWS = 10000
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        with open(file_path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, meta_size, record_size, self.count, string_count, pool_count = \
+                self.HEADER.unpack_from(self._map, 0)
+            if magic != self.MAGIC or version != self.VERSION:
+                raise ValueError(f"Not a result store: {file_path}")
+            meta = json.loads(self._map[self.HEADER.size:self.HEADER.size + meta_size].decode('utf-8'))
+            self.kind, self.root_dir, self.created = meta["kind"], meta["root"], meta["created"]
+            self.row_class = STORE_KINDS[self.kind]
+            self.fields = [tuple(field) for field in meta["fields"]]
+            if self.fields != list(self.row_class.STORE_FIELDS):
+                raise ValueError(f"Result store written for other fields: {file_path}")
+            # Rows are built positionally, so the stored fields must lead the dataclass fields in order.
+            if list(self.row_class.__dataclass_fields__)[:len(self.fields)] != [name for name, _ in self.fields]:
+                raise ValueError(f"Result store fields out of order for {self.row_class.__name__}")
+            self.record = self.record_struct(self.fields)
+            if self.record.size != record_size:
+                raise ValueError(f"Malformed result store: {file_path}")
+        except (struct.error, KeyError, ValueError):
+            self._map.close()
+            raise
+        self._records = self._align(self.HEADER.size + meta_size)
+        self._offsets = self._records + record_size * self.count
+        self._pool = self._offsets + 4 * (string_count + 1)
+        self._blob = self._pool + 4 * pool_count
+        self._string_count, self._pool_count = string_count, pool_count
+        self._table = None
+
+    @staticmethod
+    def _align(offset: int) -> int:
+        return (offset + 7) & ~7
+
+    @classmethod
+    def record_struct(cls, fields) -> struct.Struct:
+        return struct.Struct('<' + ''.join(cls.FORMATS[kind] for _, kind in fields))
+
+    @staticmethod
+    def default_path(kind: str) -> str:
+        return os.path.join(RESULTS_DIR, f"{kind}.sfr")
+
+    @classmethod
+    def open_latest(cls, kind: str):
+        """
+        The saved results of a scan kind, or None when there are none (or they cannot be read).
+        """
+        path = cls.default_path(kind)
+        if not os.path.isfile(path):
+            return None
+        try:
+            return cls(path)
+        except (OSError, ValueError, struct.error) as e:
+            print(f"Error: {e}")
+            return None
+
+    @classmethod
+    def write(cls, file_path: str, kind: str, root_dir: str, rows) -> int:
+        """
+        Save rows of the STORE_KINDS class of kind, replacing the file in one step. Returns the row count.
+        """
+        fields = STORE_KINDS[kind].STORE_FIELDS
+        record = cls.record_struct(fields)
+        string_ids, strings, offsets, pool = {}, [], array('I', [0]), array('I')
+
+        def string_id(value) -> int:
+            value = value or ""
+            index = string_ids.get(value)
+            if index is None:
+                index = string_ids[value] = len(strings)
+                strings.append(value)
+                offsets.append(offsets[-1] + len(value))
+            return index
+
+        records, count = bytearray(), 0
+        for row in rows:
+            values = []
+            for name, kind_of in fields:
+                value = getattr(row, name)
+                if kind_of == "str":
+                    values.append(string_id(value))
+                elif kind_of == "strs":
+                    values.extend((len(pool), len(value)))
+                    pool.extend(string_id(item) for item in value)
+                elif kind_of == "float":
+                    values.append(float('nan') if value is None else value)
+                elif kind_of == "status":
+                    values.append(value.severity)
+                else:
+                    values.append(value)
+            records += record.pack(*values)
+            count += 1
+        if sys.byteorder != 'little':
+            offsets.byteswap()
+            pool.byteswap()
+
+        meta = json.dumps({
+            "kind": kind,
+            "root": root_dir,
+            "created": time.strftime('%Y-%m-%d %H:%M:%S'),
+            "fields": [list(field) for field in fields],
+        }).encode('utf-8')
+        os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+        tmp_path = file_path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(cls.HEADER.pack(cls.MAGIC, cls.VERSION, len(meta), record.size, count, len(string_ids), len(pool)))
+            f.write(meta)
+            f.write(b'\0' * (cls._align(cls.HEADER.size + len(meta)) - cls.HEADER.size - len(meta)))
+            f.write(records)
+            f.write(offsets.tobytes())
+            f.write(pool.tobytes())
+            f.write(''.join(strings).encode('utf-8'))
+        os.replace(tmp_path, file_path)
+        return count
+
+    def _strings(self):
+        """
+        (strings, pool): the string table, decoded in one piece and shared by all rows, and the list pool.
+        """
+        if self._table is None:
+            text = self._map[self._blob:].decode('utf-8')
+            offsets = struct.unpack_from(f'<{self._string_count + 1}I', self._map, self._offsets)
+            self._table = (
+                [text[start:end] for start, end in zip(offsets, offsets[1:])],
+                struct.unpack_from(f'<{self._pool_count}I', self._map, self._pool),
+            )
+        return self._table
+
+    def rows(self, start: int = 0, stop: int = None) -> list:
+        """
+        Rows start..stop, decoded column by column from the mapped records.
+        """
+        stop = self.count if stop is None else min(stop, self.count)
+        if start >= stop:
+            return []
+        strings, pool = self._strings()
+        size = self.record.size
+        with memoryview(self._map)[self._records + start * size:self._records + stop * size] as records:
+            columns = iter(zip(*self.record.iter_unpack(records)))
+        decoded = []
+        for _, kind in self.fields:
+            column = next(columns)
+            if kind == "str":
+                column = list(map(strings.__getitem__, column))
+            elif kind == "strs":
+                column = [list(map(strings.__getitem__, pool[v:v + n])) if n else []
+                          for v, n in zip(column, next(columns))]
+            elif kind == "float":
+                column = [None if math.isnan(v) else v for v in column]
+            elif kind == "status":
+                column = [self.STATUSES[v] for v in column]
+            decoded.append(column)
+        return list(map(self.row_class, *decoded))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int):
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        return self.rows(index, index + 1)[0]
+
+    def __iter__(self):
+        for start in range(0, self.count, self.BATCH_ROWS):
+            yield from self.rows(start, start + self.BATCH_ROWS)
+
+    def close(self):
+        self._map.close()
+
+
+# ----------------------------------------#
+# 6. Texture Deduplication Analysis
+# ----------------------------------------#
+TEXTURE_FORMATS = {
+    21: "A8R8G8B8",
+    22: "X8R8G8B8",
+    25: "A1R5G5B5",
+    28: "A8",
+    32: "A8B8G8R8",
+    50: "L8",
+}
+
+
+def texture_format_name(fmt: int) -> str:
+    if fmt > 0xFFFF:
+        return struct.pack('<I', fmt).decode('ascii', 'replace').strip('\0 ')
+    return TEXTURE_FORMATS.get(fmt, f"FMT {fmt}")
+
+
+@dataclass
+class TextureEntry:
+    """
+    One texture embedded in a resource file, identified by a digest of its pixel data.
+    """
+    name: str
+    width: int
+    height: int
+    fmt: int
+    levels: int
+    data_size: int
+    digest: str
+
+    def to_cache(self) -> list:
+        return [self.name, self.width, self.height, self.fmt, self.levels, self.data_size, self.digest]
+
+
+@dataclass
+class SharedTexture:
+    """
+    Pixel data found in more than one place, with the (file path, texture name) pairs that contain it.
+    """
+    digest: str
+    width: int
+    height: int
+    fmt: int
+    data_size: int
+    occurrences: list
+    selected: bool = False
+
+    @property
+    def copies(self) -> int:
+        return len(self.occurrences)
+
+    @property
+    def wasted_bytes(self) -> int:
+        """
+        Texture memory taken by every copy beyond the first.
+        """
+        return self.data_size * (self.copies - 1)
+
+    @property
+    def names(self) -> list:
+        return sorted({name for _, name in self.occurrences})
+
+    EXPORT_FIELDS = ("names", "width", "height", "format", "data_size", "copies", "wasted_bytes", "resources", "files")
+
+    def to_record(self, root_dir: str) -> dict:
+        return {
+            "names": self.names,
+            "width": self.width,
+            "height": self.height,
+            "format": texture_format_name(self.fmt),
+            "data_size": self.data_size,
+            "copies": self.copies,
+            "wasted_bytes": self.wasted_bytes,
+            "resources": sorted({resource_name(path) for path, _ in self.occurrences}),
+            "files": [relative_location(path, root_dir) for path, _ in self.occurrences],
+        }
+
+
+class TextureParser:
+    """
+    Minimal reader for texture dictionaries in decompressed RSC7 pages (layout as documented by CodeWalker).
+
+    .ytd files are a texture dictionary at the root; .ydr drawables and .yft fragments may embed one
+    through their shader group. Every read is bounds-checked against the virtual segment: a texture whose
+    structure runs past it is skipped on its own, and unknown layouts yield no textures.
+    """
+    VIRTUAL_BASE = 0x50000000
+    PHYSICAL_BASE = 0x60000000
+    MAX_TEXTURES = 4096
+    # Bytes read from a texture dictionary header and from a texture structure
+    DICTIONARY_SIZE = 0x3A
+    TEXTURE_SIZE = 0x78
+
+    def __init__(self, virtual: bytes, physical: bytes):
+        self.virtual = virtual
+        self.physical = physical
+
+    def _fits(self, offset: int, size: int) -> bool:
+        return 0 <= offset and offset + size <= len(self.virtual)
+
+    def _u16(self, offset: int) -> int:
+        return struct.unpack_from('<H', self.virtual, offset)[0] if self._fits(offset, 2) else 0
+
+    def _u32(self, offset: int) -> int:
+        return struct.unpack_from('<I', self.virtual, offset)[0] if self._fits(offset, 4) else 0
+
+    def _virtual_offset(self, pointer: int):
+        if pointer and (pointer >> 28) == 0x5:
+            offset = pointer & 0x0FFFFFFF
+            if offset < len(self.virtual):
+                return offset
+        return None
+
+    def _physical_offset(self, pointer: int):
+        if pointer and (pointer >> 28) == 0x6:
+            offset = pointer & 0x0FFFFFFF
+            if offset < len(self.physical):
+                return offset
+        return None
+
+    def _pointer(self, offset: int):
+        return struct.unpack_from('<Q', self.virtual, offset)[0] if self._fits(offset, 8) else 0
+
+    def _string(self, pointer: int) -> str:
+        offset = self._virtual_offset(pointer)
+        if offset is None:
+            return ""
+        end = self.virtual.find(b'\0', offset, offset + 256)
+        if end < 0:
+            return ""
+        return self.virtual[offset:end].decode('ascii', 'replace')
+
+    def dictionary_offset(self, extension: str):
+        """
+        Virtual offset of the texture dictionary for a file of the given extension, or None.
+        """
+        if extension == '.ytd':
+            return 0
+        if extension == '.yft':
+            # FragType -> Drawable at 0x30
+            drawable = self._virtual_offset(self._pointer(0x30))
+        elif extension == '.ydr':
+            drawable = 0
+        else:
+            return None
+        if drawable is None:
+            return None
+        # Drawable -> ShaderGroup at 0x10 -> TextureDictionary at 0x08
+        shader_group = self._virtual_offset(self._pointer(drawable + 0x10))
+        if shader_group is None:
+            return None
+        return self._virtual_offset(self._pointer(shader_group + 0x08))
+
+    def textures(self, dictionary: int):
+        """
+        Yield a TextureEntry per texture in the dictionary at the given virtual offset.
+        """
+        if not self._fits(dictionary, self.DICTIONARY_SIZE):
+            return
+        list_offset = self._virtual_offset(self._pointer(dictionary + 0x30))
+        count = self._u16(dictionary + 0x38)
+        if list_offset is None or count > self.MAX_TEXTURES or not self._fits(list_offset, count * 8):
+            return
+        for i in range(count):
+            texture = self._virtual_offset(self._pointer(list_offset + i * 8))
+            if texture is None:
+                continue
+            entry = self._texture(texture)
+            if entry:
+                yield entry
+
+    @staticmethod
+    def mip_chain_size(fmt: int, width: int, height: int, depth: int, stride: int, levels: int) -> int:
+        """
+        Bytes of pixel data in a texture's mip chain, for every depth slice or cube face.
+
+        FourCC formats (DXT1/3/5, ATI1/2, BC6H/BC7) are block-compressed, so stride is the pitch of one row
+        of 4x4 blocks; for the plain D3D formats it is the pitch of one row of pixels.
+        """
+        block = 4 if fmt > 0xFFFF else 1
+        columns = -(-width // block)
+        unit = max(stride // columns, 1)
+        size = 0
+        for _ in range(max(levels, 1)):
+            size += -(-width // block) * unit * -(-height // block)
+            width, height = max(width // 2, 1), max(height // 2, 1)
+        return size * max(depth, 1)
+
+    def _texture(self, offset: int):
+        if not self._fits(offset, self.TEXTURE_SIZE):
+            return None
+        name = self._string(self._pointer(offset + 0x28))
+        width, height, depth, stride = struct.unpack_from('<HHHH', self.virtual, offset + 0x50)
+        fmt = self._u32(offset + 0x58)
+        levels = self.virtual[offset + 0x5D]
+        data = self._physical_offset(self._pointer(offset + 0x70))
+        if data is None or not width or not height or not stride:
+            return None
+
+        data_size = min(self.mip_chain_size(fmt, width, height, depth, stride, levels), len(self.physical) - data)
+        if data_size <= 0:
+            return None
+
+        digest = hashlib.sha256(self.physical[data:data + data_size]).hexdigest()
+        return TextureEntry(name, width, height, fmt, levels, data_size, digest)
+
+
+class TextureDeduplicator:
+    """
+    Builds a cross-resource index of identical textures in .ytd/.ydr/.yft files under 'stream' folders.
+    Files are decoded in parallel, and each file's texture list is cached, so reruns only parse changed files.
+    """
+    EXTENSIONS = ('.ytd', '.ydr', '.yft')
+
+    def __init__(self, max_workers: int = None, cache: FileCache = None):
+        self.max_workers = max_workers or os.cpu_count() or 4
+        self.cache = cache or FileCache("texture_entries")
+        self.decoder = ResourceDecoder()
+        self.shared_textures = []
+
+    def find_texture_files(self, root_dir: str, progress: ScanProgress = None):
+        return DirectoryWalker().walk(
+            root_dir, lambda name: os.path.normcase(name).endswith(self.EXTENSIONS), stream_only=True, progress=progress
+        )
+
+    def textures_in_file(self, file_path: str):
+        """
+        Texture entries of one resource file, from the cache when the file is unchanged.
+        """
+        cached = self.cache.get(file_path)
+        if cached is not None:
+            return [TextureEntry(*values) for values in cached]
+
+        entries = []
+        try:
+            stamp = FileCache.stamp(file_path)
+            segments = self.decoder.read_segments(file_path)
+            if segments:
+                _, virtual, physical = segments
+                parser = TextureParser(virtual, physical)
+                dictionary = parser.dictionary_offset(os.path.splitext(file_path)[1].lower())
+                if dictionary is not None:
+                    entries = list(parser.textures(dictionary))
+        except OSError as e:
+            print(f"Error: {e}")
+            return []
+        except (zlib.error, struct.error, IndexError) as e:
+            # A corrupt resource stays corrupt until the file changes, so cache it as having no textures.
+            print(f"Error: {e}")
+            entries = []
+
+        self.cache.put(file_path, [entry.to_cache() for entry in entries], stamp)
+        return entries
+
+    def scan(self, root_dir: str, progress: ScanProgress = None):
+        """
+        Index every texture under root_dir and return SharedTexture results, most wasted memory first.
+        """
+        files = self.find_texture_files(root_dir, progress)
+        index = {}
+        if progress:
+            progress.start_phase("Decoding", by_bytes=True)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            future_map = {executor.submit(self.textures_in_file, f): f for f in files}
+            for future in as_completed(future_map):
+                file_path = future_map[future]
+                for entry in future.result():
+                    shared = index.get(entry.digest)
+                    if shared is None:
+                        index[entry.digest] = SharedTexture(
+                            entry.digest, entry.width, entry.height, entry.fmt, entry.data_size, []
+                        )
+                        shared = index[entry.digest]
+                    shared.occurrences.append((file_path, entry.name))
+                if progress:
+                    progress.advance_file(file_path)
+
+        try:
+            self.cache.save()
+        except OSError as e:
+            print(f"Error: {e}")
+
+        self.shared_textures = sorted(
+            (t for t in index.values() if t.copies > 1), key=lambda t: t.wasted_bytes, reverse=True
+        )
+        return self.shared_textures
+
+
+# ----------------------------------------#
+# 7. Archetype Analysis
+# ----------------------------------------#
+def name_hash(text: str) -> int:
+    """
+    Hash of a name as written in CodeWalker XML, where unknown names appear as 'hash_XXXXXXXX'.
+    """
+    text = (text or "").strip()
+    if not text:
+        return 0
+    if text.lower().startswith("hash_"):
+        try:
+            return int(text[5:], 16)
+        except ValueError:
+            pass
+    return joaat(text)
+
+
+@dataclass
+class ArchetypeDef:
+    """
+    An archetype defined in a .ytyp: its name and the assets it points to, as joaat hashes.
+    name is only known for XML files; binary files store hashes only.
+    """
+    name_hash: int
+    texture_dictionary: int = 0
+    drawable_dictionary: int = 0
+    asset_name: int = 0
+    name: str = ""
+
+    def to_cache(self) -> list:
+        return [self.name_hash, self.texture_dictionary, self.drawable_dictionary, self.asset_name, self.name]
+
+
+@dataclass
+class ArchetypeCollision:
+    """
+    An archetype name defined by more than one .ytyp file.
+    """
+    name_hash: int
+    names: list
+    files: list
+    selected: bool = False
+
+    @property
+    def display_name(self) -> str:
+        return ', '.join(self.names) if self.names else f"hash_{self.name_hash:08X}"
+
+    @property
+    def resources(self) -> list:
+        return sorted({resource_name(path) for path in self.files})
+
+    @property
+    def cross_resource(self) -> bool:
+        return len(self.resources) > 1
+
+    EXPORT_FIELDS = ("name", "name_hash", "count", "cross_resource", "resources", "files")
+
+    def to_record(self, root_dir: str) -> dict:
+        return {
+            "name": self.display_name,
+            "name_hash": f"0x{self.name_hash:08X}",
+            "count": len(self.files),
+            "cross_resource": self.cross_resource,
+            "resources": self.resources,
+            "files": [relative_location(path, root_dir) for path in self.files],
+        }
+
+
+class YtypParser:
+    """
+    Extracts archetype definitions from .ytyp files in binary (RSC7 meta) or CodeWalker XML form.
+
+    Binary files are meta resources (layout as documented by CodeWalker): the data blocks holding
+    CBaseArchetypeDef / CTimeArchetypeDef / CMloArchetypeDef structures are read directly, each starting with
+    the base archetype fields. XML is stream-parsed, so large files never build a full tree.
+    """
+    META_MAGIC = 0x50524430
+    # Structure name hash -> structure size
+    ARCHETYPE_STRUCTURES = {
+        2411387556: 144,   # CBaseArchetypeDef
+        2520619910: 160,   # CTimeArchetypeDef
+        273704021: 240,    # CMloArchetypeDef
+    }
+    ENTITY_STRUCTURE = (1825799514, 128)   # CEntityDef, archetypeName at +8
+    MAX_BLOCKS = 65535
+    # Bytes looked at to tell a binary resource from XML (which may start with whitespace)
+    SNIFF_SIZE = 256
+
+    def __init__(self, decoder: ResourceDecoder = None):
+        self.decoder = decoder or ResourceDecoder()
+
+    def parse(self, file_path: str, f):
+        """
+        Archetypes of a .ytyp read once from f, an open binary file with peek() (see _HashingReader).
+        """
+        head = f.peek(self.SNIFF_SIZE)
+        if head[:4] == struct.pack('<I', ResourceDecoder.RSC7_MAGIC):
+            return self._archetypes(*self._meta_blocks(file_path, f.chunks(ResourceDecoder.READ_SIZE)))
+        if head.lstrip()[:1] == b'<':
+            return self.parse_xml(f)
+        return []
+
+    def parse_references(self, file_path: str, data: bytes):
+        """
+        (archetype definitions, archetype name hashes placed as entities) of a .ytyp or .ymap.
+        Entities are what .ymap files and MLO interiors place in the world.
+        """
+        if data[:4] == struct.pack('<I', ResourceDecoder.RSC7_MAGIC):
+            virtual, blocks = self._meta_blocks(file_path)
+            return self._archetypes(virtual, blocks), self._entities(virtual, blocks)
+        if data.lstrip()[:1] == b'<':
+            return self.parse_xml(io.BytesIO(data)), self.parse_xml_entities(data)
+        return [], []
+
+    def _meta_blocks(self, file_path: str, chunks=None):
+        """
+        The virtual segment of a binary meta resource and its data blocks as (structure, offset, length).
+        """
+        segments = self.decoder.read_segments(file_path, chunks)
+        if not segments:
+            return b"", []
+        virtual = segments[1]
+        if len(virtual) < 0x50 or struct.unpack_from('<I', virtual, 0x10)[0] != self.META_MAGIC:
+            return virtual, []
+        blocks_pointer = struct.unpack_from('<Q', virtual, 0x30)[0]
+        block_count = struct.unpack_from('<H', virtual, 0x4C)[0]
+        blocks = self._virtual_offset(blocks_pointer, len(virtual))
+        if blocks is None or block_count > self.MAX_BLOCKS or blocks + block_count * 16 > len(virtual):
+            return virtual, []
+
+        result = []
+        for i in range(block_count):
+            structure, length, pointer = struct.unpack_from('<IiQ', virtual, blocks + i * 16)
+            offset = self._virtual_offset(pointer, len(virtual))
+            if offset is not None and length > 0 and offset + length <= len(virtual):
+                result.append((structure, offset, length))
+        return virtual, result
+
+    def parse_binary(self, file_path: str):
+        return self._archetypes(*self._meta_blocks(file_path))
+
+    def _archetypes(self, virtual: bytes, blocks):
+        archetypes = []
+        for structure, offset, length in blocks:
+            size = self.ARCHETYPE_STRUCTURES.get(structure)
+            if not size:
+                continue
+            for start in range(offset, offset + length - size + 1, size):
+                name, txd, _, drawable, _, _, asset = struct.unpack_from('<7I', virtual, start + 88)
+                if name:
+                    archetypes.append(ArchetypeDef(name, txd, drawable, asset))
+        return archetypes
+
+    def _entities(self, virtual: bytes, blocks):
+        structure_name, size = self.ENTITY_STRUCTURE
+        entities = set()
+        for structure, offset, length in blocks:
+            if structure == structure_name:
+                for start in range(offset, offset + length - size + 1, size):
+                    entities.add(struct.unpack_from('<I', virtual, start + 8)[0])
+        entities.discard(0)
+        return sorted(entities)
+
+    @staticmethod
+    def _virtual_offset(pointer: int, limit: int):
+        if (pointer >> 28) == 0x5:
+            offset = pointer & 0x0FFFFFFF
+            if offset < limit:
+                return offset
+        return None
+
+    @staticmethod
+    def parse_xml(f):
+        archetypes = []
+        path = []
+        fields = {}
+        for event, elem in ET.iterparse(f, events=('start', 'end')):
+            if event == 'start':
+                path.append(elem.tag)
+                if path[-2:] == ['archetypes', 'Item']:
+                    fields = {}
+                continue
+            if path[-3:-1] == ['archetypes', 'Item']:
+                # A direct field of an archetype (nested MLO rooms/entities have deeper paths).
+                fields[elem.tag] = (elem.text or "").strip()
+            elif path[-2:] == ['archetypes', 'Item']:
+                name = fields.get('name', "")
+                if name:
+                    archetypes.append(ArchetypeDef(
+                        name_hash(name),
+                        name_hash(fields.get('textureDictionary')),
+                        name_hash(fields.get('drawableDictionary')),
+                        name_hash(fields.get('assetName')),
+                        "" if name.lower().startswith('hash_') else name,
+                    ))
+                elem.clear()
+            path.pop()
+        return archetypes
+
+    @staticmethod
+    def parse_xml_entities(data: bytes):
+        entities = set()
+        for _, elem in ET.iterparse(io.BytesIO(data)):
+            if elem.tag == 'archetypeName':
+                entities.add(name_hash(elem.text))
+            elif elem.tag == 'Item':
+                elem.clear()
+        entities.discard(0)
+        return sorted(entities)
+
+
+class ArchetypeIndexer:
+    """
+    Parses every .ytyp under 'stream' folders in parallel and indexes archetype names to their defining files.
+    Each file is hashed while it is parsed, in a single read. Parsed archetypes are cached per file together with
+    the file's SHA256, so unchanged files are skipped.
+    """
+    EXTENSIONS = ('.ytyp', '.ytyp.xml')
+
+    def __init__(self, max_workers: int = None, cache: FileCache = None):
+        self.max_workers = max_workers or os.cpu_count() or 4
+        self.cache = cache or FileCache("ytyp_archetypes")
+        self.parser = YtypParser()
+        self.archetypes = {}
+        self.collisions = []
+
+    def archetypes_in_file(self, file_path: str):
+        """
+        Archetype definitions of one .ytyp, from the cache when unchanged.
+        """
+        cached = self.cache.get(file_path)
+        if cached is not None:
+            return [ArchetypeDef(*values) for values in cached[1]]
+        try:
+            stamp = FileCache.stamp(file_path)
+            with open(file_path, 'rb') as f:
+                reader = _HashingReader(f)
+                archetypes = self.parser.parse(file_path, reader)
+                digest = reader.hexdigest()
+        except (OSError, zlib.error, struct.error, ET.ParseError) as e:
+            print(f"Error: {file_path}: {e}")
+            return []
+        self.cache.put(file_path, [digest, [a.to_cache() for a in archetypes]], stamp)
+        return archetypes
+
+    def scan(self, root_dir: str, progress: ScanProgress = None):
+        """
+        Index all archetypes under root_dir and return ArchetypeCollision results, cross-resource ones first.
+        """
+        stream_files = DirectoryWalker().walk(root_dir, stream_only=True, progress=progress)
+        ytyp_files = [f for f in stream_files if os.path.normcase(f).endswith(self.EXTENSIONS)]
+
+        if progress:
+            progress.start_phase("Parsing", by_bytes=True)
+        index = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            future_map = {executor.submit(self.archetypes_in_file, f): f for f in ytyp_files}
+            for future in as_completed(future_map):
+                file_path = future_map[future]
+                for archetype in future.result():
+                    entry = index.setdefault(archetype.name_hash, (set(), []))
+                    if archetype.name:
+                        entry[0].add(archetype.name.lower())
+                    if file_path not in entry[1]:
+                        entry[1].append(file_path)
+                if progress:
+                    progress.advance_file(file_path)
+
+        try:
+            self.cache.save()
+        except OSError as e:
+            print(f"Error: {e}")
+
+        self.archetypes = index
+        collisions = [
+            ArchetypeCollision(hash_value, sorted(names), sorted(files))
+            for hash_value, (names, files) in index.items() if len(files) > 1
+        ]
+        unnamed = {c.name_hash: c for c in collisions if not c.names}
+        if unnamed:
+            # Binary files only store hashes; asset files are usually named after their archetype.
+            for path in stream_files:
+                stem = os.path.basename(path).split('.', 1)[0]
+                collision = unnamed.get(joaat(stem))
+                if collision and stem.lower() not in collision.names:
+                    collision.names.append(stem.lower())
+        collisions.sort(key=lambda c: (not c.cross_resource, c.display_name))
+        self.collisions = collisions
+        return collisions
+
+
+# ----------------------------------------#
+# 8. Asset Dependencies
+# ----------------------------------------#
+@dataclass
+class AssetReferences:
+    """
+    What one .ytyp/.ymap/.meta file refers to, as joaat hashes: archetypes it defines, archetypes it places
+    as entities, plain names (model/texture names in .meta files) and texture dictionary [child, parent] pairs.
+    """
+    archetypes: list = field(default_factory=list)
+    entities: list = field(default_factory=list)
+    names: list = field(default_factory=list)
+    txd_parents: list = field(default_factory=list)
+
+    def to_cache(self) -> list:
+        return [[a.to_cache() for a in self.archetypes], self.entities, self.names, self.txd_parents]
+
+    @classmethod
+    def from_cache(cls, value: list):
+        archetypes, entities, names, txd_parents = value
+        return cls([ArchetypeDef(*a) for a in archetypes], entities, names, txd_parents)
+
+
+@dataclass
+class OrphanAsset:
+    """
+    A model or texture dictionary in a 'stream' folder that nothing references.
+    """
+    path: str
+    size_bytes: int
+    selected: bool = False
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(self.path)
+
+    @property
+    def extension(self) -> str:
+        return os.path.splitext(self.path)[1].lower()
+
+    EXPORT_FIELDS = ("name", "resource", "extension", "size_bytes", "path")
+
+    def to_record(self, root_dir: str) -> dict:
+        return {
+            "name": self.name,
+            "resource": resource_name(self.path),
+            "extension": self.extension,
+            "size_bytes": self.size_bytes,
+            "path": relative_location(self.path, root_dir),
+        }
+
+
+class DependencyAnalyzer:
+    """
+    Builds a graph of asset names from .ytyp/.ymap files in 'stream' folders and .meta files anywhere under
+    the root, then reports the .ydr/.yft/.ytd files no reference reaches.
+
+    Nodes are joaat hashes of names, and asset files are matched by the hash of their file name stem.
+    An archetype pulls in its drawable, texture dictionary and drawable dictionary. A texture dictionary pulls
+    in its gtxd parent, and x pulls in x_hi / x+hi. Every .ytyp, .ymap and .meta is a root, because the game
+    loads them all. A streamed asset named like an entity's archetype replaces that model, so the archetype
+    hash also reaches a file of the same name. Ped component files ('^' in the name) are referenced by index
+    from their .ymt, not by name, and are never reported.
+
+    Parsed references are cached per file with its SHA256 and reused for copies of the same content.
+    """
+    SOURCE_EXTENSIONS = ('.ytyp', '.ytyp.xml', '.ymap', '.ymap.xml')
+    META_EXTENSIONS = ('.meta',)
+    ASSET_EXTENSIONS = ('.ydr', '.yft', '.ytd', '.ydd')
+    ORPHAN_EXTENSIONS = ('.ydr', '.yft', '.ytd')
+    HI_SUFFIXES = ('_hi', '+hi')
+    NAME_PATTERN = re.compile(r'^[A-Za-z0-9_+\-]{1,64}$')
+
+    def __init__(self, max_workers: int = None, cache: FileCache = None):
+        self.max_workers = max_workers or os.cpu_count() or 4
+        self.cache = cache or FileCache("asset_references")
+        self.parser = YtypParser()
+        self.edges = {}
+        self.roots = set()
+        self.referenced = set()
+        self.orphans = []
+        self._by_digest = None
+        self._digest_lock = threading.Lock()
+
+    def _known_digests(self):
+        with self._digest_lock:
+            if self._by_digest is None:
+                self._by_digest = {value[0]: value[1] for value in self.cache.values() if value}
+            return self._by_digest
+
+    @staticmethod
+    def stem(path: str) -> str:
+        return os.path.basename(path).split('.', 1)[0].lower()
+
+    def parse_meta(self, data: bytes) -> AssetReferences:
+        """
+        Every name-like leaf value of a .meta file (modelName, txdName, weapon models, ...) and its
+        texture dictionary relationships (<Item><parent/><child/></Item> in gtxd.meta and vehicles.meta).
+        """
+        refs = AssetReferences()
+        names = set()
+        item = {}
+        for event, elem in ET.iterparse(io.BytesIO(data), events=('start', 'end')):
+            if event == 'start':
+                if elem.tag == 'Item':
+                    item = {}
+                continue
+            text = (elem.text or "").strip()
+            if elem.tag in ('parent', 'child'):
+                item[elem.tag] = text
+            if len(elem) == 0 and self.NAME_PATTERN.match(text):
+                names.add(joaat(text))
+            if elem.tag == 'Item':
+                if item.get('parent') and item.get('child'):
+                    refs.txd_parents.append([joaat(item['child']), joaat(item['parent'])])
+                item = {}
+                elem.clear()
+        refs.names = sorted(names)
+        return refs
+
+    def references_in_file(self, file_path: str) -> AssetReferences:
+        """
+        References of one source file, from the cache when unchanged or already parsed by content.
+        """
+        cached = self.cache.get(file_path)
+        if cached is not None:
+            return AssetReferences.from_cache(cached[1])
+        try:
+            stamp = FileCache.stamp(file_path)
+            with open(file_path, 'rb') as f:
+                data = f.read()
+            digest = hashlib.sha256(data).hexdigest()
+            known = self._known_digests().get(digest)
+            if known is not None:
+                refs = AssetReferences.from_cache(known)
+            elif os.path.normcase(file_path).endswith(self.META_EXTENSIONS):
+                refs = self.parse_meta(data)
+            else:
+                archetypes, entities = self.parser.parse_references(file_path, data)
+                refs = AssetReferences(archetypes, entities)
+        except (OSError, zlib.error, struct.error, ET.ParseError) as e:
+            print(f"Error: {file_path}: {e}")
+            return AssetReferences()
+        value = refs.to_cache()
+        self.cache.put(file_path, [digest, value], stamp)
+        self._known_digests().setdefault(digest, value)
+        return refs
+
+    def _add_edge(self, source: int, target: int):
+        if source and target and source != target:
+            self.edges.setdefault(source, set()).add(target)
+
+    def _add_references(self, refs: AssetReferences):
+        for archetype in refs.archetypes:
+            self.roots.add(archetype.name_hash)
+            self._add_edge(archetype.name_hash, archetype.asset_name)
+            self._add_edge(archetype.name_hash, archetype.texture_dictionary)
+            self._add_edge(archetype.name_hash, archetype.drawable_dictionary)
+        self.roots.update(refs.entities)
+        self.roots.update(refs.names)
+        for child, parent in refs.txd_parents:
+            self._add_edge(child, parent)
+
+    def _reachable(self) -> set:
+        seen = set(self.roots)
+        stack = list(self.roots)
+        while stack:
+            for target in self.edges.get(stack.pop(), ()):
+                if target not in seen:
+                    seen.add(target)
+                    stack.append(target)
+        return seen
+
+    def scan(self, root_dir: str, progress: ScanProgress = None):
+        """
+        Parse every reference source under root_dir (in parallel) and return the unreferenced assets
+        as OrphanAsset results, largest first.
+        """
+        wanted = self.SOURCE_EXTENSIONS + self.META_EXTENSIONS + self.ASSET_EXTENSIONS
+        files = DirectoryWalker().walk(root_dir, lambda name: os.path.normcase(name).endswith(wanted), progress=progress)
+
+        def in_stream(path):
+            parts = relative_location(os.path.dirname(path), root_dir).replace('\\', '/').split('/')
+            return any(DirectoryWalker.is_stream_dir(part) for part in parts)
+
+        sources, assets = [], []
+        for path in files:
+            name = os.path.normcase(path)
+            if name.endswith(self.META_EXTENSIONS):
+                sources.append(path)
+            elif in_stream(path):
+                (sources if name.endswith(self.SOURCE_EXTENSIONS) else assets).append(path)
+
+        if progress:
+            progress.start_phase("Parsing references", by_bytes=True)
+        self.edges, self.roots = {}, set()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            future_map = {executor.submit(self.references_in_file, f): f for f in sources}
+            for future in as_completed(future_map):
+                self._add_references(future.result())
+                if progress:
+                    progress.advance_file(future_map[future])
+            for path in assets:
+                if progress:
+                    progress.advance_file(path)
+
+        try:
+            self.cache.save()
+        except OSError as e:
+            print(f"Error: {e}")
+
+        for path in assets:
+            stem = self.stem(path)
+            for suffix in self.HI_SUFFIXES:
+                if stem.endswith(suffix):
+                    self._add_edge(joaat(stem[:-len(suffix)]), joaat(stem))
+        self.referenced = self._reachable()
+
+        orphans = []
+        for path, hash_value in zip(assets, joaat_many([self.stem(path) for path in assets])):
+            if hash_value in self.referenced or '^' in os.path.basename(path):
+                continue
+            if not os.path.normcase(path).endswith(self.ORPHAN_EXTENSIONS):
+                continue
+            try:
+                orphans.append(OrphanAsset(path, os.path.getsize(path)))
+            except OSError:
+                continue
+        orphans.sort(key=lambda o: (-o.size_bytes, o.path.lower()))
+        self.orphans = orphans
+        return orphans
+
+
+# ----------------------------------------#
+# 9. Cleanup Planning
+# ----------------------------------------#
+CLEANUP_METRICS = {"disk": "Disk space", "memory": "Streaming memory"}
+
+
+@dataclass
+class CleanupAction:
+    """
+    Deleting one file that has an identical copy to fall back on (keep), with what it frees:
+    bytes on disk and the streaming memory the client no longer loads for it.
+    """
+    path: str
+    keep: str
+    kind: str
+    disk_bytes: int
+    memory_bytes: int
+    cumulative_bytes: int = 0
+    status: str = "Planned"
+    selected: bool = False
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(self.path)
+
+    def saving(self, metric: str) -> int:
+        return self.memory_bytes if metric == "memory" else self.disk_bytes
+
+    EXPORT_FIELDS = ("kind", "name", "resource", "disk_bytes", "memory_bytes", "cumulative_bytes", "status",
+                     "path", "keep")
+
+    def to_record(self, root_dir: str) -> dict:
+        return {
+            "kind": self.kind,
+            "name": self.name,
+            "resource": resource_name(self.path),
+            "disk_bytes": self.disk_bytes,
+            "memory_bytes": self.memory_bytes,
+            "cumulative_bytes": self.cumulative_bytes,
+            "status": self.status,
+            "path": relative_location(self.path, root_dir),
+            "keep": relative_location(self.keep, root_dir),
+        }
+
+
+class CleanupPlanner:
+    """
+    Turns YftCleaner and StreamDuplicateChecker results into deletions ranked by bytes saved.
+    Each file appears once, and a file is only deleted while the copy it falls back on is kept.
+    """
+    KIND_HI = "_hi duplicate"
+    KIND_STREAM = "Stream duplicate"
+
+    def __init__(self, max_workers: int = None, io_budget: IoBudget = None):
+        self.max_workers = max_workers or os.cpu_count() or 4
+        self.cleaner = YftCleaner(io_budget=io_budget)
+        self.archives = RpfArchive()
+        self.actions = {}
+
+    @staticmethod
+    def _key(path: str) -> str:
+        return os.path.normcase(os.path.abspath(path))
+
+    def _add(self, action: CleanupAction):
+        self.actions.setdefault(self._key(action.path), action)
+
+    def add_hi_duplicates(self, results):
+        """
+        Plan the `_hi.yft` files YftCleaner found identical (or close enough) to their originals.
+        """
+        for result in results:
+            original = self.cleaner.get_original_file(result.path)
+            if original and not RpfArchive.split_virtual(result.path):
+                self._add(CleanupAction(result.path, original, self.KIND_HI, result.file_size, result.streaming_bytes))
+
+    def add_stream_duplicates(self, checker, progress: ScanProgress = None):
+        """
+        Plan the copies of duplicated stream files that are byte-identical to another copy; the first copy by
+        path is kept. Copies with different content are left out: choosing between them is not a cleanup.
+        Files inside .rpf archives cannot be deleted on their own and are skipped.
+        """
+        by_name = {}
+        for path in checker.stream_files:
+            name = os.path.basename(path).lower()
+            if name in checker.duplicate_files and not RpfArchive.split_virtual(path):
+                by_name.setdefault(name, []).append(path)
+
+        candidates = []
+        for paths in by_name.values():
+            by_size = {}
+            for path in paths:
+                try:
+                    by_size.setdefault(os.path.getsize(path), []).append(path)
+                except OSError:
+                    continue
+            for size, same_size in by_size.items():
+                if len(same_size) > 1:
+                    candidates.append(sorted(same_size, key=str.lower))
+                    if progress:
+                        progress.discover(len(same_size), size * len(same_size))
+
+        if progress:
+            progress.start_phase("Hashing duplicates", by_bytes=True)
+
+        def digest(path):
+            file_hash = self.cleaner.compute_file_hash(path)
+            if progress:
+                progress.advance_file(path)
+            return file_hash
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            hashed = [list(zip(paths, executor.map(digest, paths))) for paths in candidates]
+
+        for group in hashed:
+            kept = {}
+            for path, file_hash in group:
+                if not file_hash:
+                    continue
+                if file_hash not in kept:
+                    kept[file_hash] = path
+                    continue
+                result = self.cleaner.read_resource(path, self.archives)
+                if result:
+                    self._add(CleanupAction(path, kept[file_hash], self.KIND_STREAM, result.file_size,
+                                            result.streaming_bytes))
+
+    def plan(self, target_bytes: int = None, metric: str = "disk"):
+        """
+        Deletions ordered by the bytes they save (metric 'disk' or 'memory'), largest first. With target_bytes
+        the plan stops once the target is reached; taking the largest savings first reaches it with the
+        fewest deletions. An action is dropped when it would delete a copy another planned action keeps,
+        or keep a copy another one deletes.
+        """
+        ranked = sorted(self.actions.values(), key=lambda a: (-a.saving(metric), a.path.lower()))
+        deleted, kept = set(), set()
+        plan, total = [], 0
+        for action in ranked:
+            if target_bytes is not None and total >= target_bytes:
+                break
+            key, keep_key = self._key(action.path), self._key(action.keep)
+            if key in kept or keep_key in deleted:
+                continue
+            deleted.add(key)
+            kept.add(keep_key)
+            total += action.saving(metric)
+            action.cumulative_bytes = total
+            action.status = "Planned"
+            plan.append(action)
+        return plan
+
+    @staticmethod
+    def execute(plan, dry_run: bool = True, progress: ScanProgress = None):
+        """
+        Delete every planned file in one batch, or with dry_run only check that each deletion is still valid.
+        A file is skipped when its size changed since planning or its kept copy is gone.
+        Returns (bytes freed, [(path, reason)] for skipped files) and sets each action's status.
+        """
+        if progress:
+            progress.discover(len(plan))
+            progress.start_phase("Checking" if dry_run else "Deleting")
+        freed, failed = 0, []
+        for action in plan:
+            try:
+                if not os.path.isfile(action.keep):
+                    raise OSError(f"kept copy is missing: {action.keep}")
+                if os.path.getsize(action.path) != action.disk_bytes:
+                    raise OSError("file changed since planning")
+                if not dry_run:
+                    os.remove(action.path)
+                action.status = "Would delete" if dry_run else "Deleted"
+                freed += action.disk_bytes
+            except OSError as e:
+                action.status = f"Skipped: {e}"
+                failed.append((action.path, str(e)))
+            if progress:
+                progress.advance()
+        return freed, failed
+
+
+# ----------------------------------------#
+# 10. Compression Analysis
+# ----------------------------------------#
+@dataclass
+class CompressedAsset:
+    """
+    One resource with its download size (the compressed bytes on disk) against the decompressed
+    RSC page sizes it expands to, and the problems that comparison points at.
+    """
+    path: str
+    download_bytes: int
+    content_bytes: int
+    flags: tuple = ()
+    selected: bool = False
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(self.path)
+
+    @property
+    def ratio(self) -> float:
+        """
+        Download size as a fraction of the content size; lower is better, near 1.0 means stored uncompressed.
+        """
+        return self.download_bytes / self.content_bytes if self.content_bytes else 1.0
+
+    @property
+    def flags_str(self) -> str:
+        return ", ".join(self.flags) or "OK"
+
+    EXPORT_FIELDS = ("name", "resource", "download_bytes", "content_bytes", "ratio", "flags", "path")
+
+    def to_record(self, root_dir: str) -> dict:
+        return {
+            "name": self.name,
+            "resource": resource_name(self.path),
+            "download_bytes": self.download_bytes,
+            "content_bytes": self.content_bytes,
+            "ratio": round(self.ratio, 4),
+            "flags": list(self.flags),
+            "path": relative_location(self.path, root_dir),
+        }
+
+
+@dataclass
+class ResourceCompression:
+    """
+    The CompressedAsset totals of one resource: what its clients download and what could still be saved.
+    """
+    resource: str
+    files: int = 0
+    download_bytes: int = 0
+    content_bytes: int = 0
+    flagged: int = 0
+    flagged_bytes: int = 0
+    selected: bool = False
+
+    @property
+    def ratio(self) -> float:
+        return self.download_bytes / self.content_bytes if self.content_bytes else 1.0
+
+    EXPORT_FIELDS = ("resource", "files", "download_bytes", "content_bytes", "ratio", "flagged", "flagged_bytes")
+
+    def to_record(self, root_dir: str) -> dict:
+        return {
+            "resource": self.resource,
+            "files": self.files,
+            "download_bytes": self.download_bytes,
+            "content_bytes": self.content_bytes,
+            "ratio": round(self.ratio, 4),
+            "flagged": self.flagged,
+            "flagged_bytes": self.flagged_bytes,
+        }
+
+
+class CompressionAdvisor:
+    """
+    Ranks stream resources by download size and compression ratio, from the same header pass as the
+    oversize scan: the RSC7 header already holds the decompressed page sizes, so no file is inflated.
+
+    Two cases are flagged. A resource whose download is nearly as large as its content was stored
+    uncompressed (or at level 0) and will shrink on re-export. A resource larger on disk than its content
+    carries padding or trailing data the client downloads for nothing. Small files are never flagged as
+    uncompressed, since deflate gains little on them.
+    """
+    FLAG_UNCOMPRESSED = "Uncompressed"
+    FLAG_LARGER_THAN_CONTENT = "Larger than content"
+
+    def __init__(self, uncompressed_ratio: float = 0.9, min_content_kb: float = 256.0, io_budget: IoBudget = None):
+        self.uncompressed_ratio = uncompressed_ratio
+        self.min_content_bytes = int(min_content_kb * 1024)
+        self.cleaner = YftCleaner(io_budget=io_budget)
+
+    def assess(self, result: YftResult):
+        """
+        CompressedAsset for an RSC resource read by YftCleaner.read_resource, None for other files.
+        """
+        if not result or not result.is_resource:
+            return None
+        asset = CompressedAsset(result.path, result.file_size, result.streaming_bytes)
+        flags = []
+        # Loose files keep their 16 byte header on disk; allow one 512 byte block on top for alignment.
+        if asset.download_bytes > asset.content_bytes + 16 + 512:
+            flags.append(self.FLAG_LARGER_THAN_CONTENT)
+        elif asset.content_bytes >= self.min_content_bytes and asset.ratio >= self.uncompressed_ratio:
+            flags.append(self.FLAG_UNCOMPRESSED)
+        asset.flags = tuple(flags)
+        return asset
+
+    def scan(self, root_directory: str, include_archives: bool = True, progress=None) -> list:
+        """
+        Every resource in a 'stream' folder, loose or inside .rpf archives, largest download first.
+        """
+        assets = [asset for asset in map(self.assess, self.cleaner.read_resources(root_directory, include_archives, progress))
+                  if asset]
+        assets.sort(key=lambda asset: asset.download_bytes, reverse=True)
+        return assets
+
+    @staticmethod
+    def by_resource(assets) -> list:
+        """
+        ResourceCompression per resource, largest download first.
+        """
+        totals = {}
+        for asset in assets:
+            resource = resource_name(asset.path)
+            total = totals.get(resource)
+            if total is None:
+                total = totals[resource] = ResourceCompression(resource)
+            total.files += 1
+            total.download_bytes += asset.download_bytes
+            total.content_bytes += asset.content_bytes
+            if asset.flags:
+                total.flagged += 1
+                total.flagged_bytes += asset.download_bytes
+        return sorted(totals.values(), key=lambda total: total.download_bytes, reverse=True)
+
+
+# ----------------------------------------#
+# 11. Index Service
+# ----------------------------------------#
+SERVICE_HOST = "127.0.0.1"
+SERVICE_PORT = 8765
+
+
+class StreamIndex:
+    """
+    One complete scan of a server tree, answering service queries. Never modified after it is built;
+    a refresh builds a new index and swaps it in.
+    """
+    def __init__(self, root_dir: str, stream_files, critical_files, generation: int, headers: dict = None):
+        self.root_dir = root_dir
+        self.generation = generation
+        self.created = time.strftime('%Y-%m-%d %H:%M:%S')
+        self.stream_files = stream_files
+        self.files_by_name = {}
+        for path in stream_files:
+            self.files_by_name.setdefault(os.path.basename(path).lower(), []).append(path)
+        self.critical = {}
+        for path in critical_files:
+            self.critical.setdefault(os.path.basename(path).lower(), []).append(os.path.dirname(path))
+        # path -> (stamp, YftResult or None) from the resource header pass of IndexService.refresh
+        self.headers = headers or {}
+        self._resources = [result for _, result in self.headers.values() if result and result.is_resource]
+
+    def status(self) -> dict:
+        return {
+            "root": self.root_dir,
+            "generation": self.generation,
+            "created": self.created,
+            "stream_files": len(self.stream_files),
+            "critical_files": sum(len(locs) for locs in self.critical.values()),
+        }
+
+    def duplicates(self, name: str = None) -> dict:
+        """
+        Locations of one file name, or every name found in more than one stream folder.
+        """
+        if name:
+            paths = self.files_by_name.get(name.lower(), [])
+            return {name.lower(): [os.path.dirname(path) for path in paths]}
+        return {
+            name: [os.path.dirname(path) for path in paths]
+            for name, paths in self.files_by_name.items() if len(paths) > 1
+        }
+
+    def conflicts(self, resource: str) -> dict:
+        """
+        Stream duplicates and critical file conflicts that involve the given resource.
+        """
+        resource = resource.lower()
+
+        def in_resource(location):
+            # Critical files often sit outside 'stream', so match any folder below the root.
+            parts = relative_location(location, self.root_dir).replace('\\', '/').lower().split('/')
+            return resource in parts
+
+        def involved(groups):
+            return {
+                name: locations for name, locations in groups.items()
+                if len(locations) > 1 and any(in_resource(loc) for loc in locations)
+            }
+
+        return {"duplicates": involved(self.duplicates()), "critical": involved(self.critical)}
+
+    def check(self, names) -> dict:
+        """
+        Manual list check: the full paths of every listed file name ([] when not found).
+        """
+        return {name: self.files_by_name.get(name.lower(), []) for name in names}
+
+    def resources(self) -> list:
+        """
+        YftResult for every RSC resource among the stream files, read while the index was built.
+        """
+        return self._resources
+
+    def oversized(self, min_status: SizeStatus) -> list:
+        """
+        Oversize records for the stream files, largest first.
+        """
+        oversized = sorted((r for r in self.resources() if r.status.severity >= min_status.severity),
+                           key=lambda r: r.size_bytes, reverse=True)
+        return [r.to_record(self.root_dir) for r in oversized]
+
+    def compression(self, resource: str = None) -> list:
+        """
+        Per-resource compression totals, or the assets of one resource, largest download first.
+        """
+        advisor = CompressionAdvisor()
+        assets = sorted(filter(None, map(advisor.assess, self.resources())),
+                        key=lambda asset: asset.download_bytes, reverse=True)
+        if resource:
+            return [asset.to_record(self.root_dir) for asset in assets
+                    if resource_name(asset.path).lower() == resource.lower()]
+        return [total.to_record(self.root_dir) for total in CompressionAdvisor.by_resource(assets)]
+
+
+class _IndexRequestHandler(BaseHTTPRequestHandler):
+    """
+    JSON over HTTP: GET /status, /duplicates[?name=], /files, /critical, /conflicts?resource=, /check?name=&name=,
+    /oversize[?min_status=], /compression[?resource=];
+    POST /check with a JSON list of names, POST /refresh.
+    """
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, code: int, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _dispatch(self, body=None):
+        parsed = urlparse(self.path)
+        try:
+            code, payload = self.server.service.handle(parsed.path, parse_qs(parsed.query), body)
+        except Exception as e:
+            code, payload = 500, {"error": str(e)}
+        self._reply(code, payload)
+
+    def do_GET(self):
+        self._dispatch()
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"null")
+        except ValueError:
+            self._reply(400, {"error": "Invalid JSON body"})
+            return
+        self._dispatch(body)
+
+
+class IndexService:
+    """
+    Long-running service that keeps the stream/critical index of one server tree warm and answers queries
+    on localhost, so GUI sessions and CLI runs do not each walk the tree. The tree is rescanned every
+    refresh_interval seconds (or on POST /refresh) in the background; queries always see the last complete scan.
+    """
+    def __init__(self, root_dir: str, include_archives: bool = False, refresh_interval: float = 60.0,
+                 host: str = SERVICE_HOST, port: int = SERVICE_PORT):
+        self.root_dir = os.path.abspath(root_dir)
+        self.include_archives = include_archives
+        self.refresh_interval = refresh_interval
+        self.host = host
+        self.port = port
+        self.index = None
+        self.progress = ScanProgress()
+        self._generation = 0
+        self._refresh_lock = threading.Lock()
+        self._refresh_requested = threading.Event()
+        self._stop = threading.Event()
+
+    def refresh(self):
+        """
+        Rescan the tree and swap in the new index. Concurrent calls collapse into one scan.
+        """
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+        try:
+            self.progress = ScanProgress()
+            checker = StreamDuplicateChecker()
+            stream_files, critical_files = [], []
+            lock = threading.Lock()
+
+            def split(paths):
+                # One walk of the whole tree serves both lists: stream files, and critical files in any folder.
+                stream = [path for path in paths if DirectoryWalker.in_stream_dir(path, self.root_dir)]
+                critical = [path for path in paths if checker.is_critical_file(os.path.basename(path))]
+                with lock:
+                    stream_files.extend(stream)
+                    critical_files.extend(critical)
+
+            checker.walker.walk(self.root_dir, progress=self.progress, sink=split, archives=self.include_archives)
+            stream_files.sort()
+            critical_files.sort()
+            headers = self.read_headers(stream_files, self.index.headers if self.index else {})
+            self.progress.finish("Scan Completed")
+            self._generation += 1
+            self.index = StreamIndex(self.root_dir, stream_files, critical_files, self._generation, headers)
+        finally:
+            self._refresh_lock.release()
+
+    def read_headers(self, stream_files, previous: dict) -> dict:
+        """
+        path -> (stamp, YftResult or None) for every stream file. Results of the previous index are reused for
+        files (or, inside archives, archives) whose size and modification time are unchanged.
+        """
+        cleaner, archives = YftCleaner(), RpfArchive()
+        headers = {}
+        # The walk counted every file in the tree; this phase only covers the stream files.
+        self.progress = ScanProgress()
+        self.progress.discover(len(stream_files))
+        self.progress.start_phase("Reading headers")
+        for path in stream_files:
+            virtual = RpfArchive.split_virtual(path)
+            try:
+                stamp = FileCache.stamp(virtual[0] if virtual else path)
+            except OSError:
+                self.progress.advance()
+                continue
+            known = previous.get(path)
+            if known and known[0] == stamp:
+                headers[path] = known
+            else:
+                headers[path] = (stamp, cleaner.read_resource(path, archives))
+            self.progress.advance()
+        archives.save_cache()
+        return headers
+
+    def _refresh_loop(self):
+        while not self._stop.is_set():
+            self._refresh_requested.wait(self.refresh_interval)
+            self._refresh_requested.clear()
+            if self._stop.is_set():
+                return
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Error: {e}")
+
+    def handle(self, path: str, params: dict, body=None):
+        """
+        Answer one query; returns (HTTP status, JSON payload).
+        """
+        if path == "/refresh":
+            self._refresh_requested.set()
+            return 202, {"refreshing": True}
+        index = self.index
+        if index is None:
+            return 503, {"error": "Index is still being built", "progress": self.progress.snapshot().describe()}
+        param = lambda key: (params.get(key) or [""])[0]
+
+        if path == "/status":
+            status = index.status()
+            status["progress"] = self.progress.snapshot().describe()
+            return 200, status
+        if path == "/duplicates":
+            return 200, index.duplicates(param("name"))
+        if path == "/files":
+            return 200, index.stream_files
+        if path == "/critical":
+            return 200, index.critical
+        if path == "/conflicts":
+            if not param("resource"):
+                return 400, {"error": "Missing 'resource' parameter"}
+            return 200, index.conflicts(param("resource"))
+        if path == "/check":
+            names = body if isinstance(body, list) else params.get("name", [])
+            return 200, index.check([str(name) for name in names])
+        if path == "/oversize":
+            try:
+                min_status = SizeStatus.from_label(param("min_status") or SizeStatus.WARNING.label)
+            except ValueError as e:
+                return 400, {"error": str(e)}
+            return 200, index.oversized(min_status)
+        if path == "/compression":
+            return 200, index.compression(param("resource"))
+        return 404, {"error": f"Unknown query: {path}"}
+
+    def serve_forever(self):
+        """
+        Bind, then build the first index in the background; queries get a 503 with its progress until it is ready.
+        """
+        server = ThreadingHTTPServer((self.host, self.port), _IndexRequestHandler)
+        server.service = self
+        self._refresh_requested.set()
+        threading.Thread(target=self._refresh_loop, daemon=True).start()
+        try:
+            server.serve_forever()
+        finally:
+            self._stop.set()
+            self._refresh_requested.set()
+            server.server_close()
+
+
+class IndexClient:
+    """
+    Thin client for a running IndexService.
+    """
+    def __init__(self, host: str = SERVICE_HOST, port: int = SERVICE_PORT, timeout: float = 5.0):
+        self.base_url = f"http://{host}:{port}"
+        self.timeout = timeout
+
+    def query(self, endpoint: str, params: dict = None, body=None):
+        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        if params:
+            url += "?" + urlencode(params, doseq=True)
+        data = json.dumps(body).encode('utf-8') if body is not None else None
+        request = Request(url, data=data, headers={"Content-Type": "application/json"})
+        try:
+            with urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read())
+        except HTTPError as e:
+            raise RuntimeError(json.loads(e.read() or b"{}").get("error", str(e)))
+
+    def serves(self, root_dir: str) -> bool:
+        """
+        True if a service is running and indexes root_dir.
+        """
+        try:
+            status = self.query("status")
+        except (OSError, ValueError, RuntimeError):
+            return False
+        return os.path.normcase(os.path.abspath(status.get("root", ""))) == os.path.normcase(os.path.abspath(root_dir))
+
+
+# ----------------------------------------#
+# 12. GUI and Main Controller
+# ----------------------------------------#
+MARGIN_MODE_SIZE = "KB size difference"
+MARGIN_MODE_SIMILARITY = "% content similarity (min)"
+
+
+class GUI_MAIN:
+    """
+    A class responsible for managing the entire Tkinter GUI
+    """
+    # Rows of a restored result store added per idle callback after the first screen
+    RESTORE_STEP_ROWS = 2000
+
+    def __init__(self, root):
+        self.root = root
+        self.root.title("Stream Files Assistant Extended")
+        self.root.geometry("1280x800")
+        self.root.resizable(True, True)
+
+        # Margin-related variables
+        self.enable_margin_var = tk.BooleanVar(value=False)
+        self.size_margin_kb_var = tk.StringVar(value="0.0")
+        self.margin_mode_var = tk.StringVar(value=MARGIN_MODE_SIZE)
+        self.compare_resources_var = tk.BooleanVar(value=True)
+        self.lod_aware_var = tk.BooleanVar(value=False)
+        self.low_impact_var = tk.BooleanVar(value=False)
+        self.io_limit_mb_var = tk.StringVar(value="20")
+        self.time_budget_var = tk.StringVar()
+        self.include_archives_var = tk.BooleanVar(value=False)
+
+        # Will be created after user hits 'Start Scan'
+        self.yft_cleaner = None
+        self.stream_checker = None
+
+        self.root_directory = tk.StringVar()
+        self.stream_root_directory = tk.StringVar()
+        self.listing_path_var = tk.StringVar()
+        self.base_game_var = tk.BooleanVar(value=os.path.isfile(BASE_GAME_INDEX_PATH))
+        self.base_game_index = None
+        self.right_clicked_row = None
+        self.yft_root_dir = ""
+        self.stream_root_dir = ""
+        
+        # Critical files filter
+        self.critical_filter_var = tk.StringVar(value="All Files")
+
+        # Cleanup plan options
+        self.cleanup_target_var = tk.StringVar()
+        self.cleanup_metric_var = tk.StringVar(value=CLEANUP_METRICS["disk"])
+
+        # Compression analysis
+        self.compression_group_var = tk.BooleanVar(value=False)
+        self.compression_assets = []
+
+        # Snapshot diff selection
+        self.diff_old_var = tk.StringVar()
+        self.diff_new_var = tk.StringVar()
+
+        # Last results, shown again on the next start
+        self.refresh_on_open_var = tk.BooleanVar(value=os.path.isfile(REFRESH_ON_OPEN_PATH))
+        self.results_changed = set()
+        # Result stores still being added to their table, by kind
+        self.restoring = {}
+
+        # Build UI
+        self.setup_ui()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        threading.Thread(target=self.restore_results_thread, daemon=True).start()
+
+    def setup_ui(self):
+        style = ttk.Style(self.root)
+        style.theme_use("clam")
+        style.configure("Treeview", rowheight=25)
+        style.configure("Treeview.Heading", font=('Calibri', 12, 'bold'))
+        style.configure("TButton", padding=6, font=('Calibri', 10))
+        style.configure("TLabel", font=('Calibri', 10))
+        style.configure("TCombobox", font=('Calibri', 10))
+
+        # Notebook
+        self.notebook = ttk.Notebook(self.root)
+        self.notebook.pack(fill=tk.BOTH, expand=True)
+
+        # Tab 1: YFT Cleaner
+        self.tab_yft = ttk.Frame(self.notebook)
+        self.notebook.add(self.tab_yft, text="Duplicate YFT Cleaner")
+        self.setup_yft_tab()
+
+        # Tab 2: Stream Duplicate Checker
+        self.tab_stream = ttk.Frame(self.notebook)
+        self.notebook.add(self.tab_stream, text="Stream Duplicate Checker")
+        self.setup_stream_tab()
+        
+        # Tab 3: Critical Config Files
+        self.tab_critical = ttk.Frame(self.notebook)
+        self.notebook.add(self.tab_critical, text="Critical Config Files (.ymt/.meta/.xml)")
+        self.setup_critical_tab()
+
+        # Tab 4: Shared Textures
+        self.tab_textures = ttk.Frame(self.notebook)
+        self.notebook.add(self.tab_textures, text="Shared Textures")
+        self.setup_textures_tab()
+
+        # Tab 5: Archetype Collisions
+        self.tab_archetypes = ttk.Frame(self.notebook)
+        self.notebook.add(self.tab_archetypes, text="Archetypes")
+        self.setup_archetypes_tab()
+
+        # Tab 6: Orphaned Assets
+        self.tab_orphans = ttk.Frame(self.notebook)
+        self.notebook.add(self.tab_orphans, text="Orphaned Assets")
+        self.setup_orphans_tab()
+
+        # Tab 7: Cleanup Plan
+        self.tab_cleanup = ttk.Frame(self.notebook)
+        self.notebook.add(self.tab_cleanup, text="Cleanup Plan")
+        self.setup_cleanup_tab()
+
+        # Tab 8: Compression
+        self.tab_compression = ttk.Frame(self.notebook)
+        self.notebook.add(self.tab_compression, text="Compression")
+        self.setup_compression_tab()
+
+        # Tab 9: Scan History / Diff
+        self.tab_diff = ttk.Frame(self.notebook)
+        self.notebook.add(self.tab_diff, text="Scan Diff")
+        self.setup_diff_tab()
+
+        # Status bar
+        self.status = tk.StringVar()
+        self.status.set("Ready")
+        lbl_status = ttk.Label(self.root, textvariable=self.status, relief=tk.SUNKEN, anchor="w")
+        lbl_status.pack(fill=tk.X, side=tk.BOTTOM)
+
+        # Right-click menus
+        self.yft_context_menu = tk.Menu(self.root, tearoff=0)
+        self.yft_context_menu.add_command(label="View Folder", command=self.view_folder)
+
+        self.stream_context_menu = tk.Menu(self.root, tearoff=0)
+        
+        self.critical_context_menu = tk.Menu(self.root, tearoff=0)
+
+    def setup_yft_tab(self):
+        frame_top = ttk.Frame(self.tab_yft, padding=10)
+        frame_top.pack(fill=tk.X)
+
+        lbl_dir = ttk.Label(frame_top, text="Root Directory:")
+        lbl_dir.grid(row=0, column=0, sticky="w", padx=(0, 5))
+
+        entry_dir = ttk.Entry(frame_top, textvariable=self.root_directory, width=60)
+        entry_dir.grid(row=0, column=1, sticky="w", padx=(0, 5))
+
+        btn_browse = ttk.Button(frame_top, text="Browse...", command=self.browse_directory)
+        btn_browse.grid(row=0, column=2, sticky="w")
+
+        # Margin UI
+        frame_margin = ttk.Frame(self.tab_yft, padding=(10, 5))
+        frame_margin.pack(fill=tk.X)
+
+        check_margin = ttk.Checkbutton(
+            frame_margin,
+            text="Enable margin",
+            variable=self.enable_margin_var
+        )
+        check_margin.grid(row=0, column=0, sticky="w")
+
+        entry_margin_kb = ttk.Entry(frame_margin, textvariable=self.size_margin_kb_var, width=10)
+        entry_margin_kb.grid(row=0, column=1, padx=(5, 0), sticky="w")
+
+        combo_margin_mode = ttk.Combobox(frame_margin, textvariable=self.margin_mode_var, state="readonly", width=28)
+        combo_margin_mode['values'] = [MARGIN_MODE_SIZE, MARGIN_MODE_SIMILARITY]
+        combo_margin_mode.grid(row=0, column=2, padx=(5, 0), sticky="w")
+
+        check_resources = ttk.Checkbutton(
+            frame_margin,
+            text="Compare decompressed resource content (RSC7)",
+            variable=self.compare_resources_var
+        )
+        check_resources.grid(row=0, column=3, padx=(20, 0), sticky="w")
+
+        check_lods = ttk.Checkbutton(
+            frame_margin,
+            text="LOD-aware (_hi without extra High LOD geometry)",
+            variable=self.lod_aware_var
+        )
+        check_lods.grid(row=0, column=4, padx=(20, 0), sticky="w")
+
+        frame_io = ttk.Frame(self.tab_yft, padding=(10, 0))
+        frame_io.pack(fill=tk.X)
+
+        check_low_impact = ttk.Checkbutton(
+            frame_io,
+            text="Low-impact I/O for live servers (lower priority, no page cache) - MB/s limit:",
+            variable=self.low_impact_var
+        )
+        check_low_impact.grid(row=0, column=0, sticky="w")
+
+        entry_io_limit = ttk.Entry(frame_io, textvariable=self.io_limit_mb_var, width=8)
+        entry_io_limit.grid(row=0, column=1, padx=(5, 0), sticky="w")
+
+        lbl_time_budget = ttk.Label(frame_io, text="Time budget (seconds, empty = no limit):")
+        lbl_time_budget.grid(row=0, column=2, padx=(20, 5), sticky="w")
+
+        entry_time_budget = ttk.Entry(frame_io, textvariable=self.time_budget_var, width=8)
+        entry_time_budget.grid(row=0, column=3, sticky="w")
+
+        frame_scan = ttk.Frame(self.tab_yft, padding=10)
+        frame_scan.pack(fill=tk.X)
+
+        btn_scan = ttk.Button(frame_scan, text="Start Scan", command=self.start_scan)
+        btn_scan.grid(row=0, column=0, sticky="w")
+
+        self.progress = ttk.Progressbar(frame_scan, orient="horizontal", length=500, mode="determinate")
+        self.progress.grid(row=0, column=1, padx=10, sticky="w")
+
+        self.lbl_progress = ttk.Label(frame_scan, text="Progress: 0/0")
+        self.lbl_progress.grid(row=0, column=2, sticky="w")
+
+        frame_select_all = ttk.Frame(self.tab_yft, padding=(10, 0))
+        frame_select_all.pack(fill=tk.X)
+        btn_select_all = ttk.Button(frame_select_all, text="Select All", command=self.select_all_yft)
+        btn_select_all.pack(side=tk.LEFT)
+        self.add_search_box(frame_select_all, lambda: self.yft_table)
+
+        frame_list = ttk.Frame(self.tab_yft, padding=10)
+        frame_list.pack(fill=tk.BOTH, expand=True)
+
+        scrollbar_yft = ttk.Scrollbar(frame_list, orient=tk.VERTICAL)
+        scrollbar_yft.pack(side=tk.RIGHT, fill=tk.Y)
+
+        columns = ("select", "model_name", "path", "size", "status")
+        self.tree = ttk.Treeview(frame_list, columns=columns, show="headings", selectmode="none")
+        self.tree.heading("select", text="Select", command=lambda: self.sort_tree("select"))
+        self.tree.heading("model_name", text="Model Name", command=lambda: self.sort_tree("model_name"))
+        self.tree.heading("path", text="File Path", command=lambda: self.sort_tree("path"))
+        self.tree.heading("size", text="Size (MB)", command=lambda: self.sort_tree("size"))
+        self.tree.heading("status", text="Oversize?", command=lambda: self.sort_tree("status"))
+
+        self.tree.column("select", width=80, anchor="center")
+        self.tree.column("model_name", width=200, anchor="w")
+        self.tree.column("path", width=400, anchor="w")
+        self.tree.column("size", width=150, anchor="center")
+        self.tree.column("status", width=200, anchor="center")
+
+        self.tree.configure(yscrollcommand=scrollbar_yft.set)
+        scrollbar_yft.config(command=self.tree.yview)
+
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.tree.bind('<Button-1>', self.handle_click_yft)
+        self.tree.bind('<Button-3>', self.show_yft_context_menu)
+
+        self.yft_table = ResultTable(
+            self.tree,
+            values_fn=self.yft_row_values,
+            tag_fn=lambda row: row.status.tag,
+            sort_keys={
+                "select": lambda row: row.selected,
+                "size": lambda row: row.size_bytes,
+                "status": lambda row: (row.status.severity, row.diff_bytes),
+            },
+            tag_colors={"ok": "lightgreen", "warning": "yellow", "critical": "red", "oversize": "orange"},
+            search_fn=lambda row, values: " ".join(values[1:] + (resource_name(row.path),)),
+        )
+
+        frame_actions = ttk.Frame(self.tab_yft, padding=10)
+        frame_actions.pack(fill=tk.X)
+        btn_copy = ttk.Button(frame_actions, text="Copy List to Clipboard", command=self.copy_to_clipboard_yft)
+        btn_copy.pack(side=tk.LEFT, padx=5)
+        btn_save = ttk.Button(frame_actions, text="Save List to File", command=self.save_to_file_yft)
+        btn_save.pack(side=tk.LEFT, padx=5)
+        btn_delete = ttk.Button(frame_actions, text="Delete Selected Files", command=self.delete_selected_files_yft)
+        btn_delete.pack(side=tk.LEFT, padx=5)
+
+    def setup_stream_tab(self):
+        frame_top = ttk.Frame(self.tab_stream, padding=10)
+        frame_top.pack(fill=tk.X)
+
+        lbl_dir = ttk.Label(frame_top, text="Stream Root Directory:")
+        lbl_dir.grid(row=0, column=0, sticky="w", padx=(0, 5))
+
+        entry_dir = ttk.Entry(frame_top, textvariable=self.stream_root_directory, width=60)
+        entry_dir.grid(row=0, column=1, sticky="w", padx=(0, 5))
+
+        btn_browse = ttk.Button(frame_top, text="Browse...", command=self.browse_stream_directory)
+        btn_browse.grid(row=0, column=2, sticky="w")
+
+        check_archives = ttk.Checkbutton(frame_top, text="Include .rpf archive contents", variable=self.include_archives_var)
+        check_archives.grid(row=0, column=3, padx=(20, 0), sticky="w")
+
+        lbl_listing = ttk.Label(frame_top, text="File Listing (optional):")
+        lbl_listing.grid(row=1, column=0, sticky="w", padx=(0, 5), pady=(5, 0))
+
+        entry_listing = ttk.Entry(frame_top, textvariable=self.listing_path_var, width=60)
+        entry_listing.grid(row=1, column=1, sticky="w", padx=(0, 5), pady=(5, 0))
+
+        btn_listing = ttk.Button(frame_top, text="Browse...", command=self.browse_listing)
+        btn_listing.grid(row=1, column=2, sticky="w", pady=(5, 0))
+
+        frame_base_game = ttk.Frame(frame_top)
+        frame_base_game.grid(row=1, column=3, padx=(20, 0), sticky="w", pady=(5, 0))
+        check_base_game = ttk.Checkbutton(frame_base_game, text="Flag base-game overrides", variable=self.base_game_var)
+        check_base_game.pack(side=tk.LEFT)
+        btn_base_game = ttk.Button(frame_base_game, text="Load Base-Game List...", command=self.load_base_game_list)
+        btn_base_game.pack(side=tk.LEFT, padx=(5, 0))
+
+        frame_scan = ttk.Frame(self.tab_stream, padding=10)
+        frame_scan.pack(fill=tk.X)
+
+        btn_scan_all = ttk.Button(frame_scan, text="Scan for Duplicates", command=self.start_stream_scan)
+        btn_scan_all.grid(row=0, column=0, sticky="w", padx=(0, 5))
+
+        self.stream_progress = ttk.Progressbar(frame_scan, orient="horizontal", length=400, mode="determinate")
+        self.stream_progress.grid(row=0, column=1, padx=10, sticky="w")
+
+        self.stream_lbl_progress = ttk.Label(frame_scan, text="Progress: 0/0")
+        self.stream_lbl_progress.grid(row=0, column=2, sticky="w")
+
+        check_refresh = ttk.Checkbutton(frame_scan, text="Rescan on startup", variable=self.refresh_on_open_var,
+                                        command=self.toggle_refresh_on_open)
+        check_refresh.grid(row=0, column=3, padx=(20, 0), sticky="w")
+
+        frame_select_all = ttk.Frame(self.tab_stream, padding=(10, 0))
+        frame_select_all.pack(fill=tk.X)
+        btn_select_all_stream = ttk.Button(frame_select_all, text="Select All", command=self.select_all_stream)
+        btn_select_all_stream.pack(side=tk.LEFT)
+        self.add_search_box(frame_select_all, lambda: self.stream_table)
+
+        frame_list = ttk.Frame(self.tab_stream, padding=10)
+        frame_list.pack(fill=tk.BOTH, expand=True)
+
+        scrollbar_stream = ttk.Scrollbar(frame_list, orient=tk.VERTICAL)
+        scrollbar_stream.pack(side=tk.RIGHT, fill=tk.Y)
+
+        stream_columns = ("select", "duplicate_file", "locations")
+        self.stream_tree = ttk.Treeview(frame_list, columns=stream_columns, show="headings", selectmode="none")
+        self.stream_tree.heading("select", text="Select", command=lambda: self.sort_stream_tree("select"))
+        self.stream_tree.heading("duplicate_file", text="Duplicate File Name", command=lambda: self.sort_stream_tree("duplicate_file"))
+        self.stream_tree.heading("locations", text="Locations", command=lambda: self.sort_stream_tree("locations"))
+
+        self.stream_tree.column("select", width=50, anchor="center")
+        self.stream_tree.column("duplicate_file", width=200, anchor="w")
+        self.stream_tree.column("locations", width=600, anchor="w")
+
+        self.stream_tree.configure(yscrollcommand=scrollbar_stream.set)
+        scrollbar_stream.config(command=self.stream_tree.yview)
+
+        self.stream_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.stream_tree.bind('<Button-1>', self.handle_click_stream)
+        self.stream_tree.bind('<Button-3>', self.show_stream_context_menu)
+
+        self.stream_table = ResultTable(
+            self.stream_tree,
+            values_fn=self.stream_row_values,
+            tag_fn=self.stream_row_tag,
+            sort_keys={
+                "select": lambda row: row.selected,
+            },
+            tag_colors={"critical_duplicate": "lightyellow", "duplicate": "lightcoral", "hash_collision": "plum",
+                        "base_game": "lightskyblue"},
+            search_fn=lambda row, values: " ".join(
+                values[1:] + (row.file_type,) + tuple(resource_name(loc) for loc in row.locations)
+            ),
+        )
+
+        frame_actions = ttk.Frame(self.tab_stream, padding=10)
+        frame_actions.pack(fill=tk.X)
+        btn_copy = ttk.Button(frame_actions, text="Copy Duplicates to Clipboard", command=self.copy_stream_to_clipboard)
+        btn_copy.pack(side=tk.LEFT, padx=5)
+        btn_save = ttk.Button(frame_actions, text="Save Duplicates to File", command=self.save_stream_to_file)
+        btn_save.pack(side=tk.LEFT, padx=5)
+
+        frame_manual = ttk.Frame(self.tab_stream, padding=10)
+        frame_manual.pack(fill=tk.BOTH, expand=True)
+
+        btn_manual_check = ttk.Button(frame_manual, text="Manually Check for Duplicates", command=self.check_manual_duplicates)
+        btn_manual_check.pack(anchor="e", pady=5)
+
+        self.txt_manual = tk.Text(frame_manual, height=10)
+        self.txt_manual.pack(fill=tk.BOTH, expand=True)
+
+    def setup_critical_tab(self):
+        """Setup the Critical Config Files tab"""
+        # Info label
+        frame_info = ttk.Frame(self.tab_critical, padding=10)
+        frame_info.pack(fill=tk.X)
+        
+        info_label = ttk.Label(frame_info, text="Config files (.ymt, .meta & water.xml) should only exist once across the server:", 
+                              font=('Calibri', 11, 'italic'))
+        info_label.pack(anchor='w')
+        
+        # Note about scanning location
+        note_label = ttk.Label(frame_info, 
+                              text="Note: This scans ALL directories (not just within 'stream' folders) to find duplicate files.", 
+                              font=('Calibri', 10, 'italic'), foreground='red')
+        note_label.pack(anchor='w', pady=(5, 0))
+        
+        # Directory selection
+        frame_top = ttk.Frame(self.tab_critical, padding=10)
+        frame_top.pack(fill=tk.X)
+
+        lbl_dir = ttk.Label(frame_top, text="Root Directory:")
+        lbl_dir.grid(row=0, column=0, sticky="w", padx=(0, 5))
+
+        # Use same directory variable as stream tab for consistency
+        entry_dir = ttk.Entry(frame_top, textvariable=self.stream_root_directory, width=60)
+        entry_dir.grid(row=0, column=1, sticky="w", padx=(0, 5))
+
+        btn_browse = ttk.Button(frame_top, text="Browse...", 
+                                command=self.browse_stream_directory)
+        btn_browse.grid(row=0, column=2, sticky="w")
+
+        # Shared with the stream tab
+        check_archives = ttk.Checkbutton(frame_top, text="Include .rpf archive contents", variable=self.include_archives_var)
+        check_archives.grid(row=0, column=3, padx=(20, 0), sticky="w")
+
+        lbl_listing = ttk.Label(frame_top, text="File Listing (optional):")
+        lbl_listing.grid(row=1, column=0, sticky="w", padx=(0, 5), pady=(5, 0))
+
+        entry_listing = ttk.Entry(frame_top, textvariable=self.listing_path_var, width=60)
+        entry_listing.grid(row=1, column=1, sticky="w", padx=(0, 5), pady=(5, 0))
+
+        btn_listing = ttk.Button(frame_top, text="Browse...", command=self.browse_listing)
+        btn_listing.grid(row=1, column=2, sticky="w", pady=(5, 0))
+
+        # Scan controls
+        frame_scan = ttk.Frame(self.tab_critical, padding=10)
+        frame_scan.pack(fill=tk.X)
+
+        btn_scan_critical = ttk.Button(frame_scan, text="Scan Critical Files", 
+                                       command=self.scan_critical_files)
+        btn_scan_critical.grid(row=0, column=0, sticky="w")
+
+        self.critical_progress = ttk.Progressbar(frame_scan, orient="horizontal", 
+                                                 length=400, mode="determinate")
+        self.critical_progress.grid(row=0, column=1, padx=10, sticky="w")
+
+        self.critical_lbl_progress = ttk.Label(frame_scan, text="Progress: 0/0")
+        self.critical_lbl_progress.grid(row=0, column=2, sticky="w")
+
+        # Filter controls
+        frame_filter = ttk.Frame(self.tab_critical, padding=(10, 5))
+        frame_filter.pack(fill=tk.X)
+        
+        lbl_filter = ttk.Label(frame_filter, text="Filter:")
+        lbl_filter.pack(side=tk.LEFT, padx=(0, 5))
+        
+        filter_combo = ttk.Combobox(frame_filter, textvariable=self.critical_filter_var, 
+                                    state="readonly", width=20)
+        filter_combo['values'] = ["All Files", "Conflicts Only"]
+        filter_combo.set("All Files")
+        filter_combo.pack(side=tk.LEFT)
+        filter_combo.bind("<<ComboboxSelected>>", self.filter_critical_view)
+        self.add_search_box(frame_filter, lambda: self.critical_table)
+
+        # TreeView for critical files
+        frame_list = ttk.Frame(self.tab_critical, padding=10)
+        frame_list.pack(fill=tk.BOTH, expand=True)
+
+        scrollbar_critical = ttk.Scrollbar(frame_list, orient=tk.VERTICAL)
+        scrollbar_critical.pack(side=tk.RIGHT, fill=tk.Y)
+
+        critical_columns = ("type", "file", "locations", "status")
+        self.critical_tree = ttk.Treeview(frame_list, columns=critical_columns, 
+                                          show="headings", selectmode="browse")
+        self.critical_tree.heading("type", text="File Type", command=lambda: self.critical_table.sort("type"))
+        self.critical_tree.heading("file", text="File Name", command=lambda: self.critical_table.sort("file"))
+        self.critical_tree.heading("locations", text="Locations", command=lambda: self.critical_table.sort("locations"))
+        self.critical_tree.heading("status", text="Status", command=lambda: self.critical_table.sort("status"))
+
+        self.critical_tree.column("type", width=150, anchor="w")
+        self.critical_tree.column("file", width=250, anchor="w")
+        self.critical_tree.column("locations", width=500, anchor="w")
+        self.critical_tree.column("status", width=200, anchor="center")
+
+        self.critical_tree.configure(yscrollcommand=scrollbar_critical.set)
+        scrollbar_critical.config(command=self.critical_tree.yview)
+
+        self.critical_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.critical_tree.bind('<Button-3>', self.show_critical_context_menu)
+
+        self.critical_table = ResultTable(
+            self.critical_tree,
+            values_fn=self.critical_row_values,
+            tag_fn=lambda row: ("conflict" if row.severity == "Critical" else "warning") if row.is_conflict else "ok",
+            sort_keys={
+                "status": lambda row: (not row.is_conflict, row.name),
+            },
+            tag_colors={"conflict": "lightcoral", "warning": "khaki", "ok": "lightgreen"},
+        )
+
+        # Action buttons
+        frame_actions = ttk.Frame(self.tab_critical, padding=10)
+        frame_actions.pack(fill=tk.X)
+        
+        btn_copy = ttk.Button(frame_actions, text="Copy Conflicts to Clipboard", 
+                             command=self.copy_critical_conflicts)
+        btn_copy.pack(side=tk.LEFT, padx=5)
+        
+        btn_save = ttk.Button(frame_actions, text="Save Conflicts Report", 
+                             command=self.save_critical_report)
+        btn_save.pack(side=tk.LEFT, padx=5)
+
+    def scan_critical_files(self):
+        """Scan for critical config files"""
+        if not self.prepare_stream_checker():
+            return
+
+        # Clear existing entries
+        self.critical_table.clear()
+
+        self.status.set("Scanning...")
+
+        progress = ScanProgress()
+        self.track_progress(progress, self.critical_progress, self.critical_lbl_progress)
+        threading.Thread(target=self.scan_critical_thread, args=(progress,), daemon=True).start()
+
+    def scan_critical_thread(self, progress):
+        """Background thread for scanning critical files"""
+        try:
+            # Scan for critical files (not restricted to stream folders)
+            client = self.serving_client()
+            if client:
+                critical_files = self.stream_checker.critical_conflicts = client.query("critical")
+            else:
+                critical_files = self.stream_checker.scan_critical_files(
+                    self.stream_root_directory.get(), progress, self.include_archives_var.get()
+                )
+            progress.finish("Scan Completed")
+            
+            # Populate the tree
+            self.populate_critical_tree()
+            stream_root = self.stream_root_directory.get()
+            self.save_snapshot(
+                "critical", stream_root,
+                self.snapshot_files((os.path.join(loc, name) for name, locs in critical_files.items() for loc in locs), stream_root),
+                critical_files,
+            )
+            
+            if critical_files:
+                conflicts = sum(1 for locs in critical_files.values() if len(locs) > 1)
+                total_files = len(critical_files)
+                if conflicts > 0:
+                    self.status.set(f"Scan Completed. - Found {total_files} critical files, {conflicts} have conflicts!")
+                else:
+                    self.status.set(f"Scan Completed. - Found {total_files} critical files, no conflicts.")
+            else:
+                self.status.set("No critical file conflicts found.")
+                
+        except Exception as e:
+            self.status.set(f"Error: {e}")
+        finally:
+            progress.finish(progress.phase)
+
+    def populate_critical_tree(self):
+        """Populate the critical files tree view"""
+        self.stream_root_dir = self.stream_root_directory.get()
+        rows = []
+        for filename, locations in self.stream_checker.critical_conflicts.items():
+            rule = self.stream_checker.critical_types.get(filename) or self.stream_checker.classifier.classify(filename)
+            if rule:
+                rows.append(CriticalFileResult(filename, list(locations), rule.category, rule.severity))
+            else:
+                rows.append(CriticalFileResult(filename, list(locations), CriticalClassifier.FALLBACK_CATEGORY))
+        self.critical_table.load(rows)
+        self.filter_critical_view()
+
+    def critical_row_values(self, row):
+        loc_str = '; '.join(self.relative_location(loc, self.stream_root_dir) for loc in row.locations)
+        return (row.file_type, row.name, loc_str, row.status_str)
+
+    def filter_critical_view(self, event=None):
+        """Filter the critical files view"""
+        if self.critical_filter_var.get() == "Conflicts Only":
+            self.critical_table.set_predicate(lambda row: row.is_conflict)
+        else:
+            self.critical_table.set_predicate(None)
+
+    def add_search_box(self, parent, get_table):
+        """
+        Add a search entry that filters the table returned by get_table as the user types.
+        Matches file names, paths, resources, types and statuses.
+        """
+        search_var = tk.StringVar()
+        pending = {}
+
+        def run_search():
+            pending.pop("job", None)
+            table = get_table()
+            table.search(search_var.get())
+            if search_var.get().strip():
+                self.status.set(f"Showing {len(table.tree.get_children())} of {table.total} results.")
+
+        def on_change(*_):
+            # Coalesce fast typing into one search once the user pauses.
+            if "job" in pending:
+                self.root.after_cancel(pending["job"])
+            pending["job"] = self.root.after(120, run_search)
+
+        search_var.trace_add("write", on_change)
+
+        entry_search = ttk.Entry(parent, textvariable=search_var, width=40)
+        entry_search.pack(side=tk.RIGHT)
+        lbl_search = ttk.Label(parent, text="Search:")
+        lbl_search.pack(side=tk.RIGHT, padx=(20, 5))
+        return search_var
+
+    def show_critical_context_menu(self, event):
+        """Show context menu for critical files"""
+        row_id = self.critical_tree.identify_row(event.y)
+        if row_id:
+            self.critical_tree.selection_set(row_id)
+            self.right_clicked_row = row_id
+            
+            # Clear and rebuild menu
+            self.critical_context_menu.delete(0, tk.END)
+            
+            row = self.critical_table.row(row_id)
+            filename = row.name
+            locations = row.locations
+            
+            # Add view folder options
+            for loc in locations:
+                full_path = os.path.join(loc, filename)
+                self.critical_context_menu.add_command(
+                    label=f"📁 {self.relative_location(loc, self.stream_root_dir)}",
+                    command=lambda path=full_path: self.open_folder_for_stream_file(path)
+                )
+                
+            # If conflict, add delete options
+            if len(locations) > 1:
+                self.critical_context_menu.add_separator()
+                for loc in locations:
+                    full_path = os.path.join(loc, filename)
+                    self.critical_context_menu.add_command(
+                        label=f"🗑️ Delete {self.relative_location(loc, self.stream_root_dir)}",
+                        command=lambda path=full_path: self.delete_critical_file(path)
+                    )
+                    
+            self.critical_context_menu.post(event.x_root, event.y_root)
+
+    def delete_critical_file(self, file_path):
+        """Delete a critical file with confirmation"""
+        filename = os.path.basename(file_path)
+        confirm = messagebox.askyesno(
+            "Confirm Deletion",
+            f"Delete critical config file: {filename}?\n\n"
+            f"⚠️ This file may be required for proper resource operation.\n"
+            f"Path: {file_path}"
+        )
+        if not confirm:
+            return
+            
+        try:
+            os.remove(file_path)
+            messagebox.showinfo("Success", f"Deleted: {filename}")
+            # Refresh the view
+            self.scan_critical_files()
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to delete {filename}:\n{e}")
+
+    def copy_critical_conflicts(self):
+        """Copy critical conflicts to clipboard"""
+        conflicts = []
+        for row in self.critical_table.rows():
+            if row.is_conflict:
+                file_type, filename, locations, _ = self.critical_row_values(row)
+                conflicts.append(f"{file_type}: {filename}\nLocations: {locations}\n")
+        
+        if conflicts:
+            try:
+                pyperclip.copy('\n'.join(conflicts))
+                messagebox.showinfo("Success", "Critical conflicts list copied to clipboard.")
+            except Exception as e:
+                messagebox.showerror("Error", f"Error: {e}")
+        else:
+            messagebox.showinfo("Info", "No critical file conflicts found.")
+
+    def save_critical_report(self):
+        """Save critical files report to file"""
+        rows = self.critical_table.rows()
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".txt",
+            filetypes=EXPORT_FILETYPES,
+            title="Save Conflicts Report"
+        )
+        
+        if not file_path:
+            return
+
+        def write_text(f):
+            f.write("Critical Config Files Report (.ymt/.meta/.xml)\n")
+            f.write("=" * 50 + "\n\n")
+
+            # Write conflicts first
+            f.write("CONFLICTS (Files with multiple instances):\n")
+            f.write("-" * 40 + "\n")
+            conflicts_found = False
+
+            for row in rows:
+                if row.is_conflict:
+                    conflicts_found = True
+                    f.write(f"\n{row.file_type}: {row.name}\nLocations:\n")
+                    for loc in row.locations:
+                        f.write(f"  - {self.relative_location(loc, self.stream_root_dir)}\n")
+
+            if not conflicts_found:
+                f.write("No conflicts found.\n")
+
+            # Write OK files
+            f.write("\n\nOK FILES (Single instances):\n")
+            f.write("-" * 40 + "\n")
+
+            for row in rows:
+                if not row.is_conflict:
+                    locations = '; '.join(self.relative_location(loc, self.stream_root_dir) for loc in row.locations)
+                    f.write(f"{row.file_type}: {row.name} -> {locations}\n")
+
+        try:
+            self.export_rows(
+                rows, file_path, CriticalFileResult.EXPORT_FIELDS, self.stream_root_dir,
+                "Critical Config Files Report", write_text,
+                row_class=lambda record: "conflict" if record["conflict"] else "ok",
+            )
+            messagebox.showinfo("Success", f"Critical conflicts report saved to {file_path}.")
+        except Exception as e:
+            messagebox.showerror("Error", f"Error: {e}")
+
+    def export_rows(self, rows, file_path, fields, root_dir, title, write_text, row_class=None):
+        """
+        Write rows to file_path as plain text via write_text(f), or as CSV/NDJSON/HTML
+        streamed from the result model, depending on the file extension.
+        """
+        fmt = ReportExporter.format_for(file_path)
+        if fmt == 'text':
+            with open(file_path, 'w', encoding='utf-8', buffering=ReportExporter.BUFFER_SIZE) as f:
+                write_text(f)
+            return
+        exporter = ReportExporter(fields, title, row_class=row_class)
+        exporter.export((row.to_record(root_dir) for row in rows), file_path, fmt)
+
+    def setup_textures_tab(self):
+        """Setup the Shared Textures tab"""
+        frame_info = ttk.Frame(self.tab_textures, padding=10)
+        frame_info.pack(fill=tk.X)
+
+        info_label = ttk.Label(frame_info, text="Finds identical textures embedded in several .ytd/.ydr/.yft files and the memory the extra copies waste:",
+                               font=('Calibri', 11, 'italic'))
+        info_label.pack(anchor='w')
+
+        frame_top = ttk.Frame(self.tab_textures, padding=10)
+        frame_top.pack(fill=tk.X)
+
+        lbl_dir = ttk.Label(frame_top, text="Root Directory:")
+        lbl_dir.grid(row=0, column=0, sticky="w", padx=(0, 5))
+
+        entry_dir = ttk.Entry(frame_top, textvariable=self.stream_root_directory, width=60)
+        entry_dir.grid(row=0, column=1, sticky="w", padx=(0, 5))
+
+        btn_browse = ttk.Button(frame_top, text="Browse...", command=self.browse_stream_directory)
+        btn_browse.grid(row=0, column=2, sticky="w")
+
+        frame_scan = ttk.Frame(self.tab_textures, padding=10)
         frame_scan.pack(fill=tk.X)
 
-        btn_scan = ttk.Button(frame_scan, text="Start Scan", command=self.start_scan)
+        btn_scan = ttk.Button(frame_scan, text="Scan Textures", command=self.start_texture_scan)
         btn_scan.grid(row=0, column=0, sticky="w")
 
-        self.progress = ttk.Progressbar(frame_scan, orient="horizontal", length=500, mode="determinate")
-        self.progress.grid(row=0, column=1, padx=10, sticky="w")
+        self.texture_progress = ttk.Progressbar(frame_scan, orient="horizontal", length=400, mode="determinate")
+        self.texture_progress.grid(row=0, column=1, padx=10, sticky="w")
 
-        self.lbl_progress = ttk.Label(frame_scan, text="Progress: 0/0")
-        self.lbl_progress.grid(row=0, column=2, sticky="w")
+        self.texture_lbl_progress = ttk.Label(frame_scan, text="Progress: 0/0")
+        self.texture_lbl_progress.grid(row=0, column=2, sticky="w")
 
-        frame_select_all = ttk.Frame(self.tab_yft, padding=(10, 0))
-        frame_select_all.pack(fill=tk.X)
-        btn_select_all = ttk.Button(frame_select_all, text="Select All", command=self.select_all_yft)
-        btn_select_all.pack(anchor='w')
+        frame_search = ttk.Frame(self.tab_textures, padding=(10, 0))
+        frame_search.pack(fill=tk.X)
+        self.add_search_box(frame_search, lambda: self.texture_table)
 
-        frame_list = ttk.Frame(self.tab_yft, padding=10)
+        frame_list = ttk.Frame(self.tab_textures, padding=10)
         frame_list.pack(fill=tk.BOTH, expand=True)
 
-        scrollbar_yft = ttk.Scrollbar(frame_list, orient=tk.VERTICAL)
-        scrollbar_yft.pack(side=tk.RIGHT, fill=tk.Y)
+        scrollbar_textures = ttk.Scrollbar(frame_list, orient=tk.VERTICAL)
+        scrollbar_textures.pack(side=tk.RIGHT, fill=tk.Y)
+
+        texture_columns = ("names", "dimensions", "copies", "wasted", "files")
+        self.texture_tree = ttk.Treeview(frame_list, columns=texture_columns, show="headings", selectmode="browse")
+        self.texture_tree.heading("names", text="Texture", command=lambda: self.texture_table.sort("names"))
+        self.texture_tree.heading("dimensions", text="Size / Format", command=lambda: self.texture_table.sort("dimensions"))
+        self.texture_tree.heading("copies", text="Copies", command=lambda: self.texture_table.sort("copies"))
+        self.texture_tree.heading("wasted", text="Wasted (MB)", command=lambda: self.texture_table.sort("wasted"))
+        self.texture_tree.heading("files", text="Found In", command=lambda: self.texture_table.sort("files"))
+
+        self.texture_tree.column("names", width=200, anchor="w")
+        self.texture_tree.column("dimensions", width=150, anchor="center")
+        self.texture_tree.column("copies", width=70, anchor="center")
+        self.texture_tree.column("wasted", width=100, anchor="center")
+        self.texture_tree.column("files", width=600, anchor="w")
+
+        self.texture_tree.configure(yscrollcommand=scrollbar_textures.set)
+        scrollbar_textures.config(command=self.texture_tree.yview)
+        self.texture_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.texture_table = ResultTable(
+            self.texture_tree,
+            values_fn=self.texture_row_values,
+            sort_keys={
+                "dimensions": lambda row: (row.width * row.height, row.fmt),
+                "copies": lambda row: row.copies,
+                "wasted": lambda row: row.wasted_bytes,
+            },
+        )
 
-        columns = ("select", "model_name", "path", "size", "status")
-        self.tree = ttk.Treeview(frame_list, columns=columns, show="headings", selectmode="none")
-        self.tree.heading("select", text="Select", command=lambda: self.sort_tree("select"))
-        self.tree.heading("model_name", text="Model Name", command=lambda: self.sort_tree("model_name"))
-        self.tree.heading("path", text="File Path", command=lambda: self.sort_tree("path"))
-        self.tree.heading("size", text="Size (MB)", command=lambda: self.sort_tree("size"))
-        self.tree.heading("status", text="Oversize?", command=lambda: self.sort_tree("status"))
+        frame_actions = ttk.Frame(self.tab_textures, padding=10)
+        frame_actions.pack(fill=tk.X)
+        btn_save = ttk.Button(frame_actions, text="Save Shared Textures Report", command=self.save_texture_report)
+        btn_save.pack(side=tk.LEFT, padx=5)
 
-        self.tree.column("select", width=80, anchor="center")
-        self.tree.column("model_name", width=200, anchor="w")
-        self.tree.column("path", width=400, anchor="w")
-        self.tree.column("size", width=150, anchor="center")
-        self.tree.column("status", width=200, anchor="center")
+    def texture_row_values(self, row):
+        files = '; '.join(
+            f"{self.relative_location(path, self.stream_root_dir)} ({name})" for path, name in row.occurrences
+        )
+        return (
+            ', '.join(row.names),
+            f"{row.width}x{row.height} {texture_format_name(row.fmt)}",
+            row.copies,
+            f"{row.wasted_bytes / MB:.2f}",
+            files,
+        )
 
-        self.tree.configure(yscrollcommand=scrollbar_yft.set)
-        scrollbar_yft.config(command=self.tree.yview)
+    def start_texture_scan(self):
+        if not self.stream_root_directory.get():
+            messagebox.showwarning("Warning", "No directory selected.")
+            return
+        if not os.path.isdir(self.stream_root_directory.get()):
+            messagebox.showerror("Error", "No directory or invalid path selected.")
+            return
 
-        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        self.tree.bind('<Button-1>', self.handle_click_yft)
-        self.tree.bind('<Button-3>', self.show_yft_context_menu)
+        self.texture_table.clear()
+        self.status.set("Scanning textures...")
 
-        frame_actions = ttk.Frame(self.tab_yft, padding=10)
+        progress = ScanProgress()
+        self.track_progress(progress, self.texture_progress, self.texture_lbl_progress)
+        threading.Thread(target=self.scan_textures_thread, args=(progress,), daemon=True).start()
+
+    def scan_textures_thread(self, progress):
+        try:
+            stream_root = self.stream_root_directory.get()
+            shared = TextureDeduplicator().scan(stream_root, progress=progress)
+            progress.finish("Scan Completed")
+            self.stream_root_dir = stream_root
+            self.texture_table.load(shared)
+            wasted = sum(t.wasted_bytes for t in shared) / MB
+            self.status.set(f"Scan Completed. - {len(shared)} shared textures wasting {wasted:.2f} MB.")
+        except Exception as e:
+            self.status.set(f"Error: {e}")
+        finally:
+            progress.finish(progress.phase)
+
+    def save_texture_report(self):
+        rows = self.texture_table.rows()
+        if not rows:
+            messagebox.showinfo("Info", "No shared textures found.")
+            return
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".txt",
+            filetypes=EXPORT_FILETYPES,
+            title="Save Shared Textures Report"
+        )
+        if file_path:
+
+            def write_text(f):
+                for row in rows:
+                    values = self.texture_row_values(row)
+                    f.write(f"{values[0]} [{values[1]}] - {row.copies} copies, {values[3]} MB wasted:\n")
+                    for path, name in row.occurrences:
+                        f.write(f"  {path} ({name})\n")
+                    f.write("\n")
+
+            try:
+                self.export_rows(rows, file_path, SharedTexture.EXPORT_FIELDS, self.stream_root_dir,
+                                 "Shared Textures Report", write_text)
+                messagebox.showinfo("Success", f"Shared textures report saved to {file_path}.")
+            except Exception as e:
+                messagebox.showerror("Error", f"Error: {e}")
+
+    def setup_archetypes_tab(self):
+        """Setup the Archetype Collisions tab"""
+        frame_info = ttk.Frame(self.tab_archetypes, padding=10)
+        frame_info.pack(fill=tk.X)
+
+        info_label = ttk.Label(frame_info, text="Archetype names defined by more than one .ytyp file (binary or XML) - only one definition will be used in game:",
+                               font=('Calibri', 11, 'italic'))
+        info_label.pack(anchor='w')
+
+        frame_top = ttk.Frame(self.tab_archetypes, padding=10)
+        frame_top.pack(fill=tk.X)
+
+        lbl_dir = ttk.Label(frame_top, text="Root Directory:")
+        lbl_dir.grid(row=0, column=0, sticky="w", padx=(0, 5))
+
+        entry_dir = ttk.Entry(frame_top, textvariable=self.stream_root_directory, width=60)
+        entry_dir.grid(row=0, column=1, sticky="w", padx=(0, 5))
+
+        btn_browse = ttk.Button(frame_top, text="Browse...", command=self.browse_stream_directory)
+        btn_browse.grid(row=0, column=2, sticky="w")
+
+        frame_scan = ttk.Frame(self.tab_archetypes, padding=10)
+        frame_scan.pack(fill=tk.X)
+
+        btn_scan = ttk.Button(frame_scan, text="Scan Archetypes", command=self.start_archetype_scan)
+        btn_scan.grid(row=0, column=0, sticky="w")
+
+        self.archetype_progress = ttk.Progressbar(frame_scan, orient="horizontal", length=400, mode="determinate")
+        self.archetype_progress.grid(row=0, column=1, padx=10, sticky="w")
+
+        self.archetype_lbl_progress = ttk.Label(frame_scan, text="Progress: 0/0")
+        self.archetype_lbl_progress.grid(row=0, column=2, sticky="w")
+
+        frame_search = ttk.Frame(self.tab_archetypes, padding=(10, 0))
+        frame_search.pack(fill=tk.X)
+        self.add_search_box(frame_search, lambda: self.archetype_table)
+
+        frame_list = ttk.Frame(self.tab_archetypes, padding=10)
+        frame_list.pack(fill=tk.BOTH, expand=True)
+
+        scrollbar_archetypes = ttk.Scrollbar(frame_list, orient=tk.VERTICAL)
+        scrollbar_archetypes.pack(side=tk.RIGHT, fill=tk.Y)
+
+        archetype_columns = ("name", "count", "resources", "files")
+        self.archetype_tree = ttk.Treeview(frame_list, columns=archetype_columns, show="headings", selectmode="browse")
+        self.archetype_tree.heading("name", text="Archetype", command=lambda: self.archetype_table.sort("name"))
+        self.archetype_tree.heading("count", text="Definitions", command=lambda: self.archetype_table.sort("count"))
+        self.archetype_tree.heading("resources", text="Resources", command=lambda: self.archetype_table.sort("resources"))
+        self.archetype_tree.heading("files", text="Defined In", command=lambda: self.archetype_table.sort("files"))
+
+        self.archetype_tree.column("name", width=200, anchor="w")
+        self.archetype_tree.column("count", width=90, anchor="center")
+        self.archetype_tree.column("resources", width=250, anchor="w")
+        self.archetype_tree.column("files", width=600, anchor="w")
+
+        self.archetype_tree.configure(yscrollcommand=scrollbar_archetypes.set)
+        scrollbar_archetypes.config(command=self.archetype_tree.yview)
+        self.archetype_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.archetype_table = ResultTable(
+            self.archetype_tree,
+            values_fn=self.archetype_row_values,
+            tag_fn=lambda row: "conflict" if row.cross_resource else "ok",
+            sort_keys={"count": lambda row: len(row.files)},
+            tag_colors={"conflict": "lightcoral", "ok": "khaki"},
+        )
+
+        frame_actions = ttk.Frame(self.tab_archetypes, padding=10)
         frame_actions.pack(fill=tk.X)
-        btn_copy = ttk.Button(frame_actions, text="Copy List to Clipboard", command=self.copy_to_clipboard_yft)
-        btn_copy.pack(side=tk.LEFT, padx=5)
-        btn_save = ttk.Button(frame_actions, text="Save List to File", command=self.save_to_file_yft)
+        btn_save = ttk.Button(frame_actions, text="Save Archetype Report", command=self.save_archetype_report)
         btn_save.pack(side=tk.LEFT, padx=5)
-        btn_delete = ttk.Button(frame_actions, text="Delete Selected Files", command=self.delete_selected_files_yft)
-        btn_delete.pack(side=tk.LEFT, padx=5)
 
-    def setup_stream_tab(self):
-        frame_top = ttk.Frame(self.tab_stream, padding=10)
+    def archetype_row_values(self, row):
+        return (
+            row.display_name,
+            len(row.files),
+            ', '.join(row.resources),
+            '; '.join(self.relative_location(path, self.stream_root_dir) for path in row.files),
+        )
+
+    def start_archetype_scan(self):
+        if not self.stream_root_directory.get():
+            messagebox.showwarning("Warning", "No directory selected.")
+            return
+        if not os.path.isdir(self.stream_root_directory.get()):
+            messagebox.showerror("Error", "No directory or invalid path selected.")
+            return
+
+        self.archetype_table.clear()
+        self.status.set("Scanning archetypes...")
+
+        progress = ScanProgress()
+        self.track_progress(progress, self.archetype_progress, self.archetype_lbl_progress)
+        threading.Thread(target=self.scan_archetypes_thread, args=(progress,), daemon=True).start()
+
+    def scan_archetypes_thread(self, progress):
+        try:
+            stream_root = self.stream_root_directory.get()
+            collisions = ArchetypeIndexer().scan(stream_root, progress=progress)
+            progress.finish("Scan Completed")
+            self.stream_root_dir = stream_root
+            self.archetype_table.load(collisions)
+            cross = sum(1 for c in collisions if c.cross_resource)
+            self.status.set(f"Scan Completed. - {len(collisions)} archetype collisions, {cross} across resources.")
+        except Exception as e:
+            self.status.set(f"Error: {e}")
+        finally:
+            progress.finish(progress.phase)
+
+    def save_archetype_report(self):
+        rows = self.archetype_table.rows()
+        if not rows:
+            messagebox.showinfo("Info", "No archetype collisions found.")
+            return
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".txt",
+            filetypes=EXPORT_FILETYPES,
+            title="Save Archetype Report"
+        )
+        if file_path:
+
+            def write_text(f):
+                for row in rows:
+                    f.write(f"{row.display_name} (hash_{row.name_hash:08X}) - {len(row.files)} definitions:\n")
+                    for path in row.files:
+                        f.write(f"  {path}\n")
+                    f.write("\n")
+
+            try:
+                self.export_rows(rows, file_path, ArchetypeCollision.EXPORT_FIELDS, self.stream_root_dir,
+                                 "Archetype Collisions Report", write_text)
+                messagebox.showinfo("Success", f"Archetype report saved to {file_path}.")
+            except Exception as e:
+                messagebox.showerror("Error", f"Error: {e}")
+
+    def setup_orphans_tab(self):
+        """Setup the Orphaned Assets tab"""
+        frame_info = ttk.Frame(self.tab_orphans, padding=10)
+        frame_info.pack(fill=tk.X)
+
+        info_label = ttk.Label(frame_info, text="Models and texture dictionaries in stream folders that no .ytyp, .ymap or .meta file references (review before deleting - scripts can still load them by name):",
+                               font=('Calibri', 11, 'italic'))
+        info_label.pack(anchor='w')
+
+        frame_top = ttk.Frame(self.tab_orphans, padding=10)
         frame_top.pack(fill=tk.X)
 
-        lbl_dir = ttk.Label(frame_top, text="Stream Root Directory:")
+        lbl_dir = ttk.Label(frame_top, text="Root Directory:")
         lbl_dir.grid(row=0, column=0, sticky="w", padx=(0, 5))
 
-        entry_dir = ttk.Entry(frame_top, textvariable=self.stream_root_directory, width=60)
-        entry_dir.grid(row=0, column=1, sticky="w", padx=(0, 5))
+        entry_dir = ttk.Entry(frame_top, textvariable=self.stream_root_directory, width=60)
+        entry_dir.grid(row=0, column=1, sticky="w", padx=(0, 5))
+
+        btn_browse = ttk.Button(frame_top, text="Browse...", command=self.browse_stream_directory)
+        btn_browse.grid(row=0, column=2, sticky="w")
+
+        frame_scan = ttk.Frame(self.tab_orphans, padding=10)
+        frame_scan.pack(fill=tk.X)
+
+        btn_scan = ttk.Button(frame_scan, text="Find Orphaned Assets", command=self.start_orphan_scan)
+        btn_scan.grid(row=0, column=0, sticky="w")
+
+        self.orphan_progress = ttk.Progressbar(frame_scan, orient="horizontal", length=400, mode="determinate")
+        self.orphan_progress.grid(row=0, column=1, padx=10, sticky="w")
+
+        self.orphan_lbl_progress = ttk.Label(frame_scan, text="Progress: 0/0")
+        self.orphan_lbl_progress.grid(row=0, column=2, sticky="w")
+
+        frame_search = ttk.Frame(self.tab_orphans, padding=(10, 0))
+        frame_search.pack(fill=tk.X)
+        self.add_search_box(frame_search, lambda: self.orphan_table)
+
+        frame_list = ttk.Frame(self.tab_orphans, padding=10)
+        frame_list.pack(fill=tk.BOTH, expand=True)
+
+        scrollbar_orphans = ttk.Scrollbar(frame_list, orient=tk.VERTICAL)
+        scrollbar_orphans.pack(side=tk.RIGHT, fill=tk.Y)
+
+        orphan_columns = ("name", "resource", "size", "path")
+        self.orphan_tree = ttk.Treeview(frame_list, columns=orphan_columns, show="headings", selectmode="browse")
+        self.orphan_tree.heading("name", text="File", command=lambda: self.orphan_table.sort("name"))
+        self.orphan_tree.heading("resource", text="Resource", command=lambda: self.orphan_table.sort("resource"))
+        self.orphan_tree.heading("size", text="Size", command=lambda: self.orphan_table.sort("size"))
+        self.orphan_tree.heading("path", text="Path", command=lambda: self.orphan_table.sort("path"))
+
+        self.orphan_tree.column("name", width=250, anchor="w")
+        self.orphan_tree.column("resource", width=200, anchor="w")
+        self.orphan_tree.column("size", width=100, anchor="e")
+        self.orphan_tree.column("path", width=600, anchor="w")
+
+        self.orphan_tree.configure(yscrollcommand=scrollbar_orphans.set)
+        scrollbar_orphans.config(command=self.orphan_tree.yview)
+        self.orphan_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.orphan_table = ResultTable(
+            self.orphan_tree,
+            values_fn=self.orphan_row_values,
+            tag_fn=lambda row: row.extension.lstrip('.'),
+            sort_keys={"size": lambda row: row.size_bytes},
+            tag_colors={"ydr": "lightblue", "yft": "lightyellow", "ytd": "khaki"},
+        )
+
+        frame_actions = ttk.Frame(self.tab_orphans, padding=10)
+        frame_actions.pack(fill=tk.X)
+        btn_save = ttk.Button(frame_actions, text="Save Orphan Report", command=self.save_orphan_report)
+        btn_save.pack(side=tk.LEFT, padx=5)
+
+    def orphan_row_values(self, row):
+        return (
+            row.name,
+            resource_name(row.path),
+            f"{row.size_bytes / MB:.2f} MB",
+            self.relative_location(os.path.dirname(row.path), self.stream_root_dir),
+        )
+
+    def start_orphan_scan(self):
+        if not self.stream_root_directory.get():
+            messagebox.showwarning("Warning", "No directory selected.")
+            return
+        if not os.path.isdir(self.stream_root_directory.get()):
+            messagebox.showerror("Error", "No directory or invalid path selected.")
+            return
+
+        self.orphan_table.clear()
+        self.status.set("Scanning references...")
+
+        progress = ScanProgress()
+        self.track_progress(progress, self.orphan_progress, self.orphan_lbl_progress)
+        threading.Thread(target=self.scan_orphans_thread, args=(progress,), daemon=True).start()
+
+    def scan_orphans_thread(self, progress):
+        try:
+            stream_root = self.stream_root_directory.get()
+            orphans = DependencyAnalyzer().scan(stream_root, progress=progress)
+            progress.finish("Scan Completed")
+            self.stream_root_dir = stream_root
+            self.orphan_table.load(orphans)
+            total = sum(o.size_bytes for o in orphans)
+            self.status.set(f"Scan Completed. - {len(orphans)} unreferenced assets, {total / MB:.2f} MB.")
+        except Exception as e:
+            self.status.set(f"Error: {e}")
+        finally:
+            progress.finish(progress.phase)
+
+    def save_orphan_report(self):
+        rows = self.orphan_table.rows()
+        if not rows:
+            messagebox.showinfo("Info", "No orphaned assets found.")
+            return
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".txt",
+            filetypes=EXPORT_FILETYPES,
+            title="Save Orphan Report"
+        )
+        if file_path:
+
+            def write_text(f):
+                for row in rows:
+                    f.write(f"{row.size_bytes}\t{row.path}\n")
+
+            try:
+                self.export_rows(rows, file_path, OrphanAsset.EXPORT_FIELDS, self.stream_root_dir,
+                                 "Orphaned Assets Report", write_text)
+                messagebox.showinfo("Success", f"Orphan report saved to {file_path}.")
+            except Exception as e:
+                messagebox.showerror("Error", f"Error: {e}")
+
+    def setup_cleanup_tab(self):
+        """Setup the Cleanup Plan tab"""
+        frame_info = ttk.Frame(self.tab_cleanup, padding=10)
+        frame_info.pack(fill=tk.X)
+
+        info_label = ttk.Label(frame_info, text="Deletions from the last YFT and Stream scans, largest savings first. Only files with an identical copy left in place are planned:",
+                               font=('Calibri', 11, 'italic'))
+        info_label.pack(anchor='w')
+
+        frame_top = ttk.Frame(self.tab_cleanup, padding=10)
+        frame_top.pack(fill=tk.X)
+
+        lbl_target = ttk.Label(frame_top, text="Target Saving (MB, empty = all):")
+        lbl_target.grid(row=0, column=0, sticky="w", padx=(0, 5))
+
+        entry_target = ttk.Entry(frame_top, textvariable=self.cleanup_target_var, width=10)
+        entry_target.grid(row=0, column=1, sticky="w", padx=(0, 15))
 
-        btn_browse = ttk.Button(frame_top, text="Browse...", command=self.browse_stream_directory)
-        btn_browse.grid(row=0, column=2, sticky="w")
+        lbl_metric = ttk.Label(frame_top, text="Rank By:")
+        lbl_metric.grid(row=0, column=2, sticky="w", padx=(0, 5))
 
-        frame_scan = ttk.Frame(self.tab_stream, padding=10)
+        combo_metric = ttk.Combobox(frame_top, textvariable=self.cleanup_metric_var,
+                                    values=list(CLEANUP_METRICS.values()), state="readonly", width=18)
+        combo_metric.grid(row=0, column=3, sticky="w")
+
+        frame_scan = ttk.Frame(self.tab_cleanup, padding=10)
         frame_scan.pack(fill=tk.X)
 
-        btn_scan_all = ttk.Button(frame_scan, text="Scan for Duplicates", command=self.start_stream_scan)
-        btn_scan_all.grid(row=0, column=0, sticky="w", padx=(0, 5))
+        btn_plan = ttk.Button(frame_scan, text="Build Plan", command=self.start_cleanup_plan)
+        btn_plan.grid(row=0, column=0, sticky="w")
 
-        self.stream_progress = ttk.Progressbar(frame_scan, orient="horizontal", length=400, mode="determinate")
-        self.stream_progress.grid(row=0, column=1, padx=10, sticky="w")
+        self.cleanup_progress = ttk.Progressbar(frame_scan, orient="horizontal", length=400, mode="determinate")
+        self.cleanup_progress.grid(row=0, column=1, padx=10, sticky="w")
 
-        self.stream_lbl_progress = ttk.Label(frame_scan, text="Progress: 0/0")
-        self.stream_lbl_progress.grid(row=0, column=2, sticky="w")
+        self.cleanup_lbl_progress = ttk.Label(frame_scan, text="Progress: 0/0")
+        self.cleanup_lbl_progress.grid(row=0, column=2, sticky="w")
 
-        frame_select_all = ttk.Frame(self.tab_stream, padding=(10, 0))
-        frame_select_all.pack(fill=tk.X)
-        btn_select_all_stream = ttk.Button(frame_select_all, text="Select All", command=self.select_all_stream)
-        btn_select_all_stream.pack(anchor='w')
+        frame_search = ttk.Frame(self.tab_cleanup, padding=(10, 0))
+        frame_search.pack(fill=tk.X)
+        self.add_search_box(frame_search, lambda: self.cleanup_table)
 
-        frame_list = ttk.Frame(self.tab_stream, padding=10)
+        frame_list = ttk.Frame(self.tab_cleanup, padding=10)
         frame_list.pack(fill=tk.BOTH, expand=True)
 
-        scrollbar_stream = ttk.Scrollbar(frame_list, orient=tk.VERTICAL)
-        scrollbar_stream.pack(side=tk.RIGHT, fill=tk.Y)
+        scrollbar_cleanup = ttk.Scrollbar(frame_list, orient=tk.VERTICAL)
+        scrollbar_cleanup.pack(side=tk.RIGHT, fill=tk.Y)
+
+        cleanup_columns = ("kind", "name", "disk", "memory", "cumulative", "status", "path")
+        self.cleanup_tree = ttk.Treeview(frame_list, columns=cleanup_columns, show="headings", selectmode="browse")
+        self.cleanup_tree.heading("kind", text="Action", command=lambda: self.cleanup_table.sort("kind"))
+        self.cleanup_tree.heading("name", text="File", command=lambda: self.cleanup_table.sort("name"))
+        self.cleanup_tree.heading("disk", text="Disk Saved", command=lambda: self.cleanup_table.sort("disk"))
+        self.cleanup_tree.heading("memory", text="Streaming Memory", command=lambda: self.cleanup_table.sort("memory"))
+        self.cleanup_tree.heading("cumulative", text="Cumulative", command=lambda: self.cleanup_table.sort("cumulative"))
+        self.cleanup_tree.heading("status", text="Status", command=lambda: self.cleanup_table.sort("status"))
+        self.cleanup_tree.heading("path", text="Path", command=lambda: self.cleanup_table.sort("path"))
+
+        self.cleanup_tree.column("kind", width=120, anchor="w")
+        self.cleanup_tree.column("name", width=200, anchor="w")
+        self.cleanup_tree.column("disk", width=100, anchor="e")
+        self.cleanup_tree.column("memory", width=120, anchor="e")
+        self.cleanup_tree.column("cumulative", width=100, anchor="e")
+        self.cleanup_tree.column("status", width=150, anchor="w")
+        self.cleanup_tree.column("path", width=450, anchor="w")
+
+        self.cleanup_tree.configure(yscrollcommand=scrollbar_cleanup.set)
+        scrollbar_cleanup.config(command=self.cleanup_tree.yview)
+        self.cleanup_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.cleanup_table = ResultTable(
+            self.cleanup_tree,
+            values_fn=self.cleanup_row_values,
+            tag_fn=lambda row: "skipped" if row.status.startswith("Skipped") else (
+                "hi" if row.kind == CleanupPlanner.KIND_HI else "stream"),
+            sort_keys={
+                "disk": lambda row: row.disk_bytes,
+                "memory": lambda row: row.memory_bytes,
+                "cumulative": lambda row: row.cumulative_bytes,
+            },
+            tag_colors={"hi": "lightgreen", "stream": "lightblue", "skipped": "lightgray"},
+        )
 
-        stream_columns = ("select", "duplicate_file", "locations")
-        self.stream_tree = ttk.Treeview(frame_list, columns=stream_columns, show="headings", selectmode="none")
-        self.stream_tree.heading("select", text="Select", command=lambda: self.sort_stream_tree("select"))
-        self.stream_tree.heading("duplicate_file", text="Duplicate File Name", command=lambda: self.sort_stream_tree("duplicate_file"))
-        self.stream_tree.heading("locations", text="Locations", command=lambda: self.sort_stream_tree("locations"))
+        frame_actions = ttk.Frame(self.tab_cleanup, padding=10)
+        frame_actions.pack(fill=tk.X)
+        btn_delete = ttk.Button(frame_actions, text="Delete Planned Files", command=self.delete_planned_files)
+        btn_delete.pack(side=tk.LEFT, padx=5)
+        btn_save = ttk.Button(frame_actions, text="Save Cleanup Plan", command=self.save_cleanup_plan)
+        btn_save.pack(side=tk.LEFT, padx=5)
 
-        self.stream_tree.column("select", width=50, anchor="center")
-        self.stream_tree.column("duplicate_file", width=200, anchor="w")
-        self.stream_tree.column("locations", width=600, anchor="w")
+    def cleanup_root(self):
+        return self.stream_root_dir or self.yft_root_dir
+
+    def cleanup_row_values(self, row):
+        return (
+            row.kind,
+            row.name,
+            f"{row.disk_bytes / MB:.2f} MB",
+            f"{row.memory_bytes / MB:.2f} MB",
+            f"{row.cumulative_bytes / MB:.2f} MB",
+            row.status,
+            self.relative_location(os.path.dirname(row.path), self.cleanup_root()),
+        )
 
-        self.stream_tree.configure(yscrollcommand=scrollbar_stream.set)
-        scrollbar_stream.config(command=self.stream_tree.yview)
+    def start_cleanup_plan(self):
+        yft_results = self.yft_cleaner.deletable_files if self.yft_cleaner else []
+        has_stream = bool(self.stream_checker and self.stream_checker.duplicate_files)
+        if not yft_results and not has_stream:
+            messagebox.showinfo("Info", "Run the Duplicate YFT or Stream Duplicate scan first.")
+            return
+        target = self.cleanup_target_var.get().strip()
+        try:
+            target_bytes = int(float(target) * MB) if target else None
+        except ValueError:
+            messagebox.showerror("Error", "Target saving must be a number of MB.")
+            return
+        metric = next(key for key, label in CLEANUP_METRICS.items() if label == self.cleanup_metric_var.get())
 
-        self.stream_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        self.stream_tree.bind('<Button-1>', self.handle_click_stream)
-        self.stream_tree.bind('<Button-3>', self.show_stream_context_menu)
+        self.cleanup_table.clear()
+        self.status.set("Planning cleanup...")
 
-        frame_actions = ttk.Frame(self.tab_stream, padding=10)
-        frame_actions.pack(fill=tk.X)
-        btn_copy = ttk.Button(frame_actions, text="Copy Duplicates to Clipboard", command=self.copy_stream_to_clipboard)
-        btn_copy.pack(side=tk.LEFT, padx=5)
-        btn_save = ttk.Button(frame_actions, text="Save Duplicates to File", command=self.save_stream_to_file)
-        btn_save.pack(side=tk.LEFT, padx=5)
+        progress = ScanProgress()
+        self.track_progress(progress, self.cleanup_progress, self.cleanup_lbl_progress)
+        threading.Thread(target=self.plan_cleanup_thread, args=(progress, list(yft_results), has_stream,
+                                                                 target_bytes, metric, self.io_budget()), daemon=True).start()
 
-        frame_manual = ttk.Frame(self.tab_stream, padding=10)
-        frame_manual.pack(fill=tk.BOTH, expand=True)
+    def plan_cleanup_thread(self, progress, yft_results, has_stream, target_bytes, metric, io_budget):
+        try:
+            planner = CleanupPlanner(io_budget=io_budget)
+            planner.add_hi_duplicates(yft_results)
+            if has_stream:
+                planner.add_stream_duplicates(self.stream_checker, progress)
+            plan = planner.plan(target_bytes, metric)
+            freed, skipped = planner.execute(plan, dry_run=True, progress=progress)
+            progress.finish("Plan Completed")
+            self.cleanup_table.load(plan)
+            memory = sum(action.memory_bytes for action in plan if not action.status.startswith("Skipped"))
+            self.status.set(f"Plan Completed. - {len(plan) - len(skipped)} deletions free {freed / MB:.2f} MB on disk "
+                            f"and {memory / MB:.2f} MB of streaming memory.")
+        except Exception as e:
+            self.status.set(f"Error: {e}")
+        finally:
+            progress.finish(progress.phase)
 
-        btn_manual_check = ttk.Button(frame_manual, text="Manually Check for Duplicates", command=self.check_manual_duplicates)
-        btn_manual_check.pack(anchor="e", pady=5)
+    def delete_planned_files(self):
+        plan = [row for row in self.cleanup_table.all_rows() if row.status == "Would delete"]
+        if not plan:
+            messagebox.showinfo("Info", "No planned deletions.")
+            return
+        total = sum(action.disk_bytes for action in plan)
+        confirm = messagebox.askyesno("Confirm Deletion", f"Are you sure you want to delete the {len(plan)} planned files ({total / MB:.2f} MB)?")
+        if not confirm:
+            return
 
-        self.txt_manual = tk.Text(frame_manual, height=10)
-        self.txt_manual.pack(fill=tk.BOTH, expand=True)
+        freed, failed = CleanupPlanner.execute(plan, dry_run=False)
+        deleted = {os.path.normcase(action.path) for action in plan if action.status == "Deleted"}
+        for item_id, row in self.cleanup_table.items():
+            self.cleanup_table.refresh(item_id)
+        if self.yft_cleaner:
+            self.yft_cleaner.deletable_files = [df for df in self.yft_cleaner.deletable_files
+                                                if os.path.normcase(df.path) not in deleted]
+            for item_id, row in self.yft_table.items():
+                if os.path.normcase(row.path) in deleted:
+                    self.yft_table.remove(item_id)
+            self.results_changed.add("yft")
+        for action in plan:
+            if action.kind == CleanupPlanner.KIND_STREAM and action.status == "Deleted":
+                self.update_stream_tree_after_delete(action.path)
+
+        messagebox.showinfo("Success", f"Successfully deleted {len(deleted)} files, {freed / MB:.2f} MB freed.")
+        if failed:
+            err_msg = "\n".join([f"{p}: {msg}" for p, msg in failed])
+            messagebox.showerror("Error", f"Failed to delete the following files:\n{err_msg}")
 
-    def setup_critical_tab(self):
-        """Setup the Critical Config Files tab"""
-        # Info label
-        frame_info = ttk.Frame(self.tab_critical, padding=10)
+    def save_cleanup_plan(self):
+        rows = self.cleanup_table.rows()
+        if not rows:
+            messagebox.showinfo("Info", "No cleanup plan built.")
+            return
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".txt",
+            filetypes=EXPORT_FILETYPES,
+            title="Save Cleanup Plan"
+        )
+        if file_path:
+
+            def write_text(f):
+                for row in rows:
+                    f.write(f"{row.kind}\t{row.disk_bytes}\t{row.memory_bytes}\t{row.path}\t(keep {row.keep})\n")
+
+            try:
+                self.export_rows(rows, file_path, CleanupAction.EXPORT_FIELDS, self.cleanup_root(),
+                                 "Cleanup Plan", write_text)
+                messagebox.showinfo("Success", f"Cleanup plan saved to {file_path}.")
+            except Exception as e:
+                messagebox.showerror("Error", f"Error: {e}")
+
+    def setup_compression_tab(self):
+        """Setup the Compression tab"""
+        frame_info = ttk.Frame(self.tab_compression, padding=10)
         frame_info.pack(fill=tk.X)
-        
-        info_label = ttk.Label(frame_info, text="Config files (.ymt, .meta & water.xml) should only exist once across the server:", 
-                              font=('Calibri', 11, 'italic'))
+
+        info_label = ttk.Label(frame_info, text="What clients download for each resource, against the size it decompresses to. Re-export flagged files to cut join times:",
+                               font=('Calibri', 11, 'italic'))
         info_label.pack(anchor='w')
-        
-        # Note about scanning location
-        note_label = ttk.Label(frame_info, 
-                              text="Note: This scans ALL directories (not just within 'stream' folders) to find duplicate files.", 
-                              font=('Calibri', 10, 'italic'), foreground='red')
-        note_label.pack(anchor='w', pady=(5, 0))
-        
-        # Directory selection
-        frame_top = ttk.Frame(self.tab_critical, padding=10)
+
+        frame_top = ttk.Frame(self.tab_compression, padding=10)
         frame_top.pack(fill=tk.X)
 
         lbl_dir = ttk.Label(frame_top, text="Root Directory:")
         lbl_dir.grid(row=0, column=0, sticky="w", padx=(0, 5))
 
-        # Use same directory variable as stream tab for consistency
         entry_dir = ttk.Entry(frame_top, textvariable=self.stream_root_directory, width=60)
         entry_dir.grid(row=0, column=1, sticky="w", padx=(0, 5))
 
-        btn_browse = ttk.Button(frame_top, text="Browse...", 
-                                command=self.browse_stream_directory)
+        btn_browse = ttk.Button(frame_top, text="Browse...", command=self.browse_stream_directory)
         btn_browse.grid(row=0, column=2, sticky="w")
 
-        # Scan controls
-        frame_scan = ttk.Frame(self.tab_critical, padding=10)
-        frame_scan.pack(fill=tk.X)
-
-        btn_scan_critical = ttk.Button(frame_scan, text="Scan Critical Files", 
-                                       command=self.scan_critical_files)
-        btn_scan_critical.grid(row=0, column=0, sticky="w")
-
-        self.critical_progress = ttk.Progressbar(frame_scan, orient="horizontal", 
-                                                 length=400, mode="determinate")
-        self.critical_progress.grid(row=0, column=1, padx=10, sticky="w")
+        check_archives = ttk.Checkbutton(frame_top, text="Include .rpf archive contents", variable=self.include_archives_var)
+        check_archives.grid(row=0, column=3, padx=(20, 0), sticky="w")
 
-        self.critical_lbl_progress = ttk.Label(frame_scan, text="Progress: 0/0")
-        self.critical_lbl_progress.grid(row=0, column=2, sticky="w")
+        check_group = ttk.Checkbutton(frame_top, text="Group by resource", variable=self.compression_group_var,
+                                      command=self.show_compression_rows)
+        check_group.grid(row=0, column=4, padx=(20, 0), sticky="w")
 
-        # Filter controls
-        frame_filter = ttk.Frame(self.tab_critical, padding=(10, 5))
-        frame_filter.pack(fill=tk.X)
-        
-        lbl_filter = ttk.Label(frame_filter, text="Filter:")
-        lbl_filter.pack(side=tk.LEFT, padx=(0, 5))
-        
-        filter_combo = ttk.Combobox(frame_filter, textvariable=self.critical_filter_var, 
-                                    state="readonly", width=20)
-        filter_combo['values'] = ["All Files", "Conflicts Only"]
-        filter_combo.set("All Files")
-        filter_combo.pack(side=tk.LEFT)
-        filter_combo.bind("<<ComboboxSelected>>", self.filter_critical_view)
+        frame_scan = ttk.Frame(self.tab_compression, padding=10)
+        frame_scan.pack(fill=tk.X)
 
-        # TreeView for critical files
-        frame_list = ttk.Frame(self.tab_critical, padding=10)
-        frame_list.pack(fill=tk.BOTH, expand=True)
+        btn_scan = ttk.Button(frame_scan, text="Analyse Compression", command=self.start_compression_scan)
+        btn_scan.grid(row=0, column=0, sticky="w")
 
-        scrollbar_critical = ttk.Scrollbar(frame_list, orient=tk.VERTICAL)
-        scrollbar_critical.pack(side=tk.RIGHT, fill=tk.Y)
+        self.compression_progress = ttk.Progressbar(frame_scan, orient="horizontal", length=400, mode="determinate")
+        self.compression_progress.grid(row=0, column=1, padx=10, sticky="w")
 
-        critical_columns = ("type", "file", "locations", "status")
-        self.critical_tree = ttk.Treeview(frame_list, columns=critical_columns, 
-                                          show="headings", selectmode="browse")
-        self.critical_tree.heading("type", text="File Type")
-        self.critical_tree.heading("file", text="File Name")
-        self.critical_tree.heading("locations", text="Locations")
-        self.critical_tree.heading("status", text="Status")
+        self.compression_lbl_progress = ttk.Label(frame_scan, text="Progress: 0/0")
+        self.compression_lbl_progress.grid(row=0, column=2, sticky="w")
 
-        self.critical_tree.column("type", width=150, anchor="w")
-        self.critical_tree.column("file", width=250, anchor="w")
-        self.critical_tree.column("locations", width=500, anchor="w")
-        self.critical_tree.column("status", width=200, anchor="center")
+        frame_search = ttk.Frame(self.tab_compression, padding=(10, 0))
+        frame_search.pack(fill=tk.X)
+        self.add_search_box(frame_search, lambda: self.compression_table)
 
-        self.critical_tree.configure(yscrollcommand=scrollbar_critical.set)
-        scrollbar_critical.config(command=self.critical_tree.yview)
+        frame_list = ttk.Frame(self.tab_compression, padding=10)
+        frame_list.pack(fill=tk.BOTH, expand=True)
 
-        self.critical_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        self.critical_tree.bind('<Button-3>', self.show_critical_context_menu)
+        scrollbar_compression = ttk.Scrollbar(frame_list, orient=tk.VERTICAL)
+        scrollbar_compression.pack(side=tk.RIGHT, fill=tk.Y)
+
+        compression_columns = ("name", "resource", "download", "content", "ratio", "flags")
+        self.compression_tree = ttk.Treeview(frame_list, columns=compression_columns, show="headings", selectmode="browse")
+        self.compression_tree.heading("name", text="File", command=lambda: self.compression_table.sort("name"))
+        self.compression_tree.heading("resource", text="Resource", command=lambda: self.compression_table.sort("resource"))
+        self.compression_tree.heading("download", text="Download", command=lambda: self.compression_table.sort("download"))
+        self.compression_tree.heading("content", text="Content", command=lambda: self.compression_table.sort("content"))
+        self.compression_tree.heading("ratio", text="Ratio", command=lambda: self.compression_table.sort("ratio"))
+        self.compression_tree.heading("flags", text="Flags", command=lambda: self.compression_table.sort("flags"))
+
+        self.compression_tree.column("name", width=250, anchor="w")
+        self.compression_tree.column("resource", width=200, anchor="w")
+        self.compression_tree.column("download", width=100, anchor="e")
+        self.compression_tree.column("content", width=100, anchor="e")
+        self.compression_tree.column("ratio", width=80, anchor="e")
+        self.compression_tree.column("flags", width=350, anchor="w")
+
+        self.compression_tree.configure(yscrollcommand=scrollbar_compression.set)
+        scrollbar_compression.config(command=self.compression_tree.yview)
+        self.compression_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.compression_table = ResultTable(
+            self.compression_tree,
+            values_fn=self.compression_row_values,
+            tag_fn=self.compression_row_tag,
+            sort_keys={
+                "download": lambda row: row.download_bytes,
+                "content": lambda row: row.content_bytes,
+                "ratio": lambda row: row.ratio,
+            },
+            tag_colors={"uncompressed": "lightcoral", "padded": "orange", "flagged": "lightyellow"},
+        )
 
-        # Action buttons
-        frame_actions = ttk.Frame(self.tab_critical, padding=10)
+        frame_actions = ttk.Frame(self.tab_compression, padding=10)
         frame_actions.pack(fill=tk.X)
-        
-        btn_copy = ttk.Button(frame_actions, text="Copy Conflicts to Clipboard", 
-                             command=self.copy_critical_conflicts)
-        btn_copy.pack(side=tk.LEFT, padx=5)
-        
-        btn_save = ttk.Button(frame_actions, text="Save Conflicts Report", 
-                             command=self.save_critical_report)
+        btn_save = ttk.Button(frame_actions, text="Save Compression Report", command=self.save_compression_report)
         btn_save.pack(side=tk.LEFT, padx=5)
 
-    def scan_critical_files(self):
-        """Scan for critical config files"""
+    def compression_row_values(self, row):
+        if isinstance(row, ResourceCompression):
+            flags = f"{row.flagged} flagged ({row.flagged_bytes / MB:.2f} MB)" if row.flagged else "OK"
+            return (f"{row.files} files", row.resource, f"{row.download_bytes / MB:.2f} MB",
+                    f"{row.content_bytes / MB:.2f} MB", f"{row.ratio * 100:.1f}%", flags)
+        return (
+            row.name,
+            resource_name(row.path),
+            f"{row.download_bytes / MB:.2f} MB",
+            f"{row.content_bytes / MB:.2f} MB",
+            f"{row.ratio * 100:.1f}%",
+            row.flags_str,
+        )
+
+    @staticmethod
+    def compression_row_tag(row):
+        if isinstance(row, ResourceCompression):
+            return "flagged" if row.flagged else "ok"
+        if CompressionAdvisor.FLAG_UNCOMPRESSED in row.flags:
+            return "uncompressed"
+        return "padded" if row.flags else "ok"
+
+    def show_compression_rows(self):
+        if self.compression_group_var.get():
+            self.compression_table.load(CompressionAdvisor.by_resource(self.compression_assets))
+        else:
+            self.compression_table.load(self.compression_assets)
+
+    def start_compression_scan(self):
         if not self.stream_root_directory.get():
             messagebox.showwarning("Warning", "No directory selected.")
             return
@@ -662,248 +6570,253 @@ class GUI_MAIN:
             messagebox.showerror("Error", "No directory or invalid path selected.")
             return
 
-        # Clear existing entries
-        for item in self.critical_tree.get_children():
-            self.critical_tree.delete(item)
-            
-        if not self.stream_checker:
-            self.stream_checker = StreamDuplicateChecker()
-
-        self.critical_progress["value"] = 0
-        self.critical_lbl_progress.config(text="Progress: 0/0")
-        self.status.set("Scanning...")
+        self.compression_table.clear()
+        self.status.set("Reading resource headers...")
 
-        threading.Thread(target=self.scan_critical_thread, daemon=True).start()
+        progress = ScanProgress()
+        self.track_progress(progress, self.compression_progress, self.compression_lbl_progress)
+        threading.Thread(target=self.scan_compression_thread, args=(progress, self.io_budget()), daemon=True).start()
 
-    def scan_critical_thread(self):
-        """Background thread for scanning critical files"""
+    def scan_compression_thread(self, progress, io_budget):
         try:
-            # Scan for critical files (not restricted to stream folders)
-            critical_files = self.stream_checker.scan_critical_files(self.stream_root_directory.get())
-            
-            # Update progress
-            self.critical_progress["value"] = 100
-            self.critical_lbl_progress.config(text="Scan Completed.")
-            
-            # Populate the tree
-            self.populate_critical_tree()
-            
-            if critical_files:
-                conflicts = sum(1 for locs in critical_files.values() if len(locs) > 1)
-                total_files = len(critical_files)
-                if conflicts > 0:
-                    self.status.set(f"Scan Completed. - Found {total_files} critical files, {conflicts} have conflicts!")
-                else:
-                    self.status.set(f"Scan Completed. - Found {total_files} critical files, no conflicts.")
-            else:
-                self.status.set("No critical file conflicts found.")
-                
+            stream_root = self.stream_root_directory.get()
+            assets = CompressionAdvisor(io_budget=io_budget).scan(stream_root, self.include_archives_var.get(), progress)
+            progress.finish("Scan Completed")
+            self.stream_root_dir = stream_root
+            self.compression_assets = assets
+            self.show_compression_rows()
+            flagged = [asset for asset in assets if asset.flags]
+            self.status.set(f"Scan Completed. - {len(assets)} resources, "
+                            f"{sum(a.download_bytes for a in assets) / MB:.2f} MB to download; {len(flagged)} flagged "
+                            f"({sum(a.download_bytes for a in flagged) / MB:.2f} MB).")
         except Exception as e:
             self.status.set(f"Error: {e}")
+        finally:
+            progress.finish(progress.phase)
 
-    def populate_critical_tree(self):
-        """Populate the critical files tree view"""
-        stream_root = self.stream_root_directory.get()
-        
-        for filename, locations in self.stream_checker.critical_conflicts.items():
-            file_type = self.stream_checker.get_critical_file_type(filename)
-            
-            # Convert locations to relative paths
-            relative_locations = []
-            for loc in locations:
-                try:
-                    rel_loc = os.path.relpath(loc, stream_root)
-                except ValueError:
-                    rel_loc = loc
-                relative_locations.append(rel_loc)
-            
-            loc_str = '; '.join(relative_locations)
-            
-            # Determine status
-            if len(locations) > 1:
-                status = "CONFLICT - Multiple instances found!"
-                tag = "conflict"
-            else:
-                status = "OK - Single instance"
-                tag = "ok"
-            
-            item_id = self.critical_tree.insert("", tk.END, 
-                                                values=(file_type, filename, loc_str, status),
-                                                tags=(tag,))
-            
-        # Configure tags
-        self.critical_tree.tag_configure("conflict", background="lightcoral")
-        self.critical_tree.tag_configure("ok", background="lightgreen")
-
-    def filter_critical_view(self, event=None):
-        """Filter the critical files view"""
-        filter_value = self.critical_filter_var.get()
-        
-        # Clear and repopulate based on filter
-        for item in self.critical_tree.get_children():
-            self.critical_tree.delete(item)
-            
-        if not self.stream_checker or not self.stream_checker.critical_conflicts:
+    def save_compression_report(self):
+        rows = self.compression_table.rows()
+        if not rows:
+            messagebox.showinfo("Info", "No compression results.")
             return
-            
-        stream_root = self.stream_root_directory.get()
-        
-        for filename, locations in self.stream_checker.critical_conflicts.items():
-            # Apply filter
-            if filter_value == "Conflicts Only" and len(locations) <= 1:
-                continue
-                
-            file_type = self.stream_checker.get_critical_file_type(filename)
-            
-            relative_locations = []
-            for loc in locations:
-                try:
-                    rel_loc = os.path.relpath(loc, stream_root)
-                except ValueError:
-                    rel_loc = loc
-                relative_locations.append(rel_loc)
-            
-            loc_str = '; '.join(relative_locations)
-            
-            if len(locations) > 1:
-                status = "CONFLICT - Multiple instances found!"
-                tag = "conflict"
-            else:
-                status = "OK - Single instance"
-                tag = "ok"
-            
-            item_id = self.critical_tree.insert("", tk.END, 
-                                                values=(file_type, filename, loc_str, status),
-                                                tags=(tag,))
-        
-        self.critical_tree.tag_configure("conflict", background="lightcoral")
-        self.critical_tree.tag_configure("ok", background="lightgreen")
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".txt",
+            filetypes=EXPORT_FILETYPES,
+            title="Save Compression Report"
+        )
+        if file_path:
+            grouped = isinstance(rows[0], ResourceCompression)
 
-    def show_critical_context_menu(self, event):
-        """Show context menu for critical files"""
-        row_id = self.critical_tree.identify_row(event.y)
-        if row_id:
-            self.critical_tree.selection_set(row_id)
-            self.right_clicked_row = row_id
-            
-            # Clear and rebuild menu
-            self.critical_context_menu.delete(0, tk.END)
-            
-            filename = self.critical_tree.set(row_id, "file")
-            locations_str = self.critical_tree.set(row_id, "locations")
-            locations = locations_str.split('; ')
-            
-            # Add view folder options
-            for loc in locations:
-                full_path = os.path.join(self.stream_root_directory.get(), loc, filename)
-                self.critical_context_menu.add_command(
-                    label=f"📁 {loc}",
-                    command=lambda path=full_path: self.open_folder_for_stream_file(path)
-                )
-                
-            # If conflict, add delete options
-            if len(locations) > 1:
-                self.critical_context_menu.add_separator()
-                for loc in locations:
-                    full_path = os.path.join(self.stream_root_directory.get(), loc, filename)
-                    self.critical_context_menu.add_command(
-                        label=f"🗑️ Delete {loc}",
-                        command=lambda path=full_path: self.delete_critical_file(path)
-                    )
-                    
-            self.critical_context_menu.post(event.x_root, event.y_root)
+            def write_text(f):
+                for row in rows:
+                    if grouped:
+                        f.write(f"{row.resource}\t{row.files}\t{row.download_bytes}\t{row.content_bytes}\t{row.flagged}\n")
+                    else:
+                        f.write(f"{row.flags_str}\t{row.download_bytes}\t{row.content_bytes}\t{row.path}\n")
+
+            try:
+                fields = ResourceCompression.EXPORT_FIELDS if grouped else CompressedAsset.EXPORT_FIELDS
+                self.export_rows(rows, file_path, fields, self.stream_root_dir, "Compression Report", write_text)
+                messagebox.showinfo("Success", f"Compression report saved to {file_path}.")
+            except Exception as e:
+                messagebox.showerror("Error", f"Error: {e}")
+
+    def setup_diff_tab(self):
+        """Setup the Scan Diff tab"""
+        frame_info = ttk.Frame(self.tab_diff, padding=10)
+        frame_info.pack(fill=tk.X)
+
+        info_label = ttk.Label(frame_info, text=f"Every scan is saved as a snapshot in {SNAPSHOT_DIR}. Compare two snapshots to see what changed:",
+                               font=('Calibri', 11, 'italic'))
+        info_label.pack(anchor='w')
+
+        frame_top = ttk.Frame(self.tab_diff, padding=10)
+        frame_top.pack(fill=tk.X)
+
+        lbl_old = ttk.Label(frame_top, text="Old Snapshot:")
+        lbl_old.grid(row=0, column=0, sticky="w", padx=(0, 5))
+        entry_old = ttk.Entry(frame_top, textvariable=self.diff_old_var, width=80)
+        entry_old.grid(row=0, column=1, sticky="w", padx=(0, 5))
+        btn_old = ttk.Button(frame_top, text="Browse...", command=lambda: self.browse_snapshot(self.diff_old_var))
+        btn_old.grid(row=0, column=2, sticky="w")
+
+        lbl_new = ttk.Label(frame_top, text="New Snapshot:")
+        lbl_new.grid(row=1, column=0, sticky="w", padx=(0, 5), pady=(5, 0))
+        entry_new = ttk.Entry(frame_top, textvariable=self.diff_new_var, width=80)
+        entry_new.grid(row=1, column=1, sticky="w", padx=(0, 5), pady=(5, 0))
+        btn_new = ttk.Button(frame_top, text="Browse...", command=lambda: self.browse_snapshot(self.diff_new_var))
+        btn_new.grid(row=1, column=2, sticky="w", pady=(5, 0))
+
+        frame_scan = ttk.Frame(self.tab_diff, padding=10)
+        frame_scan.pack(fill=tk.X)
+
+        btn_compare = ttk.Button(frame_scan, text="Compare Snapshots", command=self.compare_snapshots)
+        btn_compare.pack(side=tk.LEFT)
+        self.add_search_box(frame_scan, lambda: self.diff_table)
 
-    def delete_critical_file(self, file_path):
-        """Delete a critical file with confirmation"""
-        filename = os.path.basename(file_path)
-        confirm = messagebox.askyesno(
-            "Confirm Deletion",
-            f"Delete critical config file: {filename}?\n\n"
-            f"⚠️ This file may be required for proper resource operation.\n"
-            f"Path: {file_path}"
+        frame_manifest = ttk.Frame(self.tab_diff, padding=(10, 0))
+        frame_manifest.pack(fill=tk.X)
+
+        btn_manifest = ttk.Button(frame_manifest, text="Export Manifest...", command=self.export_manifest)
+        btn_manifest.pack(side=tk.LEFT)
+
+        self.manifest_progress = ttk.Progressbar(frame_manifest, orient="horizontal", length=300, mode="determinate")
+        self.manifest_progress.pack(side=tk.LEFT, padx=10)
+
+        self.manifest_lbl_progress = ttk.Label(frame_manifest, text="Manifest of the Stream root directory, to compare servers without copying files.")
+        self.manifest_lbl_progress.pack(side=tk.LEFT)
+
+        self.diff_lbl_summary = ttk.Label(self.tab_diff, text="", padding=(10, 0))
+        self.diff_lbl_summary.pack(fill=tk.X)
+
+        frame_list = ttk.Frame(self.tab_diff, padding=10)
+        frame_list.pack(fill=tk.BOTH, expand=True)
+
+        scrollbar_diff = ttk.Scrollbar(frame_list, orient=tk.VERTICAL)
+        scrollbar_diff.pack(side=tk.RIGHT, fill=tk.Y)
+
+        diff_columns = ("change", "name", "old", "new")
+        self.diff_tree = ttk.Treeview(frame_list, columns=diff_columns, show="headings", selectmode="browse")
+        self.diff_tree.heading("change", text="Change", command=lambda: self.diff_table.sort("change"))
+        self.diff_tree.heading("name", text="File / Name", command=lambda: self.diff_table.sort("name"))
+        self.diff_tree.heading("old", text="Before", command=lambda: self.diff_table.sort("old"))
+        self.diff_tree.heading("new", text="After", command=lambda: self.diff_table.sort("new"))
+
+        self.diff_tree.column("change", width=180, anchor="w")
+        self.diff_tree.column("name", width=400, anchor="w")
+        self.diff_tree.column("old", width=300, anchor="w")
+        self.diff_tree.column("new", width=300, anchor="w")
+
+        self.diff_tree.configure(yscrollcommand=scrollbar_diff.set)
+        scrollbar_diff.config(command=self.diff_tree.yview)
+        self.diff_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.diff_table = ResultTable(
+            self.diff_tree,
+            values_fn=lambda row: (row.change, row.name, row.old, row.new),
+            tag_fn=lambda row: SNAPSHOT_CHANGE_TAGS.get(row.change, "changed"),
+            tag_colors={"regressed": "lightcoral", "improved": "lightgreen", "changed": "lightyellow"},
         )
-        if not confirm:
+
+        frame_actions = ttk.Frame(self.tab_diff, padding=10)
+        frame_actions.pack(fill=tk.X)
+        btn_save = ttk.Button(frame_actions, text="Save Diff Report", command=self.save_diff_report)
+        btn_save.pack(side=tk.LEFT, padx=5)
+
+    def browse_snapshot(self, target_var):
+        file_path = filedialog.askopenfilename(
+            initialdir=SNAPSHOT_DIR if os.path.isdir(SNAPSHOT_DIR) else None,
+            filetypes=[("Scan snapshots", "*.snap"), ("Asset manifests", "*.manifest *.manifest.gz"), ("All files", "*.*")],
+            title="Select Snapshot"
+        )
+        if file_path:
+            target_var.set(file_path)
+
+    def snapshot_files(self, paths, root_dir):
+        """Snapshot records (with on-disk sizes) for a list of scanned file paths."""
+        records = []
+        for path in paths:
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                size = -1
+            records.append(SnapshotFile(snapshot_key(path, root_dir), size))
+        return records
+
+    def save_snapshot(self, kind, root_dir, files, groups):
+        """
+        Save a finished scan as a snapshot and line it up in the Scan Diff tab against the previous one.
+        Failures are reported in the status bar but never fail the scan itself.
+        """
+        try:
+            previous = ScanSnapshot.latest(kind)
+            path = ScanSnapshot.write(ScanSnapshot.default_path(kind), kind, root_dir, files, groups)
+        except Exception as e:
+            print(f"Error: {e}")
+            return None
+        if previous:
+            self.diff_old_var.set(previous)
+        self.diff_new_var.set(path)
+        return path
+
+    def compare_snapshots(self):
+        old_path, new_path = self.diff_old_var.get(), self.diff_new_var.get()
+        if not old_path or not new_path:
+            messagebox.showwarning("Warning", "Select two snapshots to compare.")
             return
-            
         try:
-            os.remove(file_path)
-            messagebox.showinfo("Success", f"Deleted: {filename}")
-            # Refresh the view
-            self.scan_critical_files()
+            old_header, new_header, changes = compare_scan_files(old_path, new_path)
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to delete {filename}:\n{e}")
-
-    def copy_critical_conflicts(self):
-        """Copy critical conflicts to clipboard"""
-        conflicts = []
-        for item in self.critical_tree.get_children():
-            status = self.critical_tree.set(item, "status")
-            if "CONFLICT" in status:
-                filename = self.critical_tree.set(item, "file")
-                file_type = self.critical_tree.set(item, "type")
-                locations = self.critical_tree.set(item, "locations")
-                conflicts.append(f"{file_type}: {filename}\nLocations: {locations}\n")
-        
-        if conflicts:
-            try:
-                pyperclip.copy('\n'.join(conflicts))
-                messagebox.showinfo("Success", "Critical conflicts list copied to clipboard.")
-            except Exception as e:
-                messagebox.showerror("Error", f"Error: {e}")
-        else:
-            messagebox.showinfo("Info", "No critical file conflicts found.")
+            messagebox.showerror("Error", f"Error: {e}")
+            return
+        if old_header.get("kind") != new_header.get("kind"):
+            messagebox.showwarning("Warning", "The snapshots come from different scan types; the diff may not be meaningful.")
+
+        self.diff_table.load(changes)
+        summary = ScanSnapshot.summarize(changes)
+        summary_str = ", ".join(f"{count} {change.lower()}" for change, count in sorted(summary.items())) or "No changes"
+        self.diff_lbl_summary.config(
+            text=f"{old_header.get('created')} -> {new_header.get('created')} ({new_header.get('kind')}): {summary_str}"
+        )
+        self.status.set(f"Compared snapshots - {len(changes)} changes.")
 
-    def save_critical_report(self):
-        """Save critical files report to file"""
+    def export_manifest(self):
+        root_dir = self.stream_root_directory.get()
+        if not root_dir or not os.path.isdir(root_dir):
+            messagebox.showerror("Error", "Select a valid Stream root directory first.")
+            return
         file_path = filedialog.asksaveasfilename(
-            defaultextension=".txt",
-            filetypes=[("Text files", "*.txt"), ("All files", "*.*")],
-            title="Save Conflicts Report"
+            defaultextension=".manifest.gz",
+            filetypes=[("Asset manifests", "*.manifest.gz *.manifest"), ("All files", "*.*")],
+            title="Export Manifest"
         )
-        
         if not file_path:
             return
-            
+        self.status.set("Writing manifest...")
+        progress = ScanProgress()
+        self.track_progress(progress, self.manifest_progress, self.manifest_lbl_progress)
+        threading.Thread(target=self.export_manifest_thread, args=(progress, root_dir, file_path, self.io_budget()),
+                         daemon=True).start()
+
+    def export_manifest_thread(self, progress, root_dir, file_path, io_budget):
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write("Critical Config Files Report (.ymt/.meta/.xml)\n")
-                f.write("=" * 50 + "\n\n")
-                
-                # Write conflicts first
-                f.write("CONFLICTS (Files with multiple instances):\n")
-                f.write("-" * 40 + "\n")
-                conflicts_found = False
-                
-                for item in self.critical_tree.get_children():
-                    status = self.critical_tree.set(item, "status")
-                    if "CONFLICT" in status:
-                        conflicts_found = True
-                        filename = self.critical_tree.set(item, "file")
-                        file_type = self.critical_tree.set(item, "type")
-                        locations = self.critical_tree.set(item, "locations")
-                        f.write(f"\n{file_type}: {filename}\n")
-                        f.write(f"Locations:\n")
-                        for loc in locations.split('; '):
-                            f.write(f"  - {loc}\n")
-                
-                if not conflicts_found:
-                    f.write("No conflicts found.\n")
-                
-                # Write OK files
-                f.write("\n\nOK FILES (Single instances):\n")
-                f.write("-" * 40 + "\n")
-                
-                for item in self.critical_tree.get_children():
-                    status = self.critical_tree.set(item, "status")
-                    if "OK" in status:
-                        filename = self.critical_tree.set(item, "file")
-                        file_type = self.critical_tree.set(item, "type")
-                        locations = self.critical_tree.set(item, "locations")
-                        f.write(f"{file_type}: {filename} -> {locations}\n")
-                
-            messagebox.showinfo("Success", f"Critical conflicts report saved to {file_path}.")
+            count = AssetManifest(io_budget=io_budget).write(file_path, root_dir, progress)
+            progress.finish("Manifest Saved")
+            self.diff_new_var.set(file_path)
+            self.status.set(f"Manifest of {count} files saved to {file_path}.")
         except Exception as e:
-            messagebox.showerror("Error", f"Error: {e}")
+            self.status.set(f"Error: {e}")
+        finally:
+            progress.finish(progress.phase)
+
+    def save_diff_report(self):
+        rows = self.diff_table.rows()
+        if not rows:
+            messagebox.showinfo("Info", "No changes to save.")
+            return
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".txt",
+            filetypes=EXPORT_FILETYPES,
+            title="Save Diff Report"
+        )
+        if file_path:
+
+            def write_text(f):
+                for row in rows:
+                    f.write(f"{row.change}: {row.name}\n")
+                    if row.old:
+                        f.write(f"  before: {row.old}\n")
+                    if row.new:
+                        f.write(f"  after:  {row.new}\n")
+
+            try:
+                self.export_rows(
+                    rows, file_path, SnapshotChange.EXPORT_FIELDS, "", "Scan Diff Report", write_text,
+                    row_class=lambda record: SNAPSHOT_CHANGE_TAGS.get(record["change"], "changed"),
+                )
+                messagebox.showinfo("Success", f"Diff report saved to {file_path}.")
+            except Exception as e:
+                messagebox.showerror("Error", f"Error: {e}")
 
     # YFT Cleaner Events
     def browse_directory(self):
@@ -911,17 +6824,21 @@ class GUI_MAIN:
         if directory:
             self.root_directory.set(directory)
 
-    def start_scan(self):
-        if self.enable_margin_var.get():
-            try:
-                margin_kb = float(self.size_margin_kb_var.get())
-            except ValueError:
-                margin_kb = 0.0
-        else:
-            margin_kb = 0.0
-
-        self.yft_cleaner = YftCleaner(size_margin_kb=margin_kb)
+    def io_budget(self):
+        """
+        The IoBudget for hashing and header reads: paced and in background mode when low-impact I/O is on.
+        Lowering the priority lasts until the application is closed.
+        """
+        if not self.low_impact_var.get():
+            return None
+        try:
+            limit = float(self.io_limit_mb_var.get())
+        except ValueError:
+            limit = 0.0
+        IoBudget.lower_priority()
+        return IoBudget(mb_per_sec=limit, background=True)
 
+    def start_scan(self):
         if not self.root_directory.get():
             messagebox.showwarning("Warning", "No files selected.")
             return
@@ -929,73 +6846,220 @@ class GUI_MAIN:
             messagebox.showerror("Error", "No files available.")
             return
 
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        if self.enable_margin_var.get():
+            try:
+                margin = float(self.size_margin_kb_var.get())
+            except ValueError:
+                margin = 0.0
+        else:
+            margin = 0.0
+
+        compare_resources = self.compare_resources_var.get()
+        if self.margin_mode_var.get() == MARGIN_MODE_SIMILARITY:
+            self.yft_cleaner = YftCleaner(similarity_threshold=min(margin, 100.0), compare_resources=compare_resources,
+                                          io_budget=self.io_budget(), lod_aware=self.lod_aware_var.get())
+        else:
+            self.yft_cleaner = YftCleaner(size_margin_kb=margin, compare_resources=compare_resources,
+                                          io_budget=self.io_budget(), lod_aware=self.lod_aware_var.get())
+
+        self.cancel_restore("yft")
+        self.yft_table.clear()
 
         self.yft_cleaner.deletable_files.clear()
-        self.total_files = 0
-        self.processed_files = 0
-        self.progress["value"] = 0
-        self.lbl_progress.config(text="Progress: 0/0")
         self.status.set("Scanning...")
 
-        threading.Thread(target=self.scan_files_thread, daemon=True).start()
+        try:
+            time_budget = float(self.time_budget_var.get()) if self.time_budget_var.get().strip() else None
+        except ValueError:
+            time_budget = None
+
+        progress = ScanProgress()
+        self.track_progress(progress, self.progress, self.lbl_progress)
+        threading.Thread(target=self.scan_files_thread, args=(progress, time_budget), daemon=True).start()
 
-    def scan_files_thread(self):
+    def scan_files_thread(self, progress, time_budget=None):
         try:
-            hi_yft_files = self.yft_cleaner.find_hi_yft_files(self.root_directory.get())
-            unique_hi_yft_files = list(set(hi_yft_files))
-            self.total_files = len(unique_hi_yft_files)
+            root_dir = self.root_directory.get()
+            hi_yft_files = self.yft_cleaner.find_hi_yft_files(root_dir, progress)
 
+            # Duplicates appear as they are confirmed, the most promising files first.
+            self.yft_root_dir = root_dir
             results = []
-            with ThreadPoolExecutor(max_workers=os.cpu_count() or 4) as executor:
-                future_map = {executor.submit(self.yft_cleaner.process_file, f): f for f in unique_hi_yft_files}
-                for idx, future in enumerate(as_completed(future_map), 1):
-                    r = future.result()
-                    if r:
-                        results.append(r)
-                    self.processed_files = idx
-                    self.update_progress()
+            for r in self.yft_cleaner.iter_duplicates(hi_yft_files, time_budget=time_budget, progress=progress):
+                results.append(r)
+                self.yft_table.insert(r)
 
             self.yft_cleaner.deletable_files = results
-            self.populate_treeview_yft(results)
+            self.yft_cleaner.save_caches()
+            self.save_results("yft", root_dir, results)
+            if self.yft_cleaner.budget_exhausted:
+                # A partial scan would show the files it never reached as removed in the Scan Diff tab.
+                progress.finish("Time Budget Reached")
+                self.status.set(f"Time budget reached - {len(results)} duplicates found among the most promising "
+                                f"files. Scan again without a budget to check the rest.")
+                return
+            self.save_snapshot("yft", root_dir, [
+                SnapshotFile(snapshot_key(r.path, root_dir), r.file_size, r.file_hash, r.status.label) for r in results
+            ], {})
+            progress.finish("Scan Completed")
             self.status.set("Scan Completed.")
         except Exception as e:
             self.status.set(f"Error: {e}")
+        finally:
+            progress.finish(progress.phase)
 
-    def update_progress(self):
-        if self.total_files > 0:
-            progress_percent = (self.processed_files / self.total_files) * 100
-            self.progress["value"] = progress_percent
-            self.lbl_progress.config(text=f"Progress: {self.processed_files}/{self.total_files}")
-        self.root.update_idletasks()
+    def save_results(self, kind, root_dir, rows):
+        """
+        Keep a scan's results for the next start. Failures are printed but never fail the scan itself.
+        """
+        try:
+            ResultStore.write(ResultStore.default_path(kind), kind, root_dir, rows)
+            self.results_changed.discard(kind)
+        except Exception as e:
+            print(f"Error: {e}")
 
-    def populate_treeview_yft(self, file_info_list):
-        root_dir = self.root_directory.get()
-        for file_path, size_str, status in file_info_list:
-            model_name = os.path.basename(file_path)
-            dir_path = os.path.dirname(file_path)
-            try:
-                relative_path = os.path.relpath(dir_path, root_dir)
-            except ValueError:
-                relative_path = dir_path
-
-            item_id = self.tree.insert("", tk.END, values=("☐", model_name, relative_path, size_str, status))
-            if status.startswith("OK"):
-                self.tree.item(item_id, tags=("ok",))
-                self.tree.tag_configure("ok", background="lightgreen")
-            elif status.startswith("Warning"):
-                self.tree.item(item_id, tags=("warning",))
-                self.tree.tag_configure("warning", background="yellow")
-            elif status.startswith("Critical"):
-                self.tree.item(item_id, tags=("critical",))
-                self.tree.tag_configure("critical", background="red")
-            elif status.startswith("Critical Oversized"):
-                self.tree.item(item_id, tags=("oversize",))
-                self.tree.tag_configure("oversize", background="orange")
-            else:
-                self.tree.tag_configure("default", background="white")
-                self.tree.item(item_id, tags=("default",))
+    def restore_results_thread(self):
+        """
+        Show the first rows of the last YFT and Stream scans. The rest of each store is added from idle
+        callbacks (see restore_rows), and the store stays mapped until its last row is shown.
+        """
+        restored = []
+        stream_restored = False
+        try:
+            store = ResultStore.open_latest("yft")
+            if store:
+                self.yft_root_dir = store.root_dir
+                if not self.root_directory.get():
+                    self.root_directory.set(store.root_dir)
+                self.yft_cleaner = self.yft_cleaner or YftCleaner()
+                self.start_restore("yft", store)
+                restored.append(store.created)
+
+            store = ResultStore.open_latest("stream")
+            if store:
+                self.stream_root_dir = store.root_dir
+                if not self.stream_root_directory.get():
+                    self.stream_root_directory.set(store.root_dir)
+                self.stream_checker = self.stream_checker or StreamDuplicateChecker()
+                self.start_restore("stream", store)
+                restored.append(store.created)
+                stream_restored = True
+        except Exception as e:
+            self.status.set(f"Error: {e}")
+            return
+
+        if restored:
+            self.status.set(f"Showing the results of the last scan ({max(restored)}). Rescan to refresh them.")
+        if stream_restored and self.refresh_on_open_var.get() and os.path.isdir(self.stream_root_dir):
+            self.root.after(0, self.start_stream_scan, True)
+
+    def start_restore(self, kind, store):
+        """
+        Load the first batch of a result store into its table and queue the rest.
+        """
+        table = self.yft_table if kind == "yft" else self.stream_table
+        try:
+            table.load(store.rows(0, ResultStore.BATCH_ROWS))
+        except Exception:
+            store.close()
+            raise
+        self.restoring[kind] = (store, ResultStore.BATCH_ROWS)
+        self.restored_rows(kind)
+        self.root.after(0, self.restore_rows, kind, store, self.RESTORE_STEP_ROWS)
+
+    def restore_rows(self, kind, store, count=None):
+        """
+        Add the next count rows (all when None) of a restored store to its table, on the Tk thread.
+        Stops, closing the store, once it is done or a new scan of that kind has replaced it.
+        """
+        current, start = self.restoring.get(kind, (None, 0))
+        if current is not store:
+            store.close()
+            return
+        table = self.yft_table if kind == "yft" else self.stream_table
+        stop = len(store) if count is None else min(start + count, len(store))
+        try:
+            table.extend(store.rows(start, stop))
+        except Exception as e:
+            self.status.set(f"Error: {e}")
+            stop = len(store)
+        if stop < len(store):
+            self.restoring[kind] = (store, stop)
+            self.root.after(1, self.restore_rows, kind, store, self.RESTORE_STEP_ROWS)
+            return
+        del self.restoring[kind]
+        store.close()
+        self.restored_rows(kind)
+
+    def finish_restore(self, kind):
+        """
+        Add any rows of kind still being restored, so the table holds every saved result.
+        """
+        if kind in self.restoring:
+            self.restore_rows(kind, self.restoring[kind][0])
+
+    def cancel_restore(self, kind):
+        """
+        Stop adding restored rows of kind; the pending callback closes the store.
+        """
+        self.restoring.pop(kind, None)
+
+    def restored_rows(self, kind):
+        """
+        Point the YFT cleaner or Stream checker at the rows restored so far.
+        """
+        if kind == "yft":
+            self.yft_cleaner.deletable_files = self.yft_table.all_rows()
+            return
+        rows = self.stream_table.all_rows()
+        self.stream_checker.duplicate_files = {row.name: row.locations for row in rows if len(row.locations) > 1}
+        self.stream_checker.stream_files = [os.path.join(loc, row.name) for row in rows for loc in row.locations]
+
+    def toggle_refresh_on_open(self):
+        try:
+            if self.refresh_on_open_var.get():
+                os.makedirs(RESULTS_DIR, exist_ok=True)
+                open(REFRESH_ON_OPEN_PATH, 'w').close()
+            elif os.path.isfile(REFRESH_ON_OPEN_PATH):
+                os.remove(REFRESH_ON_OPEN_PATH)
+        except OSError as e:
+            print(f"Error: {e}")
+
+    def on_close(self):
+        """
+        Save results changed by deletions since their scan, then close.
+        """
+        if "yft" in self.results_changed:
+            self.finish_restore("yft")
+            self.save_results("yft", self.yft_root_dir, self.yft_table.all_rows())
+        if "stream" in self.results_changed:
+            self.finish_restore("stream")
+            self.save_results("stream", self.stream_root_dir, self.stream_table.all_rows())
+        self.root.destroy()
+
+    def track_progress(self, progress, bar, label, interval=250):
+        """
+        Show a ScanProgress on a progress bar and label every interval ms until the scan finishes.
+        Runs on the Tk thread, so scan threads never touch the widgets themselves.
+        """
+        snapshot = progress.snapshot()
+        bar["value"] = snapshot.percent
+        label.config(text=snapshot.describe())
+        if not snapshot.finished:
+            self.root.after(interval, self.track_progress, progress, bar, label, interval)
+
+    def yft_row_values(self, row):
+        return (
+            "☑" if row.selected else "☐",
+            row.model_name,
+            self.relative_location(os.path.dirname(row.path), self.yft_root_dir),
+            row.size_str,
+            row.status_str,
+        )
+
+    @staticmethod
+    def relative_location(path, root_dir):
+        return relative_location(path, root_dir)
 
     def handle_click_yft(self, event):
         region = self.tree.identify("region", event.x, event.y)
@@ -1005,9 +7069,7 @@ class GUI_MAIN:
         if column == "#1":
             row_id = self.tree.identify_row(event.y)
             if row_id:
-                current_value = self.tree.set(row_id, "select")
-                new_value = "☑" if current_value == "☐" else "☐"
-                self.tree.set(row_id, "select", new_value)
+                self.yft_table.toggle_selected(row_id)
 
     def show_yft_context_menu(self, event):
         row_id = self.tree.identify_row(event.y)
@@ -1019,11 +7081,9 @@ class GUI_MAIN:
             self.right_clicked_row = None
 
     def view_folder(self):
-        if self.right_clicked_row:
-            path_val = self.tree.set(self.right_clicked_row, "path")
-            model_name = self.tree.set(self.right_clicked_row, "model_name")
-            full_path = os.path.join(self.root_directory.get(), path_val, model_name)
-            folder_path = os.path.dirname(full_path)
+        row = self.yft_table.row(self.right_clicked_row) if self.right_clicked_row else None
+        if row:
+            folder_path = os.path.dirname(row.path)
         else:
             selected = self.get_selected_files_yft()
             if not selected:
@@ -1040,15 +7100,7 @@ class GUI_MAIN:
             messagebox.showerror("Error", f"Error: {e}")
 
     def get_selected_files_yft(self):
-        selected_files = []
-        for item in self.tree.get_children():
-            if self.tree.set(item, "select") == "☐":
-                continue
-            model_name = self.tree.set(item, "model_name")
-            path_val = self.tree.set(item, "path")
-            full_path = os.path.join(self.root_directory.get(), path_val, model_name)
-            selected_files.append(full_path)
-        return selected_files
+        return [row.path for _, row in self.yft_table.selected_items()]
 
     def copy_to_clipboard_yft(self):
         selected = self.get_selected_files_yft()
@@ -1062,52 +7114,53 @@ class GUI_MAIN:
             messagebox.showerror("Error", f"Error: {e}")
 
     def save_to_file_yft(self):
-        selected = self.get_selected_files_yft()
-        if not selected:
+        # Export the ticked rows, or everything currently shown when nothing is ticked.
+        rows = [row for _, row in self.yft_table.selected_items()] or self.yft_table.rows()
+        if not rows:
             messagebox.showinfo("Info", "No files selected.")
             return
         file_path = filedialog.asksaveasfilename(
             defaultextension=".txt",
-            filetypes=[("Text files", "*.txt"), ("All files", "*.*")],
+            filetypes=EXPORT_FILETYPES,
             title="Save List to File"
         )
         if file_path:
             try:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write('\n'.join(selected))
+                self.export_rows(
+                    rows, file_path, YftResult.EXPORT_FIELDS, self.yft_root_dir,
+                    "Duplicate YFT Report",
+                    lambda f: f.write('\n'.join(row.path for row in rows)),
+                    row_class=lambda record: SizeStatus.from_label(record["status"]).tag,
+                )
                 messagebox.showinfo("Success", f"File list saved to {file_path}.")
             except Exception as e:
                 messagebox.showerror("Error", f"Error: {e}")
 
     def delete_selected_files_yft(self):
-        selected_files = self.get_selected_files_yft()
-        if not selected_files:
+        selected_items = self.yft_table.selected_items()
+        if not selected_items:
             messagebox.showinfo("Info", "No files selected.")
             return
 
-        confirm = messagebox.askyesno("Confirm Deletion", f"Are you sure you want to delete the selected {len(selected_files)} files?")
+        confirm = messagebox.askyesno("Confirm Deletion", f"Are you sure you want to delete the selected {len(selected_items)} files?")
         if not confirm:
             return
 
         deleted = []
         failed = []
-        for fp in selected_files:
+        for item_id, row in selected_items:
             try:
-                os.remove(fp)
-                deleted.append(fp)
-                for item in self.tree.get_children():
-                    model_name = self.tree.set(item, "model_name")
-                    path_val = self.tree.set(item, "path")
-                    full_check = os.path.join(self.root_directory.get(), path_val, model_name)
-                    if full_check == fp:
-                        self.tree.delete(item)
-                        break
+                os.remove(row.path)
+                deleted.append(row.path)
+                self.yft_table.remove(item_id)
             except Exception as e:
-                failed.append((fp, str(e)))
+                failed.append((row.path, str(e)))
 
         if deleted:
             messagebox.showinfo("Success", f"Successfully deleted {len(deleted)} files.")
-            self.yft_cleaner.deletable_files = [df for df in self.yft_cleaner.deletable_files if df[0] not in deleted]
+            deleted_set = set(deleted)
+            self.yft_cleaner.deletable_files = [df for df in self.yft_cleaner.deletable_files if df.path not in deleted_set]
+            self.results_changed.add("yft")
 
         if failed:
             err_msg = "\n".join([f"{p}: {msg}" for p, msg in failed])
@@ -1116,32 +7169,10 @@ class GUI_MAIN:
         self.status.set("Scan Completed.")
 
     def select_all_yft(self):
-        for item in self.tree.get_children():
-            self.tree.set(item, "select", "☑")
+        self.yft_table.select_all()
 
     def sort_tree(self, column):
-        if self.sort_column == column:
-            self.sort_reverse = not self.sort_reverse
-        else:
-            self.sort_reverse = False
-            self.sort_column = column
-
-        def sort_key(item_id):
-            value = self.tree.set(item_id, column)
-            if column == "size":
-                try:
-                    if '/' in value:
-                        parts = value.split('/')
-                        return max(float(parts[0].split(':')[1]), float(parts[1].split(':')[1]))
-                    else:
-                        return float(value.split(' ')[0])
-                except:
-                    return 0.0
-            return value.lower()
-
-        sorted_items = sorted(self.tree.get_children(), key=sort_key, reverse=self.sort_reverse)
-        for idx, item_id in enumerate(sorted_items):
-            self.tree.move(item_id, '', idx)
+        self.yft_table.sort(column)
 
     # Stream Duplicate Checker Events
     def browse_stream_directory(self):
@@ -1149,71 +7180,148 @@ class GUI_MAIN:
         if directory:
             self.stream_root_directory.set(directory)
 
-    def start_stream_scan(self):
-        if not self.stream_root_directory.get():
+    def browse_listing(self):
+        file_path = filedialog.askopenfilename(
+            filetypes=[("File listings", "*.txt *.lst *.ndjson *.manifest *.gz"), ("All files", "*.*")],
+            title="Select File Listing"
+        )
+        if file_path:
+            self.listing_path_var.set(file_path)
+
+    def prepare_stream_checker(self):
+        """
+        Point the stream checker at the file listing when one is set, otherwise at the Stream root directory.
+        With a listing the root only serves to shorten paths and may name a folder on another machine.
+        Returns False after telling the user when there is nothing to scan.
+        """
+        listing = self.listing_path_var.get().strip()
+        if listing:
+            if not os.path.isfile(listing):
+                messagebox.showerror("Error", "The file listing does not exist.")
+                return False
+        elif not self.stream_root_directory.get():
             messagebox.showwarning("Warning", "No directory selected.")
+            return False
+        elif not os.path.isdir(self.stream_root_directory.get()):
+            messagebox.showerror("Error", "No directory or invalid path selected.")
+            return False
+        if not self.stream_checker:
+            self.stream_checker = StreamDuplicateChecker()
+        self.stream_checker.walker = FileListing(listing) if listing else DirectoryWalker()
+        if self.base_game_var.get():
+            if self.base_game_index is None:
+                self.base_game_index = BaseGameIndex.load_default()
+            self.stream_checker.base_game = self.base_game_index
+        else:
+            self.stream_checker.base_game = None
+        return True
+
+    def load_base_game_list(self):
+        file_path = filedialog.askopenfilename(
+            filetypes=[("Name lists", "*.txt *.lst"), ("All files", "*.*")],
+            title="Select Base-Game File List (one name per line)"
+        )
+        if not file_path:
             return
-        if not os.path.isdir(self.stream_root_directory.get()):
-            messagebox.showerror("Error", "No duplicate files found.")
+        try:
+            if self.base_game_index:
+                self.base_game_index.close()
+                self.base_game_index = None
+            count = BaseGameIndex.build(file_path)
+            self.base_game_index = BaseGameIndex.load_default()
+        except Exception as e:
+            messagebox.showerror("Error", f"Error: {e}")
             return
+        self.base_game_var.set(True)
+        self.status.set(f"Base-game list loaded - {count} names.")
 
-        for item in self.stream_tree.get_children():
-            self.stream_tree.delete(item)
-        if not self.stream_checker:
-            self.stream_checker = StreamDuplicateChecker()
+    def serving_client(self):
+        """
+        An IndexClient when a running index service covers the Stream root and no listing is used, else None.
+        """
+        if self.listing_path_var.get().strip():
+            return None
+        client = IndexClient()
+        return client if client.serves(self.stream_root_directory.get()) else None
+
+    def start_stream_scan(self, keep_rows=False):
+        """
+        Scan the Stream root. With keep_rows the current rows stay visible until the new results replace them.
+        """
+        if not self.prepare_stream_checker():
+            return
+
+        self.cancel_restore("stream")
+        if not keep_rows:
+            self.stream_table.clear()
 
         self.stream_checker.duplicate_files.clear()
-        self.total_stream_files = 0
-        self.processed_stream_files = 0
-        self.stream_progress["value"] = 0
-        self.stream_lbl_progress.config(text="Progress: 0/0")
         self.status.set("Scanning...")
 
-        threading.Thread(target=self.scan_stream_thread, daemon=True).start()
+        progress = ScanProgress()
+        self.track_progress(progress, self.stream_progress, self.stream_lbl_progress)
+        threading.Thread(target=self.scan_stream_thread, args=(progress,), daemon=True).start()
 
-    def scan_stream_thread(self):
+    def scan_stream_thread(self, progress):
         try:
-            all_files = self.stream_checker.find_stream_files(self.stream_root_directory.get())
-            self.total_stream_files = len(all_files)
-            duplicates = self.stream_checker.scan_stream_duplicates(self.stream_root_directory.get())
-            self.processed_stream_files = self.total_stream_files
-            self.update_stream_progress()
+            stream_root = self.stream_root_directory.get()
+            client = self.serving_client()
+            if client:
+                stream_files = client.query("files")
+                progress.discover(len(stream_files))
+                duplicates = self.stream_checker.group_stream_files(stream_files, progress)
+            else:
+                duplicates = self.stream_checker.scan_stream_duplicates(stream_root, progress,
+                                                                        self.include_archives_var.get())
+            progress.finish("Scan Completed")
+            self.save_snapshot("stream", stream_root, self.snapshot_files(self.stream_checker.stream_files, stream_root), duplicates)
             
-            if duplicates:
+            if duplicates or self.stream_checker.hash_collisions or self.stream_checker.base_game_overrides:
                 self.populate_stream_treeview(duplicates)
-                self.status.set("Scan Completed.")
+                self.save_results("stream", stream_root, self.stream_table.all_rows())
+                self.status.set(f"Scan Completed. - {len(duplicates)} duplicate names, "
+                                f"{len(self.stream_checker.hash_collisions)} names with hash collisions, "
+                                f"{len(self.stream_checker.base_game_overrides)} base-game overrides.")
             else:
+                self.stream_table.clear()
+                self.save_results("stream", stream_root, [])
                 self.status.set("No duplicate files found.")
         except Exception as e:
             self.status.set(f"Error: {e}")
-
-    def update_stream_progress(self):
-        if self.total_stream_files > 0:
-            p = (self.processed_stream_files / self.total_stream_files) * 100
-            self.stream_progress["value"] = p
-            self.stream_lbl_progress.config(text=f"Progress: {self.processed_stream_files}/{self.total_stream_files}")
-        self.root.update_idletasks()
+        finally:
+            progress.finish(progress.phase)
 
     def populate_stream_treeview(self, duplicates):
-        stream_root = self.stream_root_directory.get()
+        self.stream_root_dir = self.stream_root_directory.get()
+        collisions = self.stream_checker.hash_collisions
+        overrides = self.stream_checker.base_game_overrides
+        rows = []
         for file_name, locations in duplicates.items():
-            relative_locations = []
-            for loc in locations:
-                try:
-                    rel_loc = os.path.relpath(loc, stream_root)
-                except ValueError:
-                    rel_loc = loc
-                relative_locations.append(rel_loc)
-            loc_str = '; '.join(relative_locations)
-            item_id = self.stream_tree.insert("", tk.END, values=("☐", file_name, loc_str))
-            
-            # Highlight critical files
-            if self.stream_checker.is_critical_file(file_name):
-                self.stream_tree.tag_configure("critical_duplicate", background="lightyellow")
-                self.stream_tree.item(item_id, tags=("critical_duplicate",))
-            else:
-                self.stream_tree.tag_configure("duplicate", background="lightcoral")
-                self.stream_tree.item(item_id, tags=("duplicate",))
+            is_critical = self.stream_checker.is_critical_file(file_name)
+            file_type = self.stream_checker.get_critical_file_type(file_name) if is_critical else ""
+            rows.append(StreamDuplicateResult(file_name, list(locations), is_critical, file_type,
+                                              tuple(collisions.get(file_name, ())), file_name in overrides))
+        for file_name in sorted(set(collisions) | set(overrides)):
+            if file_name not in duplicates:
+                rows.append(StreamDuplicateResult(file_name, list(self.stream_checker.name_locations.get(file_name, [])),
+                                                  hash_collides_with=tuple(collisions.get(file_name, ())),
+                                                  overrides_base_game=file_name in overrides))
+        self.stream_table.load(rows)
+
+    @staticmethod
+    def stream_row_tag(row):
+        if len(row.locations) < 2:
+            return "hash_collision" if row.hash_collides_with else "base_game"
+        return "critical_duplicate" if row.is_critical else "duplicate"
+
+    def stream_row_values(self, row):
+        loc_str = '; '.join(self.relative_location(loc, self.stream_root_dir) for loc in row.locations)
+        name = row.name
+        if row.overrides_base_game:
+            name += " [overrides base game]"
+        if row.hash_collides_with:
+            name += f" [hash collision: {', '.join(row.hash_collides_with)}]"
+        return ("☑" if row.selected else "☐", name, loc_str)
 
     def handle_click_stream(self, event):
         region = self.stream_tree.identify("region", event.x, event.y)
@@ -1223,9 +7331,7 @@ class GUI_MAIN:
         if column == "#1":
             row_id = self.stream_tree.identify_row(event.y)
             if row_id:
-                current_value = self.stream_tree.set(row_id, "select")
-                new_value = "☑" if current_value == "☐" else "☐"
-                self.stream_tree.set(row_id, "select", new_value)
+                self.stream_table.toggle_selected(row_id)
 
     def show_stream_context_menu(self, event):
         row_id = self.stream_tree.identify_row(event.y)
@@ -1233,15 +7339,14 @@ class GUI_MAIN:
             self.stream_tree.selection_set(row_id)
             self.right_clicked_row = row_id
             self.stream_context_menu.delete(0, tk.END)
-            duplicate_file = self.stream_tree.set(row_id, "duplicate_file")
-            locations_str = self.stream_tree.set(row_id, "locations")
-            locations = locations_str.split('; ')
+            row = self.stream_table.row(row_id)
+            duplicate_file = row.name
+            locations = list(row.locations)
             
             # Check if it's a critical file
-            if self.stream_checker.is_critical_file(duplicate_file):
-                file_type = self.stream_checker.get_critical_file_type(duplicate_file)
+            if row.is_critical:
                 self.stream_context_menu.add_command(
-                    label=f"⚠️ Critical File: {file_type}",
+                    label=f"⚠️ Critical File: {row.file_type}",
                     state=tk.DISABLED
                 )
                 self.stream_context_menu.add_separator()
@@ -1252,13 +7357,14 @@ class GUI_MAIN:
             )
             self.stream_context_menu.add_separator()
             for loc in locations:
-                full_path = os.path.join(self.stream_root_directory.get(), loc, duplicate_file)
+                full_path = os.path.join(loc, duplicate_file)
+                rel_loc = self.relative_location(loc, self.stream_root_dir)
                 self.stream_context_menu.add_command(
-                    label=f"📁 {loc}",
+                    label=f"📁 {rel_loc}",
                     command=lambda path=full_path: self.open_folder_for_stream_file(path)
                 )
                 self.stream_context_menu.add_command(
-                    label=f"🗑️ Delete {loc}",
+                    label=f"🗑️ Delete {rel_loc}",
                     command=lambda path=full_path: self.delete_stream_file(path)
                 )
             self.stream_context_menu.add_separator()
@@ -1297,20 +7403,21 @@ class GUI_MAIN:
 
     def update_stream_tree_after_delete(self, file_path):
         basename = os.path.basename(file_path)
-        rel_loc = os.path.relpath(os.path.dirname(file_path), self.stream_root_directory.get())
-        for item in self.stream_tree.get_children():
-            if self.stream_tree.set(item, "duplicate_file") == basename:
-                locations_str = self.stream_tree.set(item, "locations")
-                locations = locations_str.split('; ')
-                if rel_loc in locations:
-                    locations.remove(rel_loc)
-                    if len(locations) <= 1:
-                        self.stream_tree.delete(item)
-                        self.stream_checker.duplicate_files.pop(basename, None)
-                    else:
-                        new_loc_str = '; '.join(locations)
-                        self.stream_tree.set(item, "locations", new_loc_str)
-                break
+        dirname = os.path.normcase(os.path.normpath(os.path.dirname(file_path)))
+        for item_id, row in self.stream_table.items():
+            if row.name != basename:
+                continue
+            remaining = [loc for loc in row.locations if os.path.normcase(os.path.normpath(loc)) != dirname]
+            if len(remaining) != len(row.locations):
+                row.locations = remaining
+                self.results_changed.add("stream")
+                if len(remaining) <= 1:
+                    self.stream_table.remove(item_id)
+                    self.stream_checker.duplicate_files.pop(basename, None)
+                else:
+                    self.stream_checker.duplicate_files[basename] = remaining
+                    self.stream_table.refresh(item_id)
+            break
 
     def delete_all_stream_duplicates(self, duplicate_file, locations):
         confirm = messagebox.askyesno("Confirm Deletion", f"Are you sure you want to delete the selected duplicate files?\n{duplicate_file}")
@@ -1319,7 +7426,7 @@ class GUI_MAIN:
         deleted = []
         failed = []
         for loc in locations:
-            full_path = os.path.join(self.stream_root_directory.get(), loc, duplicate_file)
+            full_path = os.path.join(loc, duplicate_file)
             try:
                 os.remove(full_path)
                 deleted.append(full_path)
@@ -1327,11 +7434,12 @@ class GUI_MAIN:
                 failed.append((full_path, str(e)))
         if deleted:
             messagebox.showinfo("Success", f"Successfully deleted {len(deleted)} duplicate files.")
-            for item in self.stream_tree.get_children():
-                if self.stream_tree.set(item, "duplicate_file") == duplicate_file:
-                    self.stream_tree.delete(item)
+            for item_id, row in self.stream_table.items():
+                if row.name == duplicate_file:
+                    self.stream_table.remove(item_id)
                     break
             self.stream_checker.duplicate_files.pop(duplicate_file, None)
+            self.results_changed.add("stream")
         if failed:
             err_msg = "\n".join([f"{p}: {msg}" for p, msg in failed])
             messagebox.showerror("Error", f"Failed to delete the following duplicate files:\n{err_msg}")
@@ -1359,62 +7467,48 @@ class GUI_MAIN:
             messagebox.showerror("Error", f"Error: {e}")
 
     def save_stream_to_file(self):
-        duplicates = self.stream_checker.duplicate_files
-        if not duplicates:
+        rows = self.stream_table.rows()
+        if not rows:
             messagebox.showinfo("Info", "No duplicate files found.")
             return
         file_path = filedialog.asksaveasfilename(
             defaultextension=".txt",
-            filetypes=[("Text files", "*.txt"), ("All files", "*.*")],
+            filetypes=EXPORT_FILETYPES,
             title="Save Duplicates to File"
         )
         if file_path:
+
+            def write_text(f):
+                for row in rows:
+                    if row.is_critical:
+                        f.write(f"{row.name} [{row.file_type}]:\n")
+                    else:
+                        f.write(f"{row.name}:\n")
+                    for loc in row.locations:
+                        f.write(f"{loc}\n")
+                    f.write("\n")
+
             try:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    for file, locs in duplicates.items():
-                        if self.stream_checker.is_critical_file(file):
-                            file_type = self.stream_checker.get_critical_file_type(file)
-                            f.write(f"{file} [{file_type}]:\n")
-                        else:
-                            f.write(f"{file}:\n")
-                        for loc in locs:
-                            f.write(f"{loc}\n")
-                        f.write("\n")
+                self.export_rows(
+                    rows, file_path, StreamDuplicateResult.EXPORT_FIELDS, self.stream_root_dir,
+                    "Stream Duplicates Report", write_text,
+                    row_class=lambda record: "critical_duplicate" if record["is_critical"] else "duplicate",
+                )
                 messagebox.showinfo("Success", f"Duplicate file list saved to {file_path}.")
             except Exception as e:
                 messagebox.showerror("Error", f"Error: {e}")
 
     def select_all_stream(self):
-        for item in self.stream_tree.get_children():
-            self.stream_tree.set(item, "select", "☑")
+        self.stream_table.select_all()
 
     def sort_stream_tree(self, column):
-        if self.sort_column == column:
-            self.sort_reverse = not self.sort_reverse
-        else:
-            self.sort_reverse = False
-            self.sort_column = column
-
-        def sort_key(item_id):
-            return self.stream_tree.set(item_id, column).lower()
-
-        sorted_items = sorted(self.stream_tree.get_children(), key=sort_key, reverse=self.sort_reverse)
-        for idx, item_id in enumerate(sorted_items):
-            self.stream_tree.move(item_id, '', idx)
+        self.stream_table.sort(column)
 
     def check_manual_duplicates(self):
         stream_root = self.stream_root_directory.get()
-        if not stream_root:
-            messagebox.showwarning("Warning", "No directory selected.")
-            return
-
-        if not os.path.isdir(stream_root):
-            messagebox.showerror("Error", "No directory or invalid path selected.")
+        if not self.prepare_stream_checker():
             return
 
-        if not self.stream_checker:
-            self.stream_checker = StreamDuplicateChecker()
-
         user_text = self.txt_manual.get("1.0", tk.END)
         file_list = [line.strip() for line in user_text.splitlines() if line.strip()]
 
@@ -1422,17 +7516,16 @@ class GUI_MAIN:
         self.txt_manual.insert(tk.END, "Manual Check Results:\n\n")
         self.root.update_idletasks()
 
-        all_stream_files = self.stream_checker.find_stream_files(stream_root)
-
-        file_map = {}
-        for fp in all_stream_files:
-            basename = os.path.basename(fp)
-            file_map.setdefault(basename, []).append(fp)
+        client = self.serving_client()
+        if client:
+            file_map = client.query("check", body=file_list)
+        else:
+            file_map = self.stream_checker.check_file_list(stream_root, file_list)
 
         result_lines = []
         for target_filename in file_list:
-            if target_filename in file_map:
-                found_locations = file_map[target_filename]
+            found_locations = file_map.get(target_filename)
+            if found_locations:
                 if self.stream_checker.is_critical_file(target_filename):
                     file_type = self.stream_checker.get_critical_file_type(target_filename)
                     result_lines.append(f"{target_filename} [{file_type}]:")
@@ -1457,5 +7550,473 @@ class GUI_MAIN:
         app = GUI_MAIN(root)
         root.mainloop()
 
+# ----------------------------------------#
+# 13. Command Line
+# ----------------------------------------#
+def _cli_export(rows, output, fields, root_dir, title, text_line):
+    """
+    Write CLI results to output: plain text lines for .txt, otherwise CSV/NDJSON/HTML.
+    """
+    if ReportExporter.format_for(output) == 'text':
+        with open(output, 'w', encoding='utf-8', buffering=ReportExporter.BUFFER_SIZE) as f:
+            for row in rows:
+                f.write(text_line(row) + "\n")
+    else:
+        ReportExporter(fields, title).export((row.to_record(root_dir) for row in rows), output)
+
+
+def _cli_progress():
+    """
+    A ScanProgress reporter that prints one status line to stderr per second.
+    """
+    return ProgressReporter(ScanProgress(), lambda snapshot: print(snapshot.describe(), file=sys.stderr))
+
+
+def _cli_io_budget(args):
+    """
+    IoBudget from the --low-impact/--max-mb-per-sec/--max-iops options.
+    """
+    if args.low_impact:
+        IoBudget.lower_priority()
+    return IoBudget(args.max_mb_per_sec, args.max_iops, background=args.low_impact)
+
+
+def _cli_diff(args):
+    old_header, new_header, changes = compare_scan_files(args.old, args.new)
+    text_line = lambda change: f"{change.change}\t{change.name}\t{change.old}\t{change.new}"
+    for change in changes:
+        print(text_line(change))
+    summary = ScanSnapshot.summarize(changes)
+    print(f"{old_header.get('created')} -> {new_header.get('created')}: "
+          + (", ".join(f"{count} {change.lower()}" for change, count in sorted(summary.items())) or "No changes"),
+          file=sys.stderr)
+    if args.output:
+        _cli_export(changes, args.output, SnapshotChange.EXPORT_FIELDS, "", "Scan Diff Report", text_line)
+    return 0
+
+
+def _cli_manifest(args):
+    with _cli_progress() as progress:
+        count = AssetManifest(max_workers=args.workers, io_budget=_cli_io_budget(args)).write(args.output, args.root, progress)
+        progress.finish("Manifest Saved")
+    print(f"{count} files written to {args.output}.", file=sys.stderr)
+    return 0
+
+
+def _cli_textures(args):
+    deduplicator = TextureDeduplicator(max_workers=args.workers)
+    with _cli_progress() as progress:
+        shared = deduplicator.scan(args.root, progress=progress)
+        progress.finish("Scan Completed")
+    text_line = lambda t: (f"{', '.join(t.names)}\t{t.width}x{t.height} {texture_format_name(t.fmt)}"
+                           f"\t{t.copies} copies\t{t.wasted_bytes} bytes wasted")
+    for texture in shared:
+        print(text_line(texture))
+    print(f"{len(shared)} shared textures, {sum(t.wasted_bytes for t in shared) / MB:.2f} MB wasted.", file=sys.stderr)
+    if args.output:
+        _cli_export(shared, args.output, SharedTexture.EXPORT_FIELDS, args.root, "Shared Textures Report", text_line)
+    return 0
+
+
+def _cli_checker(args):
+    """
+    A StreamDuplicateChecker reading the --listing file when given, otherwise walking ROOT.
+    """
+    return StreamDuplicateChecker(FileListing(args.listing) if args.listing else None)
+
+
+def _cli_duplicates(args):
+    checker = _cli_checker(args)
+    summary = {"groups": 0}
+
+    def rows():
+        for name, locations in checker.iter_stream_duplicates(args.root, args.memory_limit, progress, args.temp_dir):
+            summary["groups"] += 1
+            is_critical = checker.is_critical_file(name)
+            yield StreamDuplicateResult(name, locations, is_critical,
+                                        checker.get_critical_file_type(name) if is_critical else "")
+
+    text_line = lambda row: f"{row.name}\t{len(row.locations)}\t" + '; '.join(
+        relative_location(loc, args.root) for loc in row.locations)
+    with _cli_progress() as progress:
+        try:
+            if args.output:
+                _cli_export(rows(), args.output, StreamDuplicateResult.EXPORT_FIELDS, args.root,
+                            "Stream Duplicates Report", text_line)
+            else:
+                for row in rows():
+                    print(text_line(row))
+        except OSError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        progress.finish("Scan Completed")
+    print(f"{summary['groups']} duplicated file names.", file=sys.stderr)
+    return 0
+
+
+def _cli_critical(args):
+    checker = _cli_checker(args)
+    with _cli_progress() as progress:
+        try:
+            groups = checker.scan_critical_files(args.root, progress)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        progress.finish("Scan Completed")
+    rows = []
+    for name, locations in sorted(groups.items()):
+        rule = checker.critical_types.get(name)
+        row = CriticalFileResult(name, locations, rule.category if rule else CriticalClassifier.FALLBACK_CATEGORY,
+                                 rule.severity if rule else "Critical")
+        if row.is_conflict or args.all:
+            rows.append(row)
+    text_line = lambda row: f"{row.file_type}\t{row.name}\t{row.status_str}\t" + '; '.join(
+        relative_location(loc, args.root) for loc in row.locations)
+    for row in rows:
+        print(text_line(row))
+    print(f"{len(groups)} critical files, {sum(1 for locs in groups.values() if len(locs) > 1)} with conflicts.",
+          file=sys.stderr)
+    if args.output:
+        _cli_export(rows, args.output, CriticalFileResult.EXPORT_FIELDS, args.root, "Critical Files Report", text_line)
+    return 0
+
+
+def _cli_check(args):
+    names = args.names or [line.strip() for line in sys.stdin if line.strip()]
+    found = _cli_checker(args).check_file_list(args.root, names)
+    missing = 0
+    for name, paths in found.items():
+        if not paths:
+            missing += 1
+            print(f"{name} -> NOT FOUND")
+        elif len(paths) == 1:
+            print(f"{name} -> {paths[0]}")
+        else:
+            print(f"{name} (Duplicate(s) Found in:) " + '; '.join(paths))
+    print(f"{len(found) - missing} of {len(found)} files found.", file=sys.stderr)
+    return 1 if missing else 0
+
+
+def _cli_compression(args):
+    advisor = CompressionAdvisor(args.ratio, args.min_kb, io_budget=_cli_io_budget(args))
+    with _cli_progress() as progress:
+        assets = advisor.scan(args.root, not args.no_archives, progress)
+        progress.finish("Scan Completed")
+    if args.by_resource:
+        rows = CompressionAdvisor.by_resource(assets)
+        fields, title = ResourceCompression.EXPORT_FIELDS, "Resource Compression Report"
+        text_line = lambda r: (f"{r.resource or '-'}\t{r.files} files\t{r.download_bytes / MB:.2f} MB download\t"
+                               f"{r.ratio * 100:.1f}%\t{r.flagged} flagged ({r.flagged_bytes / MB:.2f} MB)")
+    else:
+        rows = [asset for asset in assets if asset.flags or args.all]
+        fields, title = CompressedAsset.EXPORT_FIELDS, "Compression Report"
+        text_line = lambda a: (f"{a.flags_str}\t{a.download_bytes / MB:.2f} MB\t{a.ratio * 100:.1f}%\t"
+                               f"{relative_location(a.path, args.root)}")
+    for row in rows:
+        print(text_line(row))
+    flagged = [asset for asset in assets if asset.flags]
+    print(f"{len(assets)} resources, {sum(a.download_bytes for a in assets) / MB:.2f} MB to download; "
+          f"{len(flagged)} flagged ({sum(a.download_bytes for a in flagged) / MB:.2f} MB).", file=sys.stderr)
+    if args.output:
+        _cli_export(rows, args.output, fields, args.root, title, text_line)
+    return 0
+
+
+def _cli_overrides(args):
+    if args.names:
+        print(f"{BaseGameIndex.build(args.names)} base-game names indexed.", file=sys.stderr)
+    checker = _cli_checker(args)
+    checker.base_game = BaseGameIndex.load_default()
+    if checker.base_game is None:
+        print("Error: no base-game list loaded; pass --names LIST once to build it.", file=sys.stderr)
+        return 2
+    with _cli_progress() as progress:
+        checker.scan_stream_duplicates(args.root, progress)
+        progress.finish("Scan Completed")
+    rows = [StreamDuplicateResult(name, list(locations), overrides_base_game=True)
+            for name, locations in sorted(checker.base_game_overrides.items())]
+    text_line = lambda row: f"{row.name}\t" + '; '.join(relative_location(loc, args.root) for loc in row.locations)
+    for row in rows:
+        print(text_line(row))
+    print(f"{len(rows)} stream files override base-game assets.", file=sys.stderr)
+    if args.output:
+        _cli_export(rows, args.output, StreamDuplicateResult.EXPORT_FIELDS, args.root, "Base-Game Overrides Report",
+                    text_line)
+    return 0
+
+
+def _cli_lods(args):
+    cleaner = YftCleaner(io_budget=_cli_io_budget(args))
+    with _cli_progress() as progress:
+        comparisons = cleaner.compare_lods(args.root, progress)
+        progress.finish("Scan Completed")
+    rows = [c for c in comparisons if c.redundant or not args.redundant]
+    text_line = lambda c: (f"{c.verdict}\t{relative_location(c.path, args.root)}\t"
+                           f"_hi: {c.hi_lods.describe() if c.hi_lods else '?'}\t"
+                           f"original: {c.original_lods.describe() if c.original_lods else '?'}")
+    for row in rows:
+        print(text_line(row))
+    print(f"{len(comparisons)} _hi files, {sum(1 for c in comparisons if c.redundant)} add no High LOD detail.",
+          file=sys.stderr)
+    if args.output:
+        _cli_export(rows, args.output, HiLodComparison.EXPORT_FIELDS, args.root, "_hi LOD Report", text_line)
+    return 0
+
+
+def _cli_oversize(args):
+    cleaner = YftCleaner(io_budget=_cli_io_budget(args))
+    with _cli_progress() as progress:
+        results = cleaner.scan_oversized(args.root, SizeStatus.from_label(args.min_status), not args.no_archives, progress)
+        progress.finish("Scan Completed")
+    text_line = lambda r: f"{r.status.label}\t{r.size_str}\t{relative_location(r.path, args.root)}"
+    for result in results:
+        print(text_line(result))
+    print(f"{len(results)} oversized resources.", file=sys.stderr)
+    if args.output:
+        _cli_export(results, args.output, YftResult.EXPORT_FIELDS, args.root, "Oversized Resources Report", text_line)
+    return 0
+
+
+def _cli_serve(args):
+    service = IndexService(args.root, args.archives, args.interval, args.host, args.port)
+    print(f"Indexing {service.root_dir} and serving on http://{args.host}:{args.port} ...", file=sys.stderr)
+    try:
+        service.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def _cli_query(args):
+    client = IndexClient(args.host, args.port)
+    params, body = {}, None
+    if args.query == "duplicates" and args.values:
+        params["name"] = args.values[0]
+    elif args.query == "conflicts":
+        if not args.values:
+            print("Error: conflicts needs a resource name", file=sys.stderr)
+            return 2
+        params["resource"] = args.values[0]
+    elif args.query == "check":
+        body = args.values or [line.strip() for line in sys.stdin if line.strip()]
+    elif args.query == "oversize" and args.values:
+        params["min_status"] = args.values[0]
+    elif args.query == "compression" and args.values:
+        params["resource"] = args.values[0]
+    elif args.query == "refresh":
+        body = {}
+    try:
+        result = client.query(args.query, params, body)
+    except (OSError, RuntimeError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+def _cli_archetypes(args):
+    indexer = ArchetypeIndexer(max_workers=args.workers)
+    with _cli_progress() as progress:
+        collisions = indexer.scan(args.root, progress=progress)
+        progress.finish("Scan Completed")
+    text_line = lambda c: f"{c.display_name}\thash_{c.name_hash:08X}\t" + '; '.join(
+        relative_location(path, args.root) for path in c.files)
+    for collision in collisions:
+        print(text_line(collision))
+    print(f"{len(collisions)} archetype collisions, {sum(1 for c in collisions if c.cross_resource)} across resources.",
+          file=sys.stderr)
+    if args.output:
+        _cli_export(collisions, args.output, ArchetypeCollision.EXPORT_FIELDS, args.root,
+                    "Archetype Collisions Report", text_line)
+    return 0
+
+
+def _cli_plan(args):
+    io_budget = _cli_io_budget(args)
+    cleaner, checker = YftCleaner(io_budget=io_budget, lod_aware=args.lod_aware), StreamDuplicateChecker()
+    with _cli_progress() as progress:
+        hi_results = cleaner.scan_files(args.root, progress, args.time_budget)
+        progress.finish("Time Budget Reached" if cleaner.budget_exhausted else "Scan Completed")
+    with _cli_progress() as progress:
+        checker.scan_stream_duplicates(args.root, progress)
+        planner = CleanupPlanner(max_workers=args.workers, io_budget=io_budget)
+        planner.add_hi_duplicates(hi_results)
+        planner.add_stream_duplicates(checker, progress)
+        progress.finish("Plan Completed")
+    plan = planner.plan(None if args.target is None else int(args.target * MB), args.rank)
+    freed, skipped = planner.execute(plan, dry_run=not args.execute)
+    text_line = lambda a: (f"{a.status}\t{a.kind}\t{a.disk_bytes / MB:.2f} MB\t{a.memory_bytes / MB:.2f} MB"
+                           f"\t{relative_location(a.path, args.root)}")
+    for action in plan:
+        print(text_line(action))
+    memory = sum(a.memory_bytes for a in plan if not a.status.startswith("Skipped"))
+    print(f"{len(plan) - len(skipped)} files {'deleted' if args.execute else 'would be deleted'}: "
+          f"{freed / MB:.2f} MB on disk, {memory / MB:.2f} MB streaming memory"
+          + (f", {len(skipped)} skipped." if skipped else "."), file=sys.stderr)
+    if args.output:
+        _cli_export(plan, args.output, CleanupAction.EXPORT_FIELDS, args.root, "Cleanup Plan", text_line)
+    return 1 if skipped and args.execute else 0
+
+
+def _cli_orphans(args):
+    analyzer = DependencyAnalyzer(max_workers=args.workers)
+    with _cli_progress() as progress:
+        orphans = analyzer.scan(args.root, progress=progress)
+        progress.finish("Scan Completed")
+    text_line = lambda o: f"{o.size_bytes / MB:.2f} MB\t{relative_location(o.path, args.root)}"
+    for orphan in orphans:
+        print(text_line(orphan))
+    print(f"{len(orphans)} unreferenced assets, {sum(o.size_bytes for o in orphans) / MB:.2f} MB "
+          f"({len(analyzer.referenced)} names referenced).", file=sys.stderr)
+    if args.output:
+        _cli_export(orphans, args.output, OrphanAsset.EXPORT_FIELDS, args.root, "Orphaned Assets Report", text_line)
+    return 0
+
+
+def run_cli(argv):
+    """
+    Command line entry point. Running without arguments starts the GUI instead.
+    """
+    parser = argparse.ArgumentParser(prog="StreamFileAssistant", description="Stream Files Assistant Extended")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    # Shared by the commands that can read a file listing instead of walking ROOT.
+    listing_options = argparse.ArgumentParser(add_help=False)
+    listing_options.add_argument("--listing", default=None,
+                                 help="Read paths from this listing (find output, NDJSON or a manifest) instead of walking ROOT")
+
+    # Shared by the commands that hash files or read resource headers.
+    io_options = argparse.ArgumentParser(add_help=False)
+    io_options.add_argument("--low-impact", action="store_true",
+                            help="Run at low CPU/I-O priority and keep scanned files out of the page cache")
+    io_options.add_argument("--max-mb-per-sec", type=float, default=0.0, help="Read at most this many MB/s (default: unlimited)")
+    io_options.add_argument("--max-iops", type=float, default=0.0, help="At most this many reads per second (default: unlimited)")
+
+    parser_diff = subparsers.add_parser("diff", help="Compare two scan snapshots or two asset manifests")
+    parser_diff.add_argument("old", help="Older snapshot (.snap) or reference manifest")
+    parser_diff.add_argument("new", help="Newer snapshot (.snap) or manifest to check against it")
+    parser_diff.add_argument("-o", "--output", help="Also write the changes to a .txt/.csv/.ndjson/.html file")
+    parser_diff.set_defaults(handler=_cli_diff)
+
+    parser_manifest = subparsers.add_parser("manifest", parents=[io_options], help="Write a content-addressed manifest of the stream assets")
+    parser_manifest.add_argument("root", help="Server root directory")
+    parser_manifest.add_argument("-o", "--output", required=True, help="Manifest file (.manifest, or .manifest.gz to compress)")
+    parser_manifest.add_argument("-w", "--workers", type=int, default=None, help="Parallel hashing workers")
+    parser_manifest.set_defaults(handler=_cli_manifest)
+
+    parser_textures = subparsers.add_parser("textures", help="Find identical textures embedded in several resources")
+    parser_textures.add_argument("root", help="Server root directory")
+    parser_textures.add_argument("-o", "--output", help="Also write the results to a .txt/.csv/.ndjson/.html file")
+    parser_textures.add_argument("-w", "--workers", type=int, default=None, help="Parallel decode workers")
+    parser_textures.set_defaults(handler=_cli_textures)
+
+    parser_archetypes = subparsers.add_parser("archetypes", help="Find archetype names defined by several .ytyp files")
+    parser_archetypes.add_argument("root", help="Server root directory")
+    parser_archetypes.add_argument("-o", "--output", help="Also write the results to a .txt/.csv/.ndjson/.html file")
+    parser_archetypes.add_argument("-w", "--workers", type=int, default=None, help="Parallel parse workers")
+    parser_archetypes.set_defaults(handler=_cli_archetypes)
+
+    parser_orphans = subparsers.add_parser("orphans", help="List .ydr/.yft/.ytd files nothing references")
+    parser_orphans.add_argument("root", help="Server root directory")
+    parser_orphans.add_argument("-o", "--output", help="Also write the results to a .txt/.csv/.ndjson/.html file")
+    parser_orphans.add_argument("-w", "--workers", type=int, default=None, help="Parallel parse workers")
+    parser_orphans.set_defaults(handler=_cli_orphans)
+
+    parser_duplicates = subparsers.add_parser("duplicates", parents=[listing_options], help="Find duplicate stream files with bounded memory")
+    parser_duplicates.add_argument("root", help="Server root directory")
+    parser_duplicates.add_argument("-o", "--output", help="Write the results to a .txt/.csv/.ndjson/.html file instead of stdout")
+    parser_duplicates.add_argument("-m", "--memory-limit", type=float, default=256.0,
+                                   help="MB of file records to hold before spilling sorted runs to disk (default 256)")
+    parser_duplicates.add_argument("--temp-dir", default=None, help="Folder for spilled runs (default: system temp)")
+    parser_duplicates.set_defaults(handler=_cli_duplicates)
+
+    parser_critical = subparsers.add_parser("critical", parents=[listing_options],
+                                            help="List critical config files found more than once")
+    parser_critical.add_argument("root", help="Server root directory (as written in the listing, with --listing)")
+    parser_critical.add_argument("-o", "--output", help="Also write the results to a .txt/.csv/.ndjson/.html file")
+    parser_critical.add_argument("--all", action="store_true", help="List single instances too")
+    parser_critical.set_defaults(handler=_cli_critical)
+
+    parser_check = subparsers.add_parser("check", parents=[listing_options],
+                                         help="Look up file names in the stream folders (manual list check)")
+    parser_check.add_argument("root", help="Server root directory (as written in the listing, with --listing)")
+    parser_check.add_argument("names", nargs="*", help="File names to look up (default: one per line on stdin)")
+    parser_check.set_defaults(handler=_cli_check)
+
+    parser_compression = subparsers.add_parser("compression", parents=[io_options],
+                                               help="Rank stream resources by download size and compression ratio")
+    parser_compression.add_argument("root", help="Server root directory")
+    parser_compression.add_argument("-o", "--output", help="Also write the results to a .txt/.csv/.ndjson/.html file")
+    parser_compression.add_argument("--by-resource", action="store_true", help="Totals per resource instead of per file")
+    parser_compression.add_argument("--all", action="store_true", help="List resources that are not flagged too")
+    parser_compression.add_argument("--ratio", type=float, default=0.9,
+                                    help="Download/content ratio from which a resource counts as uncompressed (default 0.9)")
+    parser_compression.add_argument("--min-kb", type=float, default=256.0,
+                                    help="Smallest content size (KB) flagged as uncompressed (default 256)")
+    parser_compression.add_argument("--no-archives", action="store_true", help="Skip the contents of .rpf archives")
+    parser_compression.set_defaults(handler=_cli_compression)
+
+    parser_overrides = subparsers.add_parser("overrides", parents=[listing_options],
+                                             help="List stream files that replace base-game assets")
+    parser_overrides.add_argument("root", help="Server root directory (as written in the listing, with --listing)")
+    parser_overrides.add_argument("--names", default=None,
+                                  help="Base-game file list (one name or path per line) to index first; kept for later runs")
+    parser_overrides.add_argument("-o", "--output", help="Also write the results to a .txt/.csv/.ndjson/.html file")
+    parser_overrides.set_defaults(handler=_cli_overrides)
+
+    parser_lods = subparsers.add_parser("lods", parents=[io_options],
+                                        help="Compare the LOD tables of each _hi.yft and its original")
+    parser_lods.add_argument("root", help="Server root directory")
+    parser_lods.add_argument("-o", "--output", help="Also write the results to a .txt/.csv/.ndjson/.html file")
+    parser_lods.add_argument("--redundant", action="store_true", help="Only list _hi files that add no detail")
+    parser_lods.set_defaults(handler=_cli_lods)
+
+    parser_oversize = subparsers.add_parser("oversize", parents=[io_options], help="List oversized stream resources, including .rpf contents")
+    parser_oversize.add_argument("root", help="Server root directory")
+    parser_oversize.add_argument("-o", "--output", help="Also write the results to a .txt/.csv/.ndjson/.html file")
+    parser_oversize.add_argument("--min-status", default=SizeStatus.WARNING.label,
+                                 choices=[status.label for status in SizeStatus if status != SizeStatus.OK],
+                                 help="Lowest status to list (default Warning)")
+    parser_oversize.add_argument("--no-archives", action="store_true", help="Skip the contents of .rpf archives")
+    parser_oversize.set_defaults(handler=_cli_oversize)
+
+    parser_plan = subparsers.add_parser("plan", parents=[io_options], help="Rank duplicate deletions by bytes saved (dry run unless --execute)")
+    parser_plan.add_argument("root", help="Server root directory")
+    parser_plan.add_argument("-o", "--output", help="Also write the plan to a .txt/.csv/.ndjson/.html file")
+    parser_plan.add_argument("-t", "--target", type=float, default=None,
+                             help="Stop once this many MB are saved, with the fewest deletions (default: plan everything)")
+    parser_plan.add_argument("--rank", choices=list(CLEANUP_METRICS), default="disk",
+                             help="Rank by disk space or client streaming memory (default disk)")
+    parser_plan.add_argument("--execute", action="store_true", help="Delete the planned files")
+    parser_plan.add_argument("--time-budget", type=float, default=None,
+                             help="Seconds to spend comparing _hi files, most promising first (default: no limit)")
+    parser_plan.add_argument("--lod-aware", action="store_true",
+                             help="Also plan _hi.yft files whose High LOD has no more geometry than the original")
+    parser_plan.add_argument("-w", "--workers", type=int, default=None, help="Parallel hashing workers")
+    parser_plan.set_defaults(handler=_cli_plan)
+
+    parser_serve = subparsers.add_parser("serve", help="Keep an index of ROOT warm and answer queries on localhost")
+    parser_serve.add_argument("root", help="Server root directory")
+    parser_serve.add_argument("--host", default=SERVICE_HOST, help=f"Address to listen on (default {SERVICE_HOST})")
+    parser_serve.add_argument("--port", type=int, default=SERVICE_PORT, help=f"Port to listen on (default {SERVICE_PORT})")
+    parser_serve.add_argument("--interval", type=float, default=60.0, help="Seconds between rescans (default 60)")
+    parser_serve.add_argument("--archives", action="store_true", help="Include the contents of .rpf archives")
+    parser_serve.set_defaults(handler=_cli_serve)
+
+    parser_query = subparsers.add_parser("query", help="Ask a running index service")
+    parser_query.add_argument("query", choices=["status", "duplicates", "files", "critical", "conflicts", "check",
+                                                "oversize", "compression", "refresh"])
+    parser_query.add_argument("values", nargs="*",
+                              help="duplicates [NAME], conflicts RESOURCE, check NAME... (or names on stdin), oversize [STATUS], compression [RESOURCE]")
+    parser_query.add_argument("--host", default=SERVICE_HOST)
+    parser_query.add_argument("--port", type=int, default=SERVICE_PORT)
+    parser_query.set_defaults(handler=_cli_query)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(run_cli(sys.argv[1:]))
     GUI_MAIN.main()
\ No newline at end of file